@@ -16,14 +16,59 @@ use file_editor::manager::RustFileManager;
 use llm_requester::{llm_request_with_prompt, llm_request_with_prompt_chunked, utils};
 use log::{debug, info};
 use prompt_builder::PromptBuilder;
+use regex::Regex;
 use serde::{Deserialize, Serialize};
-use std::collections::HashMap;
+use sha2::{Digest, Sha256};
+use std::collections::{HashMap, HashSet, VecDeque};
+use std::fmt::Write;
 use std::path::{Path, PathBuf};
-use std::sync::Arc;
+use std::sync::{Arc, LazyLock};
 use tokio::fs;
-use tokio::sync::Mutex;
+use tokio::sync::{Mutex, OnceCell, Semaphore};
+use tokio::task::JoinSet;
 use web_searcher::{solve_rust_error, RustErrorSolution, WebSearcher};
 
+// Patterns used on every translation pass, compiled once per process.
+static LINE_NUMBER_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"(?m)^\s*\d+\s+").unwrap());
+static C_FUNCTION_DEF_RE: LazyLock<Regex> = LazyLock::new(|| {
+    Regex::new(r"(?m)^[a-zA-Z_][a-zA-Z0-9_*\s]*\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\([^)]*\)\s*\{")
+        .unwrap()
+});
+static C_TYPE_DEF_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"(?m)^(?:typedef\s+)?(?:struct|union|enum)\s+(\w+)").unwrap());
+static C_GLOBAL_VAR_RE: LazyLock<Regex> = LazyLock::new(|| {
+    Regex::new(
+        r"(?m)^(?:extern\s+)?(?:static\s+)?[a-zA-Z_][a-zA-Z0-9_*\s]+\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[;=]",
+    )
+    .unwrap()
+});
+static C_MACRO_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r"(?m)^#define\s+(\w+)").unwrap());
+static C_INCLUDE_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r#"#include\s+[<"](.*?)[>"]"#).unwrap());
+static CALL_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"([a-zA-Z_][a-zA-Z0-9_]*)\s*\(").unwrap());
+static ERROR_LINE_RE: LazyLock<Regex> = LazyLock::new(|| Regex::new(r":(\d+):").unwrap());
+
+/// Upper bound on chunk translation requests in flight for a single file
+const MAX_CONCURRENT_CHUNK_REQUESTS: usize = 4;
+
+/// Directory under the agent's cache path that keeps translation responses,
+/// keyed by a hash of the exact request, so re-runs on an unchanged file skip
+/// the LLM call. Turned off with `[response_cache] enabled = false`
+const RESPONSE_CACHE_DIR: &str = ".llm_cache";
+
+/// Cached responses kept when `response_cache.max_entries` is unset; the
+/// oldest files beyond it are removed after each write
+const DEFAULT_RESPONSE_CACHE_ENTRIES: usize = 512;
+
+/// Translation responses whose parsed JSON is kept in memory, so a response seen
+/// again (a replayed cache file or a repeated retry answer) is not parsed twice
+const PARSED_RESPONSE_CACHE_SIZE: usize = 256;
+
+/// Parsed JSON payloads keyed by the SHA-256 of the response text, oldest first
+static PARSED_RESPONSES: LazyLock<std::sync::Mutex<ParsedResponseCache>> =
+    LazyLock::new(Default::default);
+
 /// Project configuration for agent
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct ProjectConfig {
@@ -152,19 +197,34 @@ pub struct Agent {
     file_manager: Option<RustFileManager>,
 
     /// Database for code storage and retrieval
-    db_manager: Arc<Mutex<DatabaseManager>>,
+    db_manager: Arc<DatabaseManager>,
 
     /// Web search for error solutions
     _web_searcher: Arc<Mutex<WebSearcher>>,
 
-    /// Prompt builder for AI interactions
-    prompt_builder: Arc<Mutex<Option<PromptBuilder<'static>>>>,
+    /// Prompt builder for AI interactions; readers clone the handle instead of
+    /// holding the lock while a prompt is built
+    prompt_builder: Arc<Mutex<Option<Arc<PromptBuilder<'static>>>>>,
 
     /// Message queue for inter-agent communication
     message_queue: Arc<Mutex<Vec<AgentMessage>>>,
 
     /// Current working context
     current_context: Arc<Mutex<AgentContext>>,
+
+    /// Translation system prompt (role + conversion guide). It never changes for an
+    /// agent, so it is read once and sent verbatim as the leading, cacheable part of
+    /// every request
+    system_prompt: OnceCell<String>,
+
+    /// System prompt for chunked translation, read once like `system_prompt`
+    chunk_system_prompt: OnceCell<String>,
+
+    /// Cache entry written for the latest translation, dropped if its code fails
+    last_cached_response: Option<PathBuf>,
+
+    /// Prompt built ahead of time for the next translate_code call on this file
+    prepared_prompt: Mutex<Option<(PathBuf, String)>>,
 }
 
 #[derive(Debug, Clone)]
@@ -225,11 +285,11 @@ impl Agent {
         info!("Creating agent {} for project: {}", agent_id, project_name);
 
         // Initialize database manager
-        let db_manager = Arc::new(Mutex::new(
-            DatabaseManager::new_default()
+        let db_manager = Arc::new(
+            DatabaseManager::shared()
                 .await
                 .context("Failed to initialize database manager")?,
-        ));
+        );
 
         // Initialize web searcher
         let web_searcher = Arc::new(Mutex::new(
@@ -250,6 +310,10 @@ impl Agent {
             prompt_builder,
             message_queue: Arc::new(Mutex::new(Vec::new())),
             current_context: Arc::new(Mutex::new(AgentContext::default())),
+            system_prompt: OnceCell::new(),
+            chunk_system_prompt: OnceCell::new(),
+            last_cached_response: None,
+            prepared_prompt: Mutex::new(None),
         };
 
         info!("Agent {} created successfully", agent.agent_id);
@@ -315,9 +379,8 @@ libc = "0.2"
     /// Initialize prompt builder
     pub async fn initialize_prompt_builder(&self) -> Result<()> {
         {
-            let db_manager = self.db_manager.lock().await;
             let builder = PromptBuilder::new(
-                &*db_manager,
+                &self.db_manager,
                 self.config.project_name.clone(),
                 Some(self.config.cache_path.clone()),
             )
@@ -330,7 +393,7 @@ libc = "0.2"
             };
 
             let mut prompt_builder = self.prompt_builder.lock().await;
-            *prompt_builder = Some(builder_static);
+            *prompt_builder = Some(Arc::new(builder_static));
         }
 
         info!(
@@ -368,8 +431,8 @@ libc = "0.2"
         }
 
         // Query database for additional context
-        let db_manager = self.db_manager.lock().await;
-        if let Ok(similar_code) = db_manager
+        if let Ok(similar_code) = self
+            .db_manager
             .search_code_by_text(
                 &source_info.content[..source_info.content.len().min(500)],
                 Some(&self.config.source_language),
@@ -531,17 +594,18 @@ libc = "0.2"
     ) -> Result<String> {
         info!("Building translation prompt for {}", source_file.display());
 
-        let prompt_builder = self.prompt_builder.lock().await;
-        if let Some(ref builder) = *prompt_builder {
-            let mut prompt = builder
-                .build_file_context_prompt(source_file, target_functions)
-                .await
-                .context("Failed to build file context prompt")?;
+        let prompt_builder = self.prompt_builder.lock().await.clone();
+        if let Some(builder) = prompt_builder {
+            // The conversion guide already goes out as the system prompt. The
+            // reference code is read from disk while the database is queried.
+            let (prompt, reference) = tokio::join!(
+                builder.build_file_context(source_file, target_functions),
+                self.load_reference_code(source_file)
+            );
+            let prompt = prompt.context("Failed to build file context prompt")?;
 
-            // Scan for existing c2rust project results
-            prompt = self
-                .enhance_prompt_with_context(source_file, prompt)
-                .await?;
+            // Append existing c2rust project results or the original C code
+            let prompt = self.enhance_prompt_with_context(prompt, reference);
 
             info!("Built prompt with {} characters", prompt.len());
             debug!("Built prompt with {} characters", prompt.len());
@@ -553,6 +617,16 @@ libc = "0.2"
         }
     }
 
+    /// Build the translation prompt for the next translate_code call on a file
+    ///
+    /// Lets callers build the prompt while other work runs, such as compiling the
+    /// previous attempt. The prepared prompt is used once, by the next translation.
+    pub async fn prepare_translation_prompt(&self, source_file: &Path) -> Result<()> {
+        let prompt = self.build_translation_prompt(source_file, None).await?;
+        *self.prepared_prompt.lock().await = Some((source_file.to_path_buf(), prompt));
+        Ok(())
+    }
+
     /// Translate C code to Rust using AI
     pub async fn translate_code(
         &mut self,
@@ -576,7 +650,10 @@ libc = "0.2"
         }
 
         // Build context-aware prompt
-        let base_prompt = self.build_translation_prompt(source_file, None).await?;
+        let base_prompt = match self.prepared_prompt.get_mut().take() {
+            Some((path, prompt)) if path == source_file => prompt,
+            _ => self.build_translation_prompt(source_file, None).await?,
+        };
 
         // Add error context if provided
         let mut messages = vec![base_prompt];
@@ -587,16 +664,7 @@ libc = "0.2"
             ));
         }
 
-        // Load translation template and Linus role for first-time translation
-        let mut template = self
-            .load_prompt_template("file_conversion")
-            .await
-            .unwrap_or_else(|_| "Translate the C code to safe, idiomatic Rust code.".to_string());
-
-        // Add Linus role context for initial translation
-        if let Ok(linus_role) = self.load_prompt_template("linus_role").await {
-            template = format!("{}\n\n{}", linus_role, template);
-        }
+        let template = self.translation_system_prompt().await.to_string();
 
         // Check if we need to use chunked requests due to large context
         let total_tokens = messages
@@ -605,7 +673,21 @@ libc = "0.2"
             .sum::<usize>()
             + utils::estimate_token_count(&template);
 
-        let ai_response = if total_tokens > 80000 {
+        // Reuse the response to an identical earlier request if one is cached
+        let cache_file = response_cache_file(&self.config.cache_path, &messages, &template);
+        let cached_response = match &cache_file {
+            Some(path) => fs::read_to_string(path).await.ok(),
+            None => None,
+        };
+        let from_cache = cached_response.is_some();
+
+        let ai_response = if let Some(response) = cached_response {
+            info!(
+                "Using cached translation response for {}",
+                source_file.display()
+            );
+            response
+        } else if total_tokens > 80000 {
             info!(
                 "Large context detected ({} tokens), using chunked requests",
                 total_tokens
@@ -626,6 +708,13 @@ libc = "0.2"
         // Process AI response
         let result = self.process_translation_response(&ai_response).await?;
 
+        if let Some(path) = &cache_file {
+            if !from_cache {
+                store_cached_response(path, &ai_response).await;
+            }
+        }
+        self.last_cached_response = cache_file;
+
         info!(
             "Translation completed with confidence: {:.2}",
             result.confidence_score
@@ -633,47 +722,52 @@ libc = "0.2"
         Ok(result)
     }
 
+    /// Drop the cached response behind the latest translation
+    ///
+    /// Call this when the translated code fails verification, so a later run
+    /// asks the LLM again instead of replaying the same answer.
+    pub async fn invalidate_cached_response(&mut self) {
+        if let Some(path) = self.last_cached_response.take() {
+            if let Err(e) = fs::remove_file(&path).await {
+                debug!("Failed to remove cached response {}: {}", path.display(), e);
+            }
+        }
+    }
+
+    /// Translation template with the Linus role, loaded on first use
+    async fn translation_system_prompt(&self) -> &str {
+        self.system_prompt
+            .get_or_init(|| async {
+                let template = self
+                    .load_prompt_template("file_conversion")
+                    .await
+                    .unwrap_or_else(|_| {
+                        "Translate the C code to safe, idiomatic Rust code.".to_string()
+                    });
+
+                // Add Linus role context for translation
+                match self.load_prompt_template("linus_role").await {
+                    Ok(linus_role) => format!("{}\n\n{}", linus_role, template),
+                    Err(_) => template,
+                }
+            })
+            .await
+    }
+
     /// Process AI translation response
     async fn process_translation_response(&self, response: &str) -> Result<TranslationResult> {
-        // Clean the response by removing line numbers and extracting JSON from markdown blocks
-        let cleaned_response = self.clean_json_response(response);
-
         // Try to parse as JSON first
-        if let Ok(json_value) = serde_json::from_str::<serde_json::Value>(&cleaned_response) {
-            let rust_code = json_value
-                .get("rust_code")
-                .and_then(|v| v.as_str())
-                .unwrap_or(response)
-                .to_string();
-
-            let cargo_deps = json_value
-                .get("cargo")
-                .and_then(|v| v.as_str())
-                .map(|s| s.split(',').map(|s| s.trim().to_string()).collect())
-                .unwrap_or_default();
-
-            let key_changes = json_value
-                .get("key_changes")
-                .and_then(|v| v.as_array())
-                .map(|arr| {
-                    arr.iter()
-                        .filter_map(|v| v.as_str().map(String::from))
-                        .collect()
-                })
-                .unwrap_or_default();
+        if let Some(parsed) = parse_response_json(response) {
+            let rust_code = parsed.rust_code.as_deref().unwrap_or(response).to_string();
 
-            let warnings = json_value
-                .get("warnings")
-                .and_then(|v| v.as_array())
-                .map(|arr| {
-                    arr.iter()
-                        .filter_map(|v| v.as_str().map(String::from))
-                        .collect()
-                })
+            let cargo_deps = parsed
+                .cargo
+                .as_deref()
+                .map(|s| s.split(',').map(|s| s.trim().to_string()).collect())
                 .unwrap_or_default();
 
             // Process AI tool usage if present
-            if let Some(tool_usage) = json_value.get("tool_usage") {
+            if let Some(tool_usage) = &parsed.tool_usage {
                 if let Err(e) = self.process_ai_tool_usage_immutable(tool_usage).await {
                     log::warn!("Failed to process AI tool usage: {}", e);
                 }
@@ -682,8 +776,8 @@ libc = "0.2"
             return Ok(TranslationResult {
                 rust_code,
                 cargo_dependencies: cargo_deps,
-                key_changes,
-                warnings,
+                key_changes: parsed.key_changes.clone(),
+                warnings: parsed.warnings.clone(),
                 confidence_score: 0.8, // Default confidence
                 compilation_status: CompilationStatus::Unknown,
             });
@@ -704,31 +798,13 @@ libc = "0.2"
 
     /// Clean JSON response by removing line numbers and extracting from markdown blocks
     fn clean_json_response(&self, response: &str) -> String {
-        // First, try to extract JSON from markdown code blocks
-        if let Some(json_start) = response.find("```json") {
-            let content_start = json_start + 7; // length of "```json"
-            if let Some(json_end) = response[content_start..].find("```") {
-                let json_content = &response[content_start..content_start + json_end];
-                return self.remove_line_numbers(json_content);
-            }
-        }
-
-        // If no markdown blocks, try to find JSON-like content
-        if response.trim().starts_with('{') {
-            return self.remove_line_numbers(response);
-        }
-
-        // Look for lines that start with numbers and remove them
-        self.remove_line_numbers(response)
+        self.remove_line_numbers(json_block(response))
     }
 
     /// Remove line numbers from the beginning of lines
     fn remove_line_numbers(&self, content: &str) -> String {
-        use regex::Regex;
-
         // Remove line numbers at the start of lines (e.g., "    1 " or "   25 ")
-        let line_num_regex = Regex::new(r"(?m)^\s*\d+\s+").unwrap();
-        let cleaned = line_num_regex.replace_all(content, "");
+        let cleaned = LINE_NUMBER_RE.replace_all(content, "");
 
         // Trim whitespace and return
         cleaned.trim().to_string()
@@ -774,20 +850,13 @@ libc = "0.2"
         max_lines: usize,
         global_context: &ChunkContext,
     ) -> Vec<CodeChunk> {
-        use regex::Regex;
-
         let mut chunks = Vec::new();
         let lines: Vec<&str> = content.lines().collect();
 
         // Find function boundaries
-        let func_regex = Regex::new(
-            r"(?m)^[a-zA-Z_][a-zA-Z0-9_*\s]*\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\([^)]*\)\s*\{",
-        )
-        .unwrap();
-
         let mut function_starts = Vec::new();
         for (line_num, line) in lines.iter().enumerate() {
-            if func_regex.is_match(line) {
+            if C_FUNCTION_DEF_RE.is_match(line) {
                 function_starts.push(line_num);
             }
         }
@@ -889,27 +958,21 @@ libc = "0.2"
         let includes = self.extract_includes(content);
 
         // Extract type definitions (struct, typedef, enum)
-        let type_regex =
-            regex::Regex::new(r"(?m)^(?:typedef\s+)?(?:struct|union|enum)\s+(\w+)").unwrap();
-        let type_definitions: Vec<String> = type_regex
+        let type_definitions: Vec<String> = C_TYPE_DEF_RE
             .captures_iter(content)
             .filter_map(|cap| cap.get(1))
             .map(|m| m.as_str().to_string())
             .collect();
 
         // Extract global variables
-        let global_var_regex = regex::Regex::new(
-            r"(?m)^(?:extern\s+)?(?:static\s+)?[a-zA-Z_][a-zA-Z0-9_*\s]+\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[;=]"
-        ).unwrap();
-        let global_variables: Vec<String> = global_var_regex
+        let global_variables: Vec<String> = C_GLOBAL_VAR_RE
             .captures_iter(content)
             .filter_map(|cap| cap.get(1))
             .map(|m| m.as_str().to_string())
             .collect();
 
         // Extract macros
-        let macro_regex = regex::Regex::new(r"(?m)^#define\s+(\w+)").unwrap();
-        let macros: Vec<String> = macro_regex
+        let macros: Vec<String> = C_MACRO_RE
             .captures_iter(content)
             .filter_map(|cap| cap.get(1))
             .map(|m| m.as_str().to_string())
@@ -954,34 +1017,20 @@ libc = "0.2"
                 .insert(source_file.to_string_lossy().to_string(), chunks.clone());
         }
 
-        // Translate each chunk
+        // Translate chunks concurrently, reporting progress as each one finishes,
+        // then record results in chunk order
+        let pending: Vec<&CodeChunk> = chunks.iter().collect();
+        let translations = self.translate_chunks(&pending, Some(source_file)).await;
+
         let mut chunk_results = Vec::new();
         let mut successful_chunks = 0;
         let mut failed_chunks = Vec::new();
 
-        for chunk in chunks {
-            info!(
-                "Translating chunk {}/{} ({}-{} lines)",
-                chunk.chunk_id + 1,
-                total_chunks,
-                chunk.start_line,
-                chunk.end_line
-            );
-
-            match self.translate_chunk(&chunk).await {
+        for (chunk, translation) in chunks.iter().zip(translations) {
+            match translation {
                 Ok(result) => {
                     successful_chunks += 1;
                     chunk_results.push(result);
-
-                    // Update progress
-                    let mut context = self.current_context.lock().await;
-                    if let Some(progress) = context
-                        .translation_progress
-                        .get_mut(&source_file.to_string_lossy().to_string())
-                    {
-                        progress.completed_chunks += 1;
-                    }
-
                     info!("Chunk {} translated successfully", chunk.chunk_id);
                 }
                 Err(e) => {
@@ -1000,22 +1049,8 @@ libc = "0.2"
                         confidence_score: 0.0,
                         compilation_status: CompilationStatus::Failed(e.to_string()),
                     });
-
-                    // Update progress
-                    let mut context = self.current_context.lock().await;
-                    if let Some(progress) = context
-                        .translation_progress
-                        .get_mut(&source_file.to_string_lossy().to_string())
-                    {
-                        progress.failed_chunks.push(chunk.chunk_id);
-                        progress.completed_chunks += 1;
-                    }
                 }
             }
-
-            // Send progress update
-            self.send_progress_update(source_file, successful_chunks, total_chunks)
-                .await;
         }
 
         // Merge chunks
@@ -1047,12 +1082,114 @@ libc = "0.2"
         })
     }
 
-    /// Translate a single chunk
-    async fn translate_chunk(&self, chunk: &CodeChunk) -> Result<ChunkTranslationResult> {
-        // Build context-aware prompt for this chunk
+    /// Translate chunks concurrently, returning results in the same order as `chunks`.
+    /// Chunks are independent requests, so up to `MAX_CONCURRENT_CHUNK_REQUESTS` run
+    /// at once instead of paying each round trip in turn. With `progress_file`, that
+    /// file's progress is recorded and reported as each chunk finishes.
+    async fn translate_chunks(
+        &self,
+        chunks: &[&CodeChunk],
+        progress_file: Option<&Path>,
+    ) -> Vec<Result<ChunkTranslationResult>> {
+        let template = self.chunk_translation_system_prompt().await;
+
+        let sem = Arc::new(Semaphore::new(MAX_CONCURRENT_CHUNK_REQUESTS));
+        let mut join_set: JoinSet<(usize, Result<String>)> = JoinSet::new();
+        for (index, chunk) in chunks.iter().enumerate() {
+            info!(
+                "Translating chunk {} ({}-{} lines)",
+                chunk.chunk_id, chunk.start_line, chunk.end_line
+            );
+            let prompt = self.build_chunk_prompt(chunk);
+            let template = template.to_string();
+            let sem = sem.clone();
+            join_set.spawn(async move {
+                let _permit = sem.acquire_owned().await.unwrap();
+                (index, llm_request_with_prompt(vec![prompt], template).await)
+            });
+        }
+
+        let mut results: Vec<Option<Result<ChunkTranslationResult>>> =
+            (0..chunks.len()).map(|_| None).collect();
+        let mut successful = 0;
+        while let Some(joined) = join_set.join_next().await {
+            let (index, response) = match joined {
+                Ok(done) => done,
+                Err(e) => {
+                    log::error!("Chunk translation task failed: {}", e);
+                    continue;
+                }
+            };
+            let chunk = chunks[index];
+            let result = response
+                .context("Failed to translate chunk")
+                .map(|ai_response| self.chunk_result_from_response(chunk, &ai_response));
+
+            if let Some(file_path) = progress_file {
+                if result.is_ok() {
+                    successful += 1;
+                }
+                self.record_chunk_progress(file_path, chunk.chunk_id, result.is_ok())
+                    .await;
+                self.send_progress_update(file_path, successful, chunks.len())
+                    .await;
+            }
+            results[index] = Some(result);
+        }
+
+        let mut ordered = Vec::with_capacity(chunks.len());
+        for (chunk, result) in chunks.iter().zip(results) {
+            let result = match result {
+                Some(result) => result,
+                None => {
+                    if let Some(file_path) = progress_file {
+                        self.record_chunk_progress(file_path, chunk.chunk_id, false)
+                            .await;
+                    }
+                    Err(anyhow!("Chunk translation task did not complete"))
+                        .context("Failed to translate chunk")
+                }
+            };
+            ordered.push(result);
+        }
+        ordered
+    }
+
+    /// Count a finished chunk in the file's translation progress
+    async fn record_chunk_progress(&self, file_path: &Path, chunk_id: usize, succeeded: bool) {
+        let mut context = self.current_context.lock().await;
+        if let Some(progress) = context
+            .translation_progress
+            .get_mut(&*file_path.to_string_lossy())
+        {
+            if !succeeded {
+                progress.failed_chunks.push(chunk_id);
+            }
+            progress.completed_chunks += 1;
+        }
+    }
+
+    /// Chunk translation template, loaded on first use
+    async fn chunk_translation_system_prompt(&self) -> &str {
+        self.chunk_system_prompt
+            .get_or_init(|| async {
+                self.load_prompt_template("file_conversion")
+                    .await
+                    .unwrap_or_else(|_| {
+                        "Translate this C code chunk to safe, idiomatic Rust code. \
+                         Preserve the function signatures and logic. \
+                         Return only the Rust code without explanations."
+                            .to_string()
+                    })
+            })
+            .await
+    }
+
+    /// Build context-aware prompt for a single chunk
+    fn build_chunk_prompt(&self, chunk: &CodeChunk) -> String {
         let context_header = self.build_chunk_context_header(&chunk.context);
 
-        let prompt = format!(
+        format!(
             "{}\n\n// Chunk {} (lines {}-{}):\n// Functions in this chunk: {}\n\n{}",
             context_header,
             chunk.chunk_id,
@@ -1060,37 +1197,29 @@ libc = "0.2"
             chunk.end_line,
             chunk.functions.join(", "),
             chunk.content
-        );
-
-        let template = self
-            .load_prompt_template("file_conversion")
-            .await
-            .unwrap_or_else(|_| {
-                "Translate this C code chunk to safe, idiomatic Rust code. \
-                 Preserve the function signatures and logic. \
-                 Return only the Rust code without explanations."
-                    .to_string()
-            });
-
-        // Call AI for translation
-        let ai_response = llm_request_with_prompt(vec![prompt], template)
-            .await
-            .context("Failed to translate chunk")?;
+        )
+    }
 
+    /// Turn the AI response for a chunk into a translation result
+    fn chunk_result_from_response(
+        &self,
+        chunk: &CodeChunk,
+        ai_response: &str,
+    ) -> ChunkTranslationResult {
         // Extract Rust code from response
-        let rust_code = self.extract_rust_code(&ai_response);
+        let rust_code = self.extract_rust_code(ai_response);
 
         // Analyze dependencies in the translated code
         let dependencies = self.extract_dependencies(&rust_code);
 
-        Ok(ChunkTranslationResult {
+        ChunkTranslationResult {
             chunk_id: chunk.chunk_id,
             rust_code,
             dependencies,
             warnings: Vec::new(),
             confidence_score: 0.75, // Default confidence for chunk
             compilation_status: CompilationStatus::Unknown,
-        })
+        }
     }
 
     /// Build context header for chunk translation
@@ -1100,7 +1229,7 @@ libc = "0.2"
         if !context.includes.is_empty() {
             header.push_str("// Original includes:\n");
             for include in &context.includes {
-                header.push_str(&format!("// #include <{}>\n", include));
+                let _ = writeln!(header, "// #include <{}>", include);
             }
             header.push('\n');
         }
@@ -1108,7 +1237,7 @@ libc = "0.2"
         if !context.type_definitions.is_empty() {
             header.push_str("// Type definitions in this file:\n");
             for typedef in &context.type_definitions {
-                header.push_str(&format!("// type: {}\n", typedef));
+                let _ = writeln!(header, "// type: {}", typedef);
             }
             header.push('\n');
         }
@@ -1116,7 +1245,7 @@ libc = "0.2"
         if !context.global_variables.is_empty() {
             header.push_str("// Global variables in this file:\n");
             for var in &context.global_variables {
-                header.push_str(&format!("// global: {}\n", var));
+                let _ = writeln!(header, "// global: {}", var);
             }
             header.push('\n');
         }
@@ -1126,13 +1255,10 @@ libc = "0.2"
 
     /// Extract dependencies from Rust code
     fn extract_dependencies(&self, rust_code: &str) -> Vec<String> {
-        use regex::Regex;
-
         let mut deps = Vec::new();
 
         // Extract function calls
-        let call_regex = Regex::new(r"([a-zA-Z_][a-zA-Z0-9_]*)\s*\(").unwrap();
-        for cap in call_regex.captures_iter(rust_code) {
+        for cap in CALL_RE.captures_iter(rust_code) {
             if let Some(func) = cap.get(1) {
                 let func_name = func.as_str().to_string();
                 if !deps.contains(&func_name) {
@@ -1148,19 +1274,19 @@ libc = "0.2"
     async fn merge_chunk_results(&self, chunks: &[ChunkTranslationResult]) -> Result<String> {
         info!("Merging {} chunks into final code", chunks.len());
 
-        let mut merged = String::new();
+        // Size the buffer for all chunk code up front
+        let code_len: usize = chunks.iter().map(|c| c.rust_code.len() + 64).sum();
+        let mut merged = String::with_capacity(code_len + 128);
 
         // Add file header
         merged.push_str("// Auto-generated Rust code from C translation\n");
         merged.push_str("// Generated using chunked translation\n\n");
 
         // Collect all unique dependencies
-        let mut all_deps = std::collections::HashSet::new();
-        for chunk in chunks {
-            for dep in &chunk.dependencies {
-                all_deps.insert(dep.clone());
-            }
-        }
+        let all_deps: HashSet<&str> = chunks
+            .iter()
+            .flat_map(|chunk| chunk.dependencies.iter().map(String::as_str))
+            .collect();
 
         // Add common imports
         merged.push_str("use std::os::raw::*;\n");
@@ -1171,15 +1297,10 @@ libc = "0.2"
 
         // Add each chunk's code
         for chunk in chunks {
-            merged.push_str(&format!(
-                "// ========== Chunk {} ==========\n",
-                chunk.chunk_id
-            ));
+            let _ = writeln!(merged, "// ========== Chunk {} ==========", chunk.chunk_id);
 
-            if !chunk.warnings.is_empty() {
-                for warning in &chunk.warnings {
-                    merged.push_str(&format!("// WARNING: {}\n", warning));
-                }
+            for warning in &chunk.warnings {
+                let _ = writeln!(merged, "// WARNING: {}", warning);
             }
 
             merged.push_str(&chunk.rust_code);
@@ -1274,20 +1395,23 @@ libc = "0.2"
         let mut successful_chunks = 0;
         let mut still_failed = Vec::new();
 
-        for chunk_id in failed_chunk_ids {
-            if let Some(chunk) = chunks.iter().find(|c| c.chunk_id == chunk_id) {
-                info!("Retrying chunk {}", chunk_id);
+        let retry: Vec<&CodeChunk> = failed_chunk_ids
+            .iter()
+            .filter_map(|chunk_id| chunks.iter().find(|c| c.chunk_id == *chunk_id))
+            .collect();
+        info!("Retrying chunks {:?}", failed_chunk_ids);
+        let translations = self.translate_chunks(&retry, None).await;
 
-                match self.translate_chunk(chunk).await {
-                    Ok(result) => {
-                        successful_chunks += 1;
-                        chunk_results.push(result);
-                        info!("Chunk {} translated successfully on retry", chunk_id);
-                    }
-                    Err(e) => {
-                        log::error!("Chunk {} still failed: {}", chunk_id, e);
-                        still_failed.push(chunk_id);
-                    }
+        for (chunk, translation) in retry.iter().zip(translations) {
+            match translation {
+                Ok(result) => {
+                    successful_chunks += 1;
+                    chunk_results.push(result);
+                    info!("Chunk {} translated successfully on retry", chunk.chunk_id);
+                }
+                Err(e) => {
+                    log::error!("Chunk {} still failed: {}", chunk.chunk_id, e);
+                    still_failed.push(chunk.chunk_id);
                 }
             }
         }
@@ -1397,14 +1521,8 @@ libc = "0.2"
 
     /// Extract functions from C code (simple regex-based)
     fn extract_functions(&self, content: &str) -> Vec<String> {
-        use regex::Regex;
-
-        let re = Regex::new(
-            r"(?m)^[a-zA-Z_][a-zA-Z0-9_*\s]*\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\([^)]*\)\s*\{",
-        )
-        .unwrap();
-
-        re.captures_iter(content)
+        C_FUNCTION_DEF_RE
+            .captures_iter(content)
             .filter_map(|cap| cap.get(1))
             .map(|m| m.as_str().to_string())
             .collect()
@@ -1412,11 +1530,8 @@ libc = "0.2"
 
     /// Extract includes from C code
     fn extract_includes(&self, content: &str) -> Vec<String> {
-        use regex::Regex;
-
-        let re = Regex::new(r#"#include\s+[<"](.*?)[>"]"#).unwrap();
-
-        re.captures_iter(content)
+        C_INCLUDE_RE
+            .captures_iter(content)
             .filter_map(|cap| cap.get(1))
             .map(|m| m.as_str().to_string())
             .collect()
@@ -1436,10 +1551,8 @@ libc = "0.2"
 
     /// Extract line number from error message
     fn extract_line_number(&self, error_message: &str) -> Option<usize> {
-        use regex::Regex;
-
-        let re = Regex::new(r":(\d+):").unwrap();
-        re.captures(error_message)
+        ERROR_LINE_RE
+            .captures(error_message)
             .and_then(|cap| cap.get(1))
             .and_then(|m| m.as_str().parse().ok())
     }
@@ -1499,66 +1612,74 @@ libc = "0.2"
     // ===== Enhanced Prompt Building Methods =====
 
     /// Enhance prompt with context based on existing c2rust projects
-    async fn enhance_prompt_with_context(
+    fn enhance_prompt_with_context(
         &self,
-        source_file: &Path,
         base_prompt: String,
-    ) -> Result<String> {
+        reference: Option<ReferenceCode>,
+    ) -> String {
         let mut enhanced_prompt = base_prompt;
 
-        // Check if there's an existing c2rust translation
-        let potential_rust_file = self.find_c2rust_equivalent(source_file).await;
-
-        if let Some(rust_file) = potential_rust_file {
-            // Found existing c2rust translation - add it as reference
-            if let Ok(rust_content) = fs::read_to_string(&rust_file).await {
+        match reference {
+            Some(ReferenceCode::C2Rust(rust_file, rust_content)) => {
+                // Found existing c2rust translation - add it as reference
                 enhanced_prompt.push_str("\n\n// Existing c2rust translation for reference:\n");
-                enhanced_prompt.push_str(&format!("```rust\n{}\n```\n", rust_content));
+                let _ = writeln!(enhanced_prompt, "```rust\n{}\n```", rust_content);
                 info!(
                     "Added existing c2rust translation as context: {}",
                     rust_file.display()
                 );
             }
-        } else {
-            // No c2rust translation found - add original C code
-            if let Ok(c_content) = fs::read_to_string(source_file).await {
+            Some(ReferenceCode::CSource(c_content)) => {
+                // No c2rust translation found - add original C code
                 enhanced_prompt.push_str("\n\n// Original C code to translate:\n");
-                enhanced_prompt.push_str(&format!("```c\n{}\n```\n", c_content));
+                let _ = writeln!(enhanced_prompt, "```c\n{}\n```", c_content);
                 info!("Added original C code as context");
             }
+            None => {}
         }
 
-        Ok(enhanced_prompt)
+        enhanced_prompt
+    }
+
+    /// Read the code to show alongside the prompt: an existing c2rust
+    /// translation if there is one, otherwise the original C source
+    async fn load_reference_code(&self, source_file: &Path) -> Option<ReferenceCode> {
+        if let Some((rust_file, rust_content)) = self.find_c2rust_equivalent(source_file).await {
+            return Some(ReferenceCode::C2Rust(rust_file, rust_content));
+        }
+        read_source_lossy(source_file)
+            .await
+            .ok()
+            .map(ReferenceCode::CSource)
     }
 
-    /// Find c2rust equivalent file if exists
-    async fn find_c2rust_equivalent(&self, source_file: &Path) -> Option<PathBuf> {
+    /// Find c2rust equivalent file if exists, returning its content
+    async fn find_c2rust_equivalent(&self, source_file: &Path) -> Option<(PathBuf, String)> {
         // Strategy 1: Look for .rs file with same name in src/
         let file_stem = source_file.file_stem()?;
         let src_dir = self.config.project_path.join("src");
         let rust_file = src_dir.join(format!("{}.rs", file_stem.to_string_lossy()));
 
-        if rust_file.exists() {
-            // Check if it looks like c2rust output (contains c2rust markers)
-            if let Ok(content) = fs::read_to_string(&rust_file).await {
-                if content.contains("c2rust")
-                    || content.contains("::c_void")
-                    || content.contains("libc::")
-                {
-                    return Some(rust_file);
-                }
+        // Check if it looks like c2rust output (contains c2rust markers)
+        if let Ok(content) = read_source_lossy(&rust_file).await {
+            if content.contains("c2rust")
+                || content.contains("::c_void")
+                || content.contains("libc::")
+            {
+                return Some((rust_file, content));
             }
         }
 
         // Strategy 2: Look in c2rust output directories
         let c2rust_dirs = ["c2rust_out", "target/c2rust", "rust_out"];
         for dir in &c2rust_dirs {
-            let c2rust_path = self.config.project_path.join(dir);
-            if c2rust_path.exists() {
-                let rust_file = c2rust_path.join(format!("{}.rs", file_stem.to_string_lossy()));
-                if rust_file.exists() {
-                    return Some(rust_file);
-                }
+            let rust_file = self
+                .config
+                .project_path
+                .join(dir)
+                .join(format!("{}.rs", file_stem.to_string_lossy()));
+            if let Ok(content) = read_source_lossy(&rust_file).await {
+                return Some((rust_file, content));
             }
         }
 
@@ -1567,7 +1688,7 @@ libc = "0.2"
 
     /// Create basic prompt with C source when prompt builder unavailable
     async fn create_basic_c_prompt(&self, source_file: &Path) -> Result<String> {
-        let c_content = fs::read_to_string(source_file)
+        let c_content = read_source_lossy(source_file)
             .await
             .context("Failed to read C source file")?;
 
@@ -1714,6 +1835,288 @@ pub struct AgentStatus {
     pub message_queue_size: usize,
 }
 
+/// Code appended to the translation prompt for reference
+#[derive(Debug, Clone)]
+enum ReferenceCode {
+    C2Rust(PathBuf, String),
+    CSource(String),
+}
+
+/// Cache file for a translation request, keyed by provider, model, prompts and source
+///
+/// `None` when the config cannot be read or the response cache is disabled.
+fn response_cache_file(
+    cache_dir: &Path,
+    messages: &[String],
+    system_prompt: &str,
+) -> Option<PathBuf> {
+    let config = llm_requester::pkg_config::shared_config().ok()?;
+    let enabled = config
+        .response_cache
+        .as_ref()
+        .and_then(|cache| cache.enabled)
+        .unwrap_or(true);
+    if !enabled {
+        return None;
+    }
+
+    let mut hasher = Sha256::new();
+    for part in [config.provider.as_str(), config.model(), system_prompt]
+        .into_iter()
+        .chain(messages.iter().map(String::as_str))
+    {
+        hasher.update(part.as_bytes());
+        hasher.update([0u8]);
+    }
+    let key = format!("{:x}", hasher.finalize());
+
+    let dir = cache_dir.join(RESPONSE_CACHE_DIR);
+    Some(dir.join(format!("{}.txt", key)))
+}
+
+/// Write a translation response to the cache; failures only cost a later cache miss
+async fn store_cached_response(path: &Path, response: &str) {
+    if let Some(dir) = path.parent() {
+        if let Err(e) = fs::create_dir_all(dir).await {
+            debug!("Failed to create response cache {}: {}", dir.display(), e);
+            return;
+        }
+    }
+    if let Err(e) = fs::write(path, response).await {
+        debug!("Failed to cache response {}: {}", path.display(), e);
+        return;
+    }
+
+    let max_entries = llm_requester::pkg_config::shared_config()
+        .ok()
+        .and_then(|config| config.response_cache.as_ref()?.max_entries)
+        .unwrap_or(DEFAULT_RESPONSE_CACHE_ENTRIES);
+    if let Some(dir) = path.parent() {
+        prune_response_cache(dir, max_entries).await;
+    }
+}
+
+/// Remove the oldest cached responses so at most `max_entries` remain
+async fn prune_response_cache(dir: &Path, max_entries: usize) {
+    let Ok(mut entries) = fs::read_dir(dir).await else {
+        return;
+    };
+    let mut files = Vec::new();
+    while let Ok(Some(entry)) = entries.next_entry().await {
+        if let Ok(modified) = entry.metadata().await.and_then(|m| m.modified()) {
+            files.push((modified, entry.path()));
+        }
+    }
+    if files.len() <= max_entries {
+        return;
+    }
+
+    files.sort();
+    let excess = files.len() - max_entries;
+    for (_, path) in files.into_iter().take(excess) {
+        if let Err(e) = fs::remove_file(&path).await {
+            debug!("Failed to remove cached response {}: {}", path.display(), e);
+        }
+    }
+}
+
+/// JSON payload of a response: the first ```json block, or the whole response without one
+fn json_block(response: &str) -> &str {
+    if let Some(json_start) = response.find("```json") {
+        let content = &response[json_start + 7..]; // length of "```json"
+
+        // Fall back to a fence on its own line if a stray quote leaves a string open
+        if let Some(json_end) = closing_fence(content)
+            .or_else(|| content.find("\n```"))
+            .or_else(|| content.find("```"))
+        {
+            return &content[..json_end];
+        }
+    }
+    response
+}
+
+/// Byte offset of the first ``` outside a JSON string
+///
+/// Tracks string state like `relax_json`, so a fence inside a string such as
+/// rust_code does not end the block, while a fence closing a one-line block
+/// is found even when later code blocks follow.
+fn closing_fence(content: &str) -> Option<usize> {
+    let bytes = content.as_bytes();
+    let mut in_string = false;
+    let mut escaped = false;
+
+    for (i, &b) in bytes.iter().enumerate() {
+        if in_string {
+            match b {
+                _ if escaped => escaped = false,
+                b'\\' => escaped = true,
+                b'"' => in_string = false,
+                _ => {}
+            }
+        } else if b == b'"' {
+            in_string = true;
+        } else if bytes[i..].starts_with(b"```") {
+            return Some(i);
+        }
+    }
+    None
+}
+
+/// Fields read from a JSON translation response; other keys are skipped
+///
+/// Deserialized directly instead of through `serde_json::Value`, so the rest of
+/// the object is never built into maps. A field of an unexpected type reads as
+/// empty rather than rejecting the whole response.
+#[derive(Debug, Default, Deserialize)]
+#[serde(default)]
+struct TranslationResponse {
+    #[serde(deserialize_with = "string_or_none")]
+    rust_code: Option<String>,
+    #[serde(deserialize_with = "string_or_none")]
+    cargo: Option<String>,
+    #[serde(deserialize_with = "strings_only")]
+    key_changes: Vec<String>,
+    #[serde(deserialize_with = "strings_only")]
+    warnings: Vec<String>,
+    tool_usage: Option<serde_json::Value>,
+}
+
+/// A string field, or `None` for any other JSON type
+fn string_or_none<'de, D: serde::Deserializer<'de>>(
+    deserializer: D,
+) -> std::result::Result<Option<String>, D::Error> {
+    Ok(match serde_json::Value::deserialize(deserializer)? {
+        serde_json::Value::String(s) => Some(s),
+        _ => None,
+    })
+}
+
+/// The string elements of an array field, empty for any other JSON type
+fn strings_only<'de, D: serde::Deserializer<'de>>(
+    deserializer: D,
+) -> std::result::Result<Vec<String>, D::Error> {
+    Ok(match serde_json::Value::deserialize(deserializer)? {
+        serde_json::Value::Array(items) => items
+            .into_iter()
+            .filter_map(|v| match v {
+                serde_json::Value::String(s) => Some(s),
+                _ => None,
+            })
+            .collect(),
+        _ => Vec::new(),
+    })
+}
+
+/// Parsed JSON payloads of recent responses, evicted oldest first
+#[derive(Default)]
+struct ParsedResponseCache {
+    values: HashMap<[u8; 32], Option<Arc<TranslationResponse>>>,
+    order: VecDeque<[u8; 32]>,
+}
+
+/// Parse the JSON payload of a translation response, reusing earlier results
+///
+/// Well-formed JSON parses as is; only fall back to stripping line numbers, a
+/// regex pass over the whole payload, when it does not. Either form is also
+/// retried through `relax_json` before giving up. Responses that are not JSON
+/// are cached as `None` so the fallbacks are not retried either.
+fn parse_response_json(response: &str) -> Option<Arc<TranslationResponse>> {
+    let digest: [u8; 32] = Sha256::digest(response.as_bytes()).into();
+    if let Some(value) = PARSED_RESPONSES
+        .lock()
+        .unwrap_or_else(|e| e.into_inner())
+        .values
+        .get(&digest)
+    {
+        return value.clone();
+    }
+
+    let json_content = json_block(response).trim();
+    let value = parse_json_lenient(json_content)
+        .or_else(|| parse_json_lenient(LINE_NUMBER_RE.replace_all(json_content, "").trim()))
+        .map(Arc::new);
+
+    let mut cache = PARSED_RESPONSES.lock().unwrap_or_else(|e| e.into_inner());
+    if cache.values.insert(digest, value.clone()).is_none() {
+        cache.order.push_back(digest);
+        if cache.order.len() > PARSED_RESPONSE_CACHE_SIZE {
+            if let Some(oldest) = cache.order.pop_front() {
+                cache.values.remove(&oldest);
+            }
+        }
+    }
+    value
+}
+
+/// Parse JSON strictly, then once more after `relax_json` repairs it
+fn parse_json_lenient<T: serde::de::DeserializeOwned>(content: &str) -> Option<T> {
+    serde_json::from_str(content)
+        .or_else(|_| serde_json::from_str(&relax_json(content)))
+        .ok()
+}
+
+/// Repair the mistakes LLMs commonly make when writing JSON by hand
+///
+/// Raw control characters inside strings (typically the newlines of a
+/// multi-line rust_code value) are escaped, and trailing commas before `}` or
+/// `]` are dropped. A single pass that tracks string state, so commas and
+/// brackets inside strings are left alone.
+fn relax_json(content: &str) -> String {
+    let mut out = String::with_capacity(content.len() + content.len() / 16);
+    let mut in_string = false;
+    let mut escaped = false;
+
+    for c in content.chars() {
+        if in_string {
+            match c {
+                _ if escaped => {
+                    escaped = false;
+                    out.push(c);
+                }
+                '\\' => {
+                    escaped = true;
+                    out.push(c);
+                }
+                '"' => {
+                    in_string = false;
+                    out.push(c);
+                }
+                '\n' => out.push_str("\\n"),
+                '\r' => out.push_str("\\r"),
+                '\t' => out.push_str("\\t"),
+                c if (c as u32) < 0x20 => {
+                    let _ = write!(out, "\\u{:04x}", c as u32);
+                }
+                _ => out.push(c),
+            }
+            continue;
+        }
+
+        match c {
+            '"' => in_string = true,
+            '}' | ']' => {
+                let end = out.trim_end().len();
+                if out[..end].ends_with(',') {
+                    out.remove(end - 1);
+                }
+            }
+            _ => {}
+        }
+        out.push(c);
+    }
+    out
+}
+
+/// Read a source file in one pass, replacing invalid UTF-8 instead of failing
+async fn read_source_lossy(path: &Path) -> std::io::Result<String> {
+    let bytes = fs::read(path).await?;
+    Ok(match String::from_utf8(bytes) {
+        Ok(text) => text,
+        Err(e) => String::from_utf8_lossy(e.as_bytes()).into_owned(),
+    })
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -2172,4 +2575,79 @@ fn main() {
             }
         }
     }
+
+    #[tokio::test]
+    async fn test_read_source_lossy() {
+        let temp_dir = TempDir::new().unwrap();
+        let path = temp_dir.path().join("latin1.c");
+        std::fs::write(&path, b"/* caf\xe9 */\nint x;\n").unwrap();
+
+        let content = read_source_lossy(&path).await.unwrap();
+        assert_eq!(content, "/* caf\u{fffd} */\nint x;\n");
+        assert!(read_source_lossy(&temp_dir.path().join("missing.c"))
+            .await
+            .is_err());
+    }
+
+    #[test]
+    fn test_json_block_extraction() {
+        let fenced = "Result:\n```json\n{\"rust_code\": \"fn f() {}\"}\n```\nDone.";
+        assert_eq!(json_block(fenced).trim(), "{\"rust_code\": \"fn f() {}\"}");
+
+        let bare = "{\"cargo\": \"libc\"}";
+        assert_eq!(json_block(bare), bare);
+
+        // Fences inside JSON strings do not close the block
+        let nested = "```json\n{\"rust_code\": \"/// ```\\n/// f()\\n/// ```\"}\n```";
+        assert_eq!(
+            json_block(nested).trim(),
+            "{\"rust_code\": \"/// ```\\n/// f()\\n/// ```\"}"
+        );
+
+        // A fence right after the JSON ends the block, not a later code block
+        let inline = "```json\n{\"cargo\": \"libc\"}```\nUses libc.\n```rust\nfn main() {}\n```";
+        assert_eq!(json_block(inline).trim(), "{\"cargo\": \"libc\"}");
+
+        // An unterminated fence leaves the response untouched
+        let unterminated = "```json\n{}";
+        assert_eq!(json_block(unterminated), unterminated);
+    }
+
+    #[test]
+    fn test_parse_response_json_cache() {
+        let response = "```json\n  1 {\"rust_code\": \"fn g() {}\"}\n```";
+        let first = parse_response_json(response).expect("line-numbered JSON parses");
+        assert_eq!(first.rust_code.as_deref(), Some("fn g() {}"));
+
+        // A repeated response returns the cached value instead of parsing again
+        let second = parse_response_json(response).unwrap();
+        assert!(Arc::ptr_eq(&first, &second));
+
+        assert!(parse_response_json("fn main() {}").is_none());
+    }
+
+    #[test]
+    fn test_translation_response_field_types() {
+        let parsed: TranslationResponse = serde_json::from_str(
+            r#"{"rust_code": "fn h() {}", "cargo": ["libc"], "key_changes": ["a", 1], "extra": {}}"#,
+        )
+        .unwrap();
+        assert_eq!(parsed.rust_code.as_deref(), Some("fn h() {}"));
+        assert!(parsed.cargo.is_none());
+        assert_eq!(parsed.key_changes, vec!["a".to_string()]);
+        assert!(parsed.warnings.is_empty());
+    }
+
+    #[test]
+    fn test_relax_json() {
+        // Raw newlines in strings and trailing commas are repaired
+        let malformed =
+            "{\"rust_code\": \"fn f() {\n    g(1, 2);\n}\",\n \"warnings\": [\"a, ]\", \"b\",],}";
+        let value: serde_json::Value = parse_json_lenient(malformed).expect("relaxed JSON parses");
+        assert_eq!(value["rust_code"], "fn f() {\n    g(1, 2);\n}");
+        assert_eq!(value["warnings"], serde_json::json!(["a, ]", "b"]));
+
+        // Escaped quotes keep the scanner inside the string
+        assert_eq!(relax_json(r#"["a\",]",]"#), r#"["a\",]"]"#);
+    }
 }
@@ -155,25 +155,36 @@ pub fn parse_args() -> Cli {
 /// Initialize logging, database and AI connectivity once.
 /// Idempotent enough for simple reuse.
 pub async fn init_services(debug: bool) -> Result<()> {
+    init_logging(debug);
+    init_connections().await
+}
+
+/// Install the tracing subscriber and route `log` records through it.
+/// Repeated calls keep the first subscriber.
+pub fn init_logging(debug: bool) {
     use tracing_log::LogTracer;
     use tracing_subscriber::filter::LevelFilter as SubLevel;
     use tracing_subscriber::fmt;
     use tracing_subscriber::prelude::*;
 
     // Initialize tracing/log once (ignore repeated init errors)
-    let _ = LogTracer::init();
+    let (level, log_level) = if debug {
+        (SubLevel::DEBUG, log::LevelFilter::Debug)
+    } else {
+        (SubLevel::INFO, log::LevelFilter::Info)
+    };
+    // Capping log's max level lets disabled debug! calls return before building a record
+    let _ = LogTracer::builder().with_max_level(log_level).init();
     let fmt_layer = fmt::layer()
         .with_target(false)
         .with_level(true)
         .with_timer(fmt::time::uptime());
-    let level = if debug {
-        SubLevel::DEBUG
-    } else {
-        SubLevel::INFO
-    };
     let subscriber = tracing_subscriber::registry().with(fmt_layer).with(level);
     let _ = subscriber.try_init();
+}
 
+/// Check database and AI service connectivity, logging the status of each.
+pub async fn init_connections() -> Result<()> {
     // Initialize database
     let manager: DatabaseManager = _dbdata_create().await;
     match dbdata_init(manager).await {
@@ -289,7 +300,9 @@ pub async fn run_translate(input_dir: &Path, output_dir: Option<&Path>) -> Resul
             .filter_map(|e| e.ok())
         {
             let p = entry.path();
-            if p.is_file() {
+            // Use the file type cached by the directory walk; only stat symlinks
+            let file_type = entry.file_type();
+            if file_type.is_file() || (file_type.is_symlink() && p.is_file()) {
                 if let Some(ext) = p.extension() {
                     if ext == "c" || ext == "h" {
                         return true;
@@ -382,7 +395,7 @@ pub async fn run_translate(input_dir: &Path, output_dir: Option<&Path>) -> Resul
 }
 
 /// Helper: create default cache dir alongside input.
-fn default_cache_dir_for(input_dir: &Path) -> PathBuf {
+pub fn default_cache_dir_for(input_dir: &Path) -> PathBuf {
     let parent = input_dir.parent().unwrap_or_else(|| Path::new("."));
     let dir_name = input_dir
         .file_name()
@@ -392,7 +405,7 @@ fn default_cache_dir_for(input_dir: &Path) -> PathBuf {
 }
 
 /// Helper: default workspace output dir.
-fn default_workspace_dir_for(input_dir: &Path) -> PathBuf {
+pub fn default_workspace_dir_for(input_dir: &Path) -> PathBuf {
     let parent = input_dir.parent().unwrap_or_else(|| Path::new("."));
     let dir_name = input_dir
         .file_name()
@@ -402,7 +415,7 @@ fn default_workspace_dir_for(input_dir: &Path) -> PathBuf {
 }
 
 /// Discover C projects under a directory, grouping by parent directories of .c/.h files.
-async fn discover_c_projects(dir: &PathBuf) -> Result<Vec<PathBuf>> {
+pub async fn discover_c_projects(dir: &PathBuf) -> Result<Vec<PathBuf>> {
     let mut projects = Vec::new();
     let mut processed_dirs = HashSet::new();
 
@@ -425,7 +438,8 @@ async fn discover_c_projects(dir: &PathBuf) -> Result<Vec<PathBuf>> {
         .filter_map(|e| e.ok())
     {
         let path = entry.path();
-        if path.is_file() {
+        let file_type = entry.file_type();
+        if file_type.is_file() || (file_type.is_symlink() && path.is_file()) {
             if let Some(ext) = path.extension() {
                 if ext == "c" || ext == "h" {
                     if let Some(parent) = path.parent() {
@@ -442,7 +456,7 @@ async fn discover_c_projects(dir: &PathBuf) -> Result<Vec<PathBuf>> {
 }
 
 async fn _dbdata_create() -> DatabaseManager {
-    let manager = DatabaseManager::new_default()
+    let manager = DatabaseManager::shared()
         .await
         .expect("Failed to create DatabaseManager");
     manager
@@ -26,7 +26,9 @@
 //
 
 use commandline_tool::Commands;
-use commandline_tool::parse_args;
+use commandline_tool::{
+    default_cache_dir_for, default_workspace_dir_for, discover_c_projects, parse_args,
+};
 use cproject_analy::PreProcessor;
 use lsp_services::lsp_services::{
     analyze_project_with_default_database, check_function_and_class_name,
@@ -35,7 +37,7 @@ use std::fs;
 use std::path::{Path, PathBuf};
 
 use anyhow::{Result, anyhow};
-use env_checker::{AIConnectionStatus, IssueLevel, check_all};
+use env_checker::{AIConnectionStatus, IssueLevel, check_environment};
 
 use chrono::{Datelike, Local, Timelike};
 use log::{debug, error, info, warn};
@@ -43,62 +45,12 @@ use main_processor::MainProcessor;
 use project_remanager::ProjectReorganizer;
 use rand::SeedableRng;
 use rand::{Rng, rngs::StdRng};
-use std::collections::HashSet;
 use tracing_appender::rolling;
 use tracing_log::LogTracer;
 use tracing_subscriber::filter::LevelFilter as SubLevel;
 use tracing_subscriber::fmt;
 use tracing_subscriber::prelude::*;
 
-// // Translation module
-// use main_processor::{MainProcessor, ProjectType};
-
-/// Discover C projects - simplified version
-async fn discover_c_projects(dir: &PathBuf) -> Result<Vec<PathBuf>> {
-    let mut projects = Vec::new();
-    let mut processed_dirs = HashSet::new();
-
-    // If it's a file, process its parent directory directly
-    if dir.is_file() {
-        if let Some(ext) = dir.extension() {
-            if (ext == "c" || ext == "h") && dir.parent().is_some() {
-                let parent = dir.parent().unwrap();
-                if !processed_dirs.contains(parent) {
-                    projects.push(parent.to_path_buf());
-                    processed_dirs.insert(parent.to_path_buf());
-                }
-            }
-        }
-        return Ok(projects);
-    }
-
-    // Use walkdir to avoid recursion issues
-    use walkdir::WalkDir;
-
-    for entry in WalkDir::new(dir)
-        .max_depth(10) // Limit depth to avoid infinite traversal
-        .into_iter()
-        .filter_map(|e| e.ok())
-    {
-        let path = entry.path();
-
-        if path.is_file() {
-            if let Some(ext) = path.extension() {
-                if ext == "c" || ext == "h" {
-                    if let Some(parent) = path.parent() {
-                        if !processed_dirs.contains(parent) {
-                            projects.push(parent.to_path_buf());
-                            processed_dirs.insert(parent.to_path_buf());
-                        }
-                    }
-                }
-            }
-        }
-    }
-
-    Ok(projects)
-}
-
 #[tokio::main]
 async fn main() -> Result<()> {
     println!(
@@ -115,8 +67,14 @@ async fn main() -> Result<()> {
     // First parse CLI, read --debug switch
     let cli = parse_args();
 
-    // Initialize logging system, use tracing to handle both log macros and tracing events uniformly
-    let _ = LogTracer::init();
+    // Initialize logging system, use tracing to handle both log macros and tracing events uniformly.
+    // Capping log's max level lets disabled debug!/trace! calls return before building a record.
+    let log_level = if cli.debug {
+        log::LevelFilter::Debug
+    } else {
+        log::LevelFilter::Info
+    };
+    let _ = LogTracer::builder().with_max_level(log_level).init();
 
     // Ensure log directory exists
     let log_dir = Path::new("log");
@@ -202,7 +160,12 @@ async fn main() -> Result<()> {
         .with(file_layer.with_filter(file_filter));
     let _ = subscriber.try_init();
 
-    let summary = check_all().await;
+    // Only commands that talk to the LLM need the AI provider probe
+    let needs_ai = matches!(
+        cli.command,
+        Commands::Translate { .. } | Commands::Test { .. }
+    );
+    let summary = check_environment(needs_ai).await;
 
     if let Some(err) = &summary.config.error {
         error!("Failed to load config file: {}", err);
@@ -301,17 +264,9 @@ async fn main() -> Result<()> {
             );
 
             // Determine output directory
-            let output_dir = output_dir.clone().unwrap_or_else(|| {
-                let parent = input_dir.parent().unwrap_or_else(|| Path::new("."));
-                // Get input directory name and add "cache" suffix
-                let dir_name = input_dir
-                    .file_name()
-                    .map(|name| name.to_string_lossy().into_owned())
-                    .unwrap_or_else(|| "project".to_string());
-
-                let cache_dir_name = format!("{}_cache", dir_name);
-                parent.join(cache_dir_name)
-            });
+            let output_dir = output_dir
+                .clone()
+                .unwrap_or_else(|| default_cache_dir_for(input_dir));
             println!("Output directory: {}", output_dir.display());
 
             // Ensure output directory exists
@@ -370,8 +325,6 @@ async fn main() -> Result<()> {
                 input_dir.display()
             );
 
-            let processor = MainProcessor::new(main_processor::pkg_config::get_config()?);
-
             if !input_dir.exists() {
                 error!(
                     "Error: Input directory does not exist: {}",
@@ -384,18 +337,13 @@ async fn main() -> Result<()> {
                 return Ok(());
             }
 
+            let processor = MainProcessor::new(main_processor::pkg_config::get_config()?);
+
             // Step 1: Preprocess -> Generate cache directory (if --output-dir is provided, use it as cache directory)
             println!("Starting preprocessing (preprocess)...");
-            let cache_dir: PathBuf = if let Some(p) = output_dir.as_ref() {
-                p.clone()
-            } else {
-                let parent = input_dir.parent().unwrap_or_else(|| Path::new("."));
-                let dir_name = input_dir
-                    .file_name()
-                    .map(|n| n.to_string_lossy().into_owned())
-                    .unwrap_or_else(|| "project".to_string());
-                parent.join(format!("{}_cache", dir_name))
-            };
+            let cache_dir: PathBuf = output_dir
+                .clone()
+                .unwrap_or_else(|| default_cache_dir_for(input_dir));
 
             // If cache directory doesn't exist or contains no .c/.h files, run preprocessing
             fn cache_has_c_or_h(dir: &Path) -> bool {
@@ -409,7 +357,8 @@ async fn main() -> Result<()> {
                     .filter_map(|e| e.ok())
                 {
                     let p = entry.path();
-                    if p.is_file() {
+                    let file_type = entry.file_type();
+                    if file_type.is_file() || (file_type.is_symlink() && p.is_file()) {
                         if let Some(ext) = p.extension() {
                             if ext == "c" || ext == "h" {
                                 return true;
@@ -473,33 +422,21 @@ async fn main() -> Result<()> {
             let user_graph =
                 PathBuf::from("/Users/peng/Documents/Tmp/chibicc_cache/relation_graph.json");
             let graph_in_cache = cache_dir.join("relation_graph.json");
-            if user_graph.exists() {
-                info!(
-                    "Using dependency-aware scheduling (user path): {}",
-                    user_graph.display()
-                );
-                match processor
-                    .process_with_graph(&user_graph, Some(&cache_dir))
-                    .await
-                {
-                    Ok(()) => {
-                        info!("✅ Dependency-aware processing completed");
-                    }
-                    Err(e) => {
-                        error!(
-                            "Dependency-aware processing failed: {}, falling back to regular batch processing",
-                            e
-                        );
-                        let _ = processor.process_batch(projects.clone()).await;
-                    }
-                }
+            let graph = if user_graph.exists() {
+                Some((user_graph, "user path"))
             } else if graph_in_cache.exists() {
+                Some((graph_in_cache, "relation_graph.json in cache"))
+            } else {
+                None
+            };
+            if let Some((graph_path, source)) = graph {
                 info!(
-                    "Using dependency-aware scheduling (relation_graph.json in cache): {}",
-                    graph_in_cache.display()
+                    "Using dependency-aware scheduling ({}): {}",
+                    source,
+                    graph_path.display()
                 );
                 match processor
-                    .process_with_graph(&graph_in_cache, Some(&cache_dir))
+                    .process_with_graph(&graph_path, Some(&cache_dir))
                     .await
                 {
                     Ok(()) => {
@@ -537,12 +474,7 @@ async fn main() -> Result<()> {
                                 .unwrap_or_else(|| "project".to_string());
                             parent.join(format!("{}_workspace", dir_name))
                         } else {
-                            let parent = input_dir.parent().unwrap_or_else(|| Path::new("."));
-                            let dir_name = input_dir
-                                .file_name()
-                                .map(|n| n.to_string_lossy().into_owned())
-                                .unwrap_or_else(|| "project".to_string());
-                            parent.join(format!("{}_workspace", dir_name))
+                            default_workspace_dir_for(input_dir)
                         };
                         println!(
                             "Starting project reorganization: {}",
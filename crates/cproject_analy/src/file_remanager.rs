@@ -4,13 +4,16 @@ use glob::Pattern;
 use indicatif::{MultiProgress, ProgressBar, ProgressIterator, ProgressStyle};
 use log::{error, info, warn};
 use rayon::prelude::*;
+use regex::{Regex, RegexSet};
 use relation_analy::generate_c_dependency_graph;
 use serde::Serialize;
 use serde_json;
 use std::{
+    borrow::Cow,
     collections::HashSet,
+    ffi::OsStr,
     fs::{self, File},
-    io::{BufReader, BufWriter, Read, Write},
+    io::{self, BufReader, BufWriter, Write},
     path::{Path, PathBuf},
     process::Command,
     sync::{Arc, Mutex},
@@ -55,11 +58,78 @@ pub struct ProcessingStats {
     pub mapping_count: usize,
 }
 
+/// Layout of mapping.json; borrows the mappings so they are serialized in place
+#[derive(Serialize)]
+struct MappingFile<'a> {
+    timestamp: String,
+    total_mappings: usize,
+    mappings: &'a [FileMapping],
+}
+
+/// Layout of processing_report.json
+#[derive(Serialize)]
+struct ProcessingReport<'a> {
+    statistics: &'a ProcessingStats,
+    config: &'a PreprocessConfig,
+    timestamp: String,
+}
+
+/// Pairing rules compiled once per preprocessor
+///
+/// The `RegexSet` tells in one pass which rules match a path; only those
+/// rules are then run again to extract capture groups.
+struct PairingMatcher {
+    set: RegexSet,
+    rules: Vec<(Regex, String)>,
+}
+
+impl PairingMatcher {
+    fn new(pairing_rules: &[(String, String)]) -> Self {
+        let rules: Vec<(Regex, String)> = pairing_rules
+            .iter()
+            .filter_map(
+                |(source_pattern, header_pattern)| match Regex::new(source_pattern) {
+                    Ok(regex) => Some((regex, header_pattern.clone())),
+                    Err(e) => {
+                        warn!("Invalid pairing rule {}: {}", source_pattern, e);
+                        None
+                    }
+                },
+            )
+            .collect();
+        let set = RegexSet::new(rules.iter().map(|(regex, _)| regex.as_str()))
+            .expect("pairing rules were already validated individually");
+
+        Self { set, rules }
+    }
+}
+
+/// Header file with its string form and file name extracted once
+///
+/// Every source file is checked against every header, so these are computed
+/// up front instead of inside the pairing loop.
+struct HeaderCandidate<'a> {
+    path: &'a PathBuf,
+    path_str: Cow<'a, str>,
+    file_name: Option<&'a OsStr>,
+}
+
+impl<'a> HeaderCandidate<'a> {
+    fn new(path: &'a PathBuf) -> Self {
+        Self {
+            path,
+            path_str: path.to_string_lossy(),
+            file_name: path.file_name(),
+        }
+    }
+}
+
 /// File preprocessor
 pub struct CProjectPreprocessor {
     config: PreprocessConfig,
     stats: ProcessingStats,
     file_mappings: Vec<FileMapping>,
+    pairing: PairingMatcher,
 }
 
 impl CProjectPreprocessor {
@@ -69,10 +139,12 @@ impl CProjectPreprocessor {
             Some(config) => config,
             None => PreprocessConfig::default(),
         };
+        let pairing = PairingMatcher::new(&config.pairing_rules);
         CProjectPreprocessor {
             config,
             stats: ProcessingStats::default(),
             file_mappings: Vec::new(),
+            pairing,
         }
     }
 
@@ -108,12 +180,15 @@ impl CProjectPreprocessor {
         main_pb.set_message("⚙️  Generating compile_commands.json...");
         self.generate_compiledb(source_dir, output_dir)?;
 
+        // Parallel stages run on a pool sized by `worker_count`
+        let pool = self.build_thread_pool()?;
+
         // Scan and categorize files
         main_pb.set_message("🔍 Scanning project files...");
-        let all_files = self.scan_files(source_dir, &m)?;
+        let all_files = pool.install(|| self.scan_files(source_dir, &m))?;
 
         main_pb.set_message("📋 Categorizing files...");
-        let categorized_files = self.categorize_files(&all_files, &m)?;
+        let categorized_files = pool.install(|| self.categorize_files(&all_files, &m))?;
 
         // Generate mapping files
         main_pb.set_message("🗺️  Generating file mappings...");
@@ -122,7 +197,7 @@ impl CProjectPreprocessor {
 
         // Process categorized files
         main_pb.set_message("📦 Processing categorized files...");
-        self.process_categorized_files(&categorized_files, output_dir, &m)?;
+        pool.install(|| self.process_categorized_files(&categorized_files, output_dir, &m))?;
 
         // Relationship analysis
         main_pb.set_message("🔗 Performing relationship analysis...");
@@ -139,15 +214,18 @@ impl CProjectPreprocessor {
         Ok(std::mem::take(&mut self.stats))
     }
 
+    /// Build the worker pool for the parallel stages (`worker_count = 0` uses one worker per CPU)
+    fn build_thread_pool(&self) -> Result<rayon::ThreadPool> {
+        rayon::ThreadPoolBuilder::new()
+            .num_threads(self.config.worker_count)
+            .build()
+            .context("Unable to create preprocessing worker pool")
+    }
+
     fn relation_analysis(&self, source_dir: &Path) -> Result<()> {
         match generate_c_dependency_graph(source_dir) {
             Ok(rel) => {
                 info!("Relation graph: {:#?}", rel);
-                let _include_edges: usize = rel
-                    .files
-                    .values()
-                    .map(|n| n.local_includes.len() + n.system_includes.len())
-                    .sum();
                 info!(
                     "Include dirs: {} | Link libs: {} | Link dirs: {}",
                     rel.build.include_dirs.len(),
@@ -252,22 +330,33 @@ impl CProjectPreprocessor {
         );
         scan_pb.set_message("Scanning");
 
-        for entry in entries.iter().progress_with(scan_pb.clone()) {
-            let path = entry.path();
-            let relative_path = path.strip_prefix(source_dir).unwrap_or(path);
+        // Pattern matching and stat calls are independent per file, so run them on the worker pool
+        let scanned: Vec<(PathBuf, Option<u64>)> = entries
+            .par_iter()
+            .filter_map(|entry| {
+                scan_pb.inc(1);
+                let path = entry.path();
+                let relative_path = path.strip_prefix(source_dir).unwrap_or(path);
+
+                // Check exclude patterns
+                if exclude_patterns
+                    .iter()
+                    .any(|p| p.matches_path(relative_path))
+                {
+                    return None;
+                }
 
-            // Check exclude patterns
-            if exclude_patterns
-                .iter()
-                .any(|p| p.matches_path(relative_path))
-            {
-                self.stats.skipped_files += 1;
-                continue;
-            }
+                let size = fs::metadata(path).ok().map(|metadata| metadata.len());
+                Some((path.to_path_buf(), size))
+            })
+            .collect();
+        scan_pb.finish();
 
-            if let Ok(metadata) = fs::metadata(path) {
-                files.push(path.to_path_buf());
-                self.stats.total_size += metadata.len();
+        self.stats.skipped_files += entries.len() - scanned.len();
+        for (path, size) in scanned {
+            if let Some(size) = size {
+                files.push(path);
+                self.stats.total_size += size;
             } else {
                 self.stats
                     .errors
@@ -303,7 +392,11 @@ impl CProjectPreprocessor {
 
         // Separate source files and header files
         let source_files: Vec<_> = files.iter().filter(|f| self.is_source_file(f)).collect();
-        let header_files: Vec<_> = files.iter().filter(|f| self.is_header_file(f)).collect();
+        let header_files: Vec<_> = files
+            .iter()
+            .filter(|f| self.is_header_file(f))
+            .map(HeaderCandidate::new)
+            .collect();
 
         pb.set_message(format!(
             "Found {} source files, {} header files",
@@ -311,13 +404,23 @@ impl CProjectPreprocessor {
             header_files.len()
         ));
 
+        // Header lookups are independent per source file, so resolve them in parallel
+        let header_matches: Vec<Option<PathBuf>> = source_files
+            .par_iter()
+            .map(|source_file| {
+                let header = self.find_matching_header(source_file, &header_files);
+                pb.inc(1);
+                header
+            })
+            .collect();
+
         // Find paired files
-        for source_file in source_files.iter().progress_with(pb.clone()) {
+        for (source_file, header_match) in source_files.iter().zip(header_matches) {
             if processed_files.contains(*source_file) {
                 continue;
             }
 
-            if let Some(header_file) = self.find_matching_header(source_file, &header_files) {
+            if let Some(header_file) = header_match {
                 categorized.push(FileCategory::Paired {
                     source: (*source_file).clone(),
                     header: header_file.clone(),
@@ -458,18 +561,15 @@ impl CProjectPreprocessor {
     }
 
     /// Copy large file (in chunks)
+    ///
+    /// `io::copy` between files is done in the kernel (`copy_file_range`/`sendfile`) on
+    /// Linux, so the data never passes through user space; elsewhere it falls back to
+    /// copying `chunk_size` bytes at a time through the buffers.
     fn copy_large_file(&self, src: &Path, dst: &Path) -> Result<()> {
         let mut src_file = BufReader::with_capacity(self.config.chunk_size, File::open(src)?);
         let mut dst_file = BufWriter::with_capacity(self.config.chunk_size, File::create(dst)?);
-        let mut buffer = vec![0u8; self.config.chunk_size];
 
-        loop {
-            let bytes_read = src_file.read(&mut buffer)?;
-            if bytes_read == 0 {
-                break;
-            }
-            dst_file.write_all(&buffer[..bytes_read])?;
-        }
+        io::copy(&mut src_file, &mut dst_file)?;
 
         dst_file.flush()?;
         Ok(())
@@ -479,30 +579,31 @@ impl CProjectPreprocessor {
     fn find_matching_header(
         &self,
         source_file: &Path,
-        header_files: &[&PathBuf],
+        header_files: &[HeaderCandidate],
     ) -> Option<PathBuf> {
-        for (source_pattern, header_pattern) in &self.config.pairing_rules {
-            if let Ok(regex) = regex::Regex::new(source_pattern) {
-                let source_str = source_file.to_string_lossy();
-                if let Some(captures) = regex.captures(&source_str) {
-                    let mut expected_header = header_pattern.clone();
-
-                    // Replace capture groups
-                    for i in 0..captures.len() {
-                        if let Some(cap) = captures.get(i) {
-                            expected_header =
-                                expected_header.replace(&format!("\\{}", i), cap.as_str());
-                        }
+        let source_str = source_file.to_string_lossy();
+
+        // Matched rule indices come back in ascending order, so rule priority is preserved
+        for rule_idx in self.pairing.set.matches(&source_str).iter() {
+            let (regex, header_pattern) = &self.pairing.rules[rule_idx];
+            if let Some(captures) = regex.captures(&source_str) {
+                let mut expected_header = header_pattern.clone();
+
+                // Replace capture groups
+                for i in 0..captures.len() {
+                    if let Some(cap) = captures.get(i) {
+                        expected_header =
+                            expected_header.replace(&format!("\\{}", i), cap.as_str());
                     }
+                }
 
-                    // Find matching header file
-                    for header_file in header_files {
-                        let header_str = header_file.to_string_lossy();
-                        if header_str.contains(&expected_header)
-                            || header_file.file_name() == Path::new(&expected_header).file_name()
-                        {
-                            return Some((*header_file).clone());
-                        }
+                // Find matching header file
+                let expected_name = Path::new(&expected_header).file_name();
+                for header_file in header_files {
+                    if header_file.path_str.contains(&expected_header)
+                        || header_file.file_name == expected_name
+                    {
+                        return Some(header_file.path.clone());
                     }
                 }
             }
@@ -638,14 +739,14 @@ impl CProjectPreprocessor {
     /// Save mapping file
     fn save_mapping(&self, output_dir: &Path) -> Result<()> {
         let mapping_path = output_dir.join("mapping.json");
-        let mapping_json = serde_json::json!({
-            "timestamp": chrono::Utc::now().to_rfc3339(),
-            "total_mappings": self.file_mappings.len(),
-            "mappings": &self.file_mappings
-        });
+        let mapping_file = MappingFile {
+            timestamp: chrono::Utc::now().to_rfc3339(),
+            total_mappings: self.file_mappings.len(),
+            mappings: &self.file_mappings,
+        };
 
-        fs::write(&mapping_path, serde_json::to_string_pretty(&mapping_json)?)?;
-        Ok(())
+        // Only read back by tools, so skip the indentation
+        write_json(&mapping_path, &mapping_file, false)
     }
 
     /// Generate processing report
@@ -654,13 +755,13 @@ impl CProjectPreprocessor {
         let text_report_path = output_dir.join("processing_log.txt");
 
         // JSON report
-        let json_report = serde_json::json!({
-            "statistics": &self.stats,
-            "config": &self.config,
-            "timestamp": chrono::Utc::now().to_rfc3339(),
-        });
+        let json_report = ProcessingReport {
+            statistics: &self.stats,
+            config: &self.config,
+            timestamp: chrono::Utc::now().to_rfc3339(),
+        };
 
-        fs::write(&report_path, serde_json::to_string_pretty(&json_report)?)?;
+        write_json(&report_path, &json_report, true)?;
 
         // Text report
         let mut text_report = String::new();
@@ -703,22 +804,27 @@ impl CProjectPreprocessor {
         println!("   • File mappings: {}", self.stats.mapping_count);
 
         println!("\n🔗 Relationship Analysis:");
-        match generate_c_dependency_graph(output_dir) {
-            Ok(rel) => {
-                let include_edges: usize = rel
-                    .files
-                    .values()
-                    .map(|n| n.local_includes.len() + n.system_includes.len())
-                    .sum();
-                println!("   • File nodes: {}", rel.files.len());
-                println!("   • Include relationships: {}", include_edges);
-                println!("   • Include directories: {}", rel.build.include_dirs.len());
-                println!("   • Link libraries: {}", rel.build.link_libs.len());
-                println!("   • Link directories: {}", rel.build.link_dirs.len());
-                println!("   • Dependency graph generation: ✅ Success");
-            }
-            Err(_) => {
-                println!("   • Dependency graph generation: ❌ Failed");
+        if self.stats.total_files == 0 {
+            // Empty project: nothing to scan, skip walking the output tree
+            println!("   • Dependency graph generation: ⏭️ Skipped (no files)");
+        } else {
+            match generate_c_dependency_graph(output_dir) {
+                Ok(rel) => {
+                    let include_edges: usize = rel
+                        .files
+                        .values()
+                        .map(|n| n.local_includes.len() + n.system_includes.len())
+                        .sum();
+                    println!("   • File nodes: {}", rel.files.len());
+                    println!("   • Include relationships: {}", include_edges);
+                    println!("   • Include directories: {}", rel.build.include_dirs.len());
+                    println!("   • Link libraries: {}", rel.build.link_libs.len());
+                    println!("   • Link directories: {}", rel.build.link_dirs.len());
+                    println!("   • Dependency graph generation: ✅ Success");
+                }
+                Err(_) => {
+                    println!("   • Dependency graph generation: ❌ Failed");
+                }
             }
         }
 
@@ -955,6 +1061,19 @@ impl CProjectPreprocessor {
     }
 }
 
+/// Serialize a value as JSON straight into a buffered file.
+/// Use `pretty` for files people read; machine-read outputs are written compact.
+fn write_json<T: Serialize>(path: &Path, value: &T, pretty: bool) -> Result<()> {
+    let mut writer = BufWriter::new(File::create(path)?);
+    if pretty {
+        serde_json::to_writer_pretty(&mut writer, value)?;
+    } else {
+        serde_json::to_writer(&mut writer, value)?;
+    }
+    writer.flush()?;
+    Ok(())
+}
+
 /// Format file size
 fn format_size(size: u64) -> String {
     const UNITS: &[&str] = &["B", "KB", "MB", "GB", "TB"];
@@ -1001,6 +1120,32 @@ mod tests {
         assert_eq!(pair_name, "example");
     }
 
+    #[test]
+    fn test_find_matching_header() {
+        let config = PreprocessConfig::default();
+        let preprocessor = CProjectPreprocessor::new(Some(config));
+
+        let util_h = PathBuf::from("proj/util.h");
+        let widget_hpp = PathBuf::from("proj/include/widget.hpp");
+        let headers = vec![
+            HeaderCandidate::new(&util_h),
+            HeaderCandidate::new(&widget_hpp),
+        ];
+
+        assert_eq!(
+            preprocessor.find_matching_header(Path::new("proj/util.c"), &headers),
+            Some(util_h.clone())
+        );
+        assert_eq!(
+            preprocessor.find_matching_header(Path::new("proj/src/widget.cpp"), &headers),
+            Some(widget_hpp.clone())
+        );
+        assert_eq!(
+            preprocessor.find_matching_header(Path::new("proj/main.c"), &headers),
+            None
+        );
+    }
+
     #[test]
     fn test_format_size() {
         assert_eq!(format_size(1024), "1.00 KB");
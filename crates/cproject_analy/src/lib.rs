@@ -199,11 +199,9 @@ impl PreProcessor {
                     "timestamp": chrono::Utc::now().to_rfc3339()
                 });
 
-                fs::write(
-                    &analysis_path,
-                    serde_json::to_string_pretty(&analysis_result)?,
-                )
-                .context("Failed to save LSP analysis results")?;
+                // Consumed only by the analysis step below, so write it compact
+                fs::write(&analysis_path, serde_json::to_vec(&analysis_result)?)
+                    .context("Failed to save LSP analysis results")?;
 
                 lsp_pb.finish_with_message("✅ LSP analysis completed!");
                 debug!("LSP analysis results saved to {}", analysis_path.display());
@@ -240,8 +238,14 @@ impl PreProcessor {
 
             if let Some(funcs) = analysis_json.get("functions").and_then(|v| v.as_array()) {
                 // Prepare embedding documents and batch insert data
-                let mut documents: Vec<String> = Vec::new();
-                let mut interfaces_data: Vec<HashMap<String, serde_json::Value>> = Vec::new();
+                let mut documents: Vec<String> = Vec::with_capacity(funcs.len());
+                let mut interfaces_data: Vec<HashMap<String, serde_json::Value>> =
+                    Vec::with_capacity(funcs.len());
+                // Project name: prefer directory name, otherwise use full path
+                let project_name = source_dir
+                    .file_name()
+                    .map(|s| s.to_string_lossy().to_string())
+                    .unwrap_or_else(|| source_dir.to_string_lossy().to_string());
 
                 for f in funcs {
                     let name = f.get("name").and_then(|v| v.as_str()).unwrap_or("");
@@ -280,11 +284,6 @@ impl PreProcessor {
                     data.insert("code".to_string(), json!(signature));
                     data.insert("language".to_string(), json!("c"));
                     data.insert("name".to_string(), json!(name));
-                    // Project name: prefer directory name, otherwise use full path
-                    let project_name = source_dir
-                        .file_name()
-                        .map(|s| s.to_string_lossy().to_string())
-                        .unwrap_or_else(|| source_dir.to_string_lossy().to_string());
                     data.insert("project_name".to_string(), json!(project_name));
                     data.insert("file_path".to_string(), json!(file_path));
                     data.insert("inputs".to_string(), json!(inputs_meta));
@@ -302,8 +301,8 @@ impl PreProcessor {
                                 anyhow::anyhow!(format!("Failed to initialize FastEmbed: {}", e))
                             })?;
 
-                    // Execute embedding
-                    let embeddings = model.embed(documents.clone(), None).map_err(|e| {
+                    // Execute embedding: all signatures go through the model in one batched call
+                    let embeddings = model.embed(documents, None).map_err(|e| {
                         anyhow::anyhow!(format!("FastEmbed embedding failed: {}", e))
                     })?;
 
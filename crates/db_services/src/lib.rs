@@ -3,10 +3,11 @@ use chrono::{DateTime, Utc};
 use log::{debug, info};
 use serde::{Deserialize, Serialize};
 use serde_json::{json, Value as JsonValue};
-use std::collections::HashMap;
-use std::sync::Arc;
+use std::collections::{HashMap, HashSet};
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::{Arc, Mutex};
 
-use tokio::sync::Mutex;
+use tokio::sync::OnceCell;
 
 mod pkg_config;
 use pkg_config::{get_config, DBConfig};
@@ -30,6 +31,25 @@ pub struct InterfaceInfo {
     pub updated_at: Option<DateTime<Utc>>,
 }
 
+/// Interface of a stored code entry; inputs, outputs and the qdrant id are
+/// left empty, since they are only kept in the entry's metadata
+impl From<CodeEntry> for InterfaceInfo {
+    fn from(entry: CodeEntry) -> Self {
+        InterfaceInfo {
+            id: None,
+            name: entry.function_name,
+            inputs: Vec::new(),
+            outputs: Vec::new(),
+            file_path: entry.file_path,
+            qdrant_id: None,
+            language: entry.language,
+            project_name: Some(entry.project),
+            created_at: Some(entry.created_at),
+            updated_at: Some(entry.updated_at),
+        }
+    }
+}
+
 /// Project information structure
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct ProjectInfo {
@@ -65,29 +85,39 @@ pub struct SystemStatus {
 }
 
 /// Database manager - unified management of SQLite and Qdrant databases
+///
+/// Both services are shared without a lock: SQLite access goes through its
+/// connection pool and the Qdrant client is safe to use concurrently, so
+/// independent operations do not serialize behind each other.
 #[derive(Clone)]
 pub struct DatabaseManager {
-    sqlite: Arc<Mutex<SqliteService>>,
-    qdrant: Arc<Mutex<QdrantServer>>,
+    sqlite: Arc<SqliteService>,
+    qdrant: Arc<QdrantServer>,
+    /// Configuration values already read or written, shared by all clones
+    config_cache: Arc<Mutex<HashMap<String, JsonValue>>>,
+    /// Set by the first close() on any clone
+    closed: Arc<AtomicBool>,
 }
 
 impl DatabaseManager {
     /// Create new database manager instance
     pub async fn new(database_config: DBConfig) -> Result<Self> {
-        let sqlite_service = Arc::new(Mutex::new(
+        let sqlite_service = Arc::new(
             SqliteService::new(database_config.sqlite.clone())
                 .map_err(|e| anyhow!("Failed to create SQLite service: {}", e))?,
-        ));
+        );
 
-        let qdrant_service = Arc::new(Mutex::new(
+        let qdrant_service = Arc::new(
             QdrantServer::new(database_config.qdrant.clone())
                 .await
                 .map_err(|e| anyhow!("Failed to create Qdrant service: {}", e))?,
-        ));
+        );
 
         let manager = DatabaseManager {
             sqlite: sqlite_service,
             qdrant: qdrant_service,
+            config_cache: Arc::new(Mutex::new(HashMap::new())),
+            closed: Arc::new(AtomicBool::new(false)),
         };
 
         manager.init_config().await?;
@@ -106,6 +136,15 @@ impl DatabaseManager {
         Self::new(config).await
     }
 
+    /// Get the process-wide database manager built from the default configuration
+    ///
+    /// The first call connects; later calls clone the same handle, so callers
+    /// share one SQLite connection pool and one Qdrant client.
+    pub async fn shared() -> Result<Self> {
+        static SHARED: OnceCell<DatabaseManager> = OnceCell::const_new();
+        SHARED.get_or_try_init(Self::new_default).await.cloned()
+    }
+
     /// Initialize default configuration
     async fn init_config(&self) -> Result<()> {
         let default_configs = vec![
@@ -129,12 +168,35 @@ impl DatabaseManager {
             ),
         ];
 
+        // Load every stored value in one scan (newest first) to seed the cache,
+        // then insert the missing defaults together in a single transaction
+        let stored = self
+            .sqlite
+            .search_code_entries(Some("config"), None, None, None)?;
+        let mut cache = HashMap::new();
+        for entry in &stored {
+            if !cache.contains_key(&entry.function_name) {
+                if let Some(value) = config_value(entry) {
+                    cache.insert(entry.function_name.clone(), value);
+                }
+            }
+        }
+
+        let mut missing = Vec::new();
         for (key, value, desc) in default_configs {
-            if self.get_config(key).await.is_none() {
-                self.set_config(key, value, Some(desc)).await?;
+            if !cache.contains_key(key) {
+                missing.push(config_entry(key, &value, Some(desc)));
+                cache.insert(key.to_string(), value);
             }
         }
+        if !missing.is_empty() {
+            self.sqlite.insert_code_entries(missing)?;
+        }
 
+        self.config_cache
+            .lock()
+            .unwrap_or_else(|e| e.into_inner())
+            .extend(cache);
         Ok(())
     }
 
@@ -155,12 +217,10 @@ impl DatabaseManager {
         let project = project_name.unwrap_or("default");
 
         // First store vector to Qdrant
-        let qdrant_id = {
-            let qdrant = self.qdrant.lock().await;
-            qdrant
-                .insert_code_vector(code, vector, language, name, project, file_path, metadata)
-                .await?
-        };
+        let qdrant_id = self
+            .qdrant
+            .insert_code_vector(code, vector, language, name, project, file_path, metadata)
+            .await?;
 
         // Then store code entry to SQLite
         let code_entry = CodeEntry {
@@ -183,10 +243,7 @@ impl DatabaseManager {
             ),
         };
 
-        let interface_id = {
-            let sqlite = self.sqlite.lock().await;
-            sqlite.insert_code_entry(code_entry)?
-        };
+        let interface_id = self.sqlite.insert_code_entry(code_entry)?;
 
         info!(
             "Interface storage completed: {}, SQLite ID: {}, Qdrant ID: {}",
@@ -209,67 +266,85 @@ impl DatabaseManager {
             .await;
 
         // Search similar vectors from Qdrant
-        let similar_vectors = {
-            let qdrant = self.qdrant.lock().await;
-            qdrant
-                .search_similar_code(query_vector, limit, language, project, threshold)
-                .await?
-        };
-
-        let mut results = Vec::new();
-        let sqlite = self.sqlite.lock().await;
-
-        // 获取对应的SQLite元数据
-        for vector_result in similar_vectors {
-            if let Some(qdrant_id_value) = vector_result.get("id") {
-                let qdrant_id = qdrant_id_value.as_str().unwrap_or("").to_string();
-
-                // 在SQLite中搜索对应的代码条目
-                let code_entries = sqlite.search_code_entries(language, project, None, None)?;
-
-                for entry in code_entries {
-                    if let Some(metadata_str) = &entry.metadata {
-                        if let Ok(metadata) = serde_json::from_str::<JsonValue>(metadata_str) {
-                            if let Some(stored_qdrant_id) = metadata.get("qdrant_id") {
-                                if stored_qdrant_id.as_str() == Some(&qdrant_id) {
-                                    let interface = InterfaceInfo {
-                                        id: None,
-                                        name: entry.function_name.clone(),
-                                        inputs: metadata
-                                            .get("inputs")
-                                            .and_then(|v| serde_json::from_value(v.clone()).ok())
-                                            .unwrap_or_default(),
-                                        outputs: metadata
-                                            .get("outputs")
-                                            .and_then(|v| serde_json::from_value(v.clone()).ok())
-                                            .unwrap_or_default(),
-                                        file_path: entry.file_path.clone(),
-                                        qdrant_id: Some(qdrant_id.clone()),
-                                        language: entry.language,
-                                        project_name: Some(entry.project),
-                                        created_at: Some(entry.created_at),
-                                        updated_at: Some(entry.updated_at),
-                                    };
-
-                                    let search_result = SearchResult {
-                                        interface,
-                                        vector_info: vector_result.clone(),
-                                        similarity_score: vector_result
-                                            .get("score")
-                                            .and_then(|v| v.as_f64())
-                                            .unwrap_or(0.0)
-                                            as f32,
-                                    };
-                                    results.push(search_result);
-                                    break;
-                                }
-                            }
-                        }
-                    }
-                }
+        let similar_vectors = self
+            .qdrant
+            .search_similar_code(query_vector, limit, language, project, threshold)
+            .await?;
+
+        // 获取对应的SQLite元数据: read each hit's id once, fetch only the entries
+        // whose indexed qdrant_id is one of them, then index those entries by id
+        let hits: Vec<(&str, &HashMap<String, JsonValue>)> = similar_vectors
+            .iter()
+            .filter_map(|vector_result| {
+                let qdrant_id = vector_result.get("id").and_then(|id| id.as_str())?;
+                Some((qdrant_id, vector_result))
+            })
+            .collect();
+        let hit_ids: HashSet<&str> = hits.iter().map(|(qdrant_id, _)| *qdrant_id).collect();
+        let mut entries_by_qdrant_id: HashMap<&str, (CodeEntry, JsonValue)> = HashMap::new();
+        if !hit_ids.is_empty() {
+            let lookup_ids: Vec<&str> = hit_ids.iter().copied().collect();
+            let entries =
+                self.sqlite
+                    .search_code_entries_by_qdrant_ids(&lookup_ids, language, project)?;
+            for entry in entries {
+                let Some(metadata) = entry
+                    .metadata
+                    .as_deref()
+                    .and_then(|m| serde_json::from_str::<JsonValue>(m).ok())
+                else {
+                    continue;
+                };
+                let Some(&hit_id) = metadata
+                    .get("qdrant_id")
+                    .and_then(|v| v.as_str())
+                    .and_then(|stored_qdrant_id| hit_ids.get(stored_qdrant_id))
+                else {
+                    continue;
+                };
+                // Entries come newest first; keep the first match for each id
+                entries_by_qdrant_id
+                    .entry(hit_id)
+                    .or_insert((entry, metadata));
             }
         }
 
+        let mut results = Vec::with_capacity(hits.len());
+        for (qdrant_id, vector_result) in hits {
+            // Point ids are unique per search, so the entry can be moved out
+            let Some((entry, metadata)) = entries_by_qdrant_id.remove(qdrant_id) else {
+                continue;
+            };
+
+            let interface = InterfaceInfo {
+                id: None,
+                name: entry.function_name,
+                inputs: metadata
+                    .get("inputs")
+                    .and_then(|v| Deserialize::deserialize(v).ok())
+                    .unwrap_or_default(),
+                outputs: metadata
+                    .get("outputs")
+                    .and_then(|v| Deserialize::deserialize(v).ok())
+                    .unwrap_or_default(),
+                file_path: entry.file_path,
+                qdrant_id: Some(qdrant_id.to_string()),
+                language: entry.language,
+                project_name: Some(entry.project),
+                created_at: Some(entry.created_at),
+                updated_at: Some(entry.updated_at),
+            };
+
+            results.push(SearchResult {
+                interface,
+                vector_info: vector_result.clone(),
+                similarity_score: vector_result
+                    .get("score")
+                    .and_then(|v| v.as_f64())
+                    .unwrap_or(0.0) as f32,
+            });
+        }
+
         debug!("搜索到 {} 个相似接口", results.len());
         Ok(results)
     }
@@ -279,9 +354,7 @@ impl DatabaseManager {
         &self,
         interface_id: &str,
     ) -> Result<Option<HashMap<String, JsonValue>>> {
-        let sqlite = self.sqlite.lock().await;
-
-        if let Some(code_entry) = sqlite.get_code_entry(interface_id)? {
+        if let Some(code_entry) = self.sqlite.get_code_entry(interface_id)? {
             let mut result = HashMap::new();
             result.insert("id".to_string(), json!(code_entry.id));
             result.insert("code".to_string(), json!(code_entry.code));
@@ -321,10 +394,9 @@ impl DatabaseManager {
         error_message: Option<&str>,
         translated_vector: Option<Vec<f32>>,
     ) -> Result<String> {
-        let sqlite = self.sqlite.lock().await;
-
         // 获取原始接口信息
-        let original_entry = sqlite
+        let original_entry = self
+            .sqlite
             .get_code_entry(interface_id)?
             .ok_or_else(|| anyhow!("Interface not found: {}", interface_id))?;
 
@@ -350,13 +422,13 @@ impl DatabaseManager {
             ),
         };
 
-        let history_id = sqlite.insert_conversion_result(conversion_result)?;
+        let history_id = self.sqlite.insert_conversion_result(conversion_result)?;
 
         // If translation successful and has vector, store Rust code vector
         if success {
             if let Some(vector) = translated_vector {
-                let qdrant = self.qdrant.lock().await;
-                let _rust_qdrant_id = qdrant
+                let _rust_qdrant_id = self
+                    .qdrant
                     .insert_code_vector(
                         translated_code,
                         vector,
@@ -384,27 +456,22 @@ impl DatabaseManager {
         name: &str,
         project: Option<&str>,
     ) -> Result<Vec<InterfaceInfo>> {
-        let sqlite = self.sqlite.lock().await;
-        let code_entries = sqlite.search_code_entries(None, project, Some(name), None)?;
+        let code_entries = self
+            .sqlite
+            .search_code_entries(None, project, Some(name), None)?;
 
-        let mut interfaces = Vec::new();
-        for entry in code_entries {
-            let interface = InterfaceInfo {
-                id: None,
-                name: entry.function_name.clone(),
-                inputs: Vec::new(),  // Need to parse from metadata
-                outputs: Vec::new(), // Need to parse from metadata
-                file_path: entry.file_path.clone(),
-                qdrant_id: None, // Need to parse from metadata
-                language: entry.language,
-                project_name: Some(entry.project),
-                created_at: Some(entry.created_at),
-                updated_at: Some(entry.updated_at),
-            };
-            interfaces.push(interface);
-        }
+        Ok(code_entries.into_iter().map(InterfaceInfo::from).collect())
+    }
+
+    /// Search interfaces matching any of several names with batched queries
+    pub async fn search_interfaces_by_names(
+        &self,
+        names: &[&str],
+        project: Option<&str>,
+    ) -> Result<Vec<InterfaceInfo>> {
+        let code_entries = self.sqlite.search_code_entries_by_names(names, project)?;
 
-        Ok(interfaces)
+        Ok(code_entries.into_iter().map(InterfaceInfo::from).collect())
     }
 
     /// Search code by text content
@@ -414,21 +481,19 @@ impl DatabaseManager {
         language: Option<&str>,
         project: Option<&str>,
     ) -> Result<Vec<HashMap<String, JsonValue>>> {
-        let sqlite = self.sqlite.lock().await;
-        let code_entries = sqlite.search_code_entries(language, project, None, None)?;
+        let code_entries = self
+            .sqlite
+            .search_code_entries_by_text(query_text, language, project)?;
 
-        let mut results = Vec::new();
+        let mut results = Vec::with_capacity(code_entries.len());
         for entry in code_entries {
             let mut result = HashMap::new();
             result.insert("id".to_string(), json!(entry.id));
             result.insert("code".to_string(), json!(entry.code));
             result.insert("language".to_string(), json!(entry.language));
-            // Filter by query text manually since SQLite service doesn't support text search
-            if entry.code.contains(query_text) || entry.function_name.contains(query_text) {
-                result.insert("function_name".to_string(), json!(entry.function_name));
-                result.insert("project".to_string(), json!(entry.project));
-                result.insert("file_path".to_string(), json!(entry.file_path));
-            }
+            result.insert("function_name".to_string(), json!(entry.function_name));
+            result.insert("project".to_string(), json!(entry.project));
+            result.insert("file_path".to_string(), json!(entry.file_path));
             results.push(result);
         }
 
@@ -461,16 +526,16 @@ impl DatabaseManager {
             ),
         };
 
-        let sqlite = self.sqlite.lock().await;
-        let project_id = sqlite.insert_code_entry(project_data)?;
+        let project_id = self.sqlite.insert_code_entry(project_data)?;
         info!("Project created: {} (ID: {})", name, project_id);
         Ok(project_id)
     }
 
     /// Get project list
     pub async fn get_projects(&self) -> Result<Vec<ProjectInfo>> {
-        let sqlite = self.sqlite.lock().await;
-        let code_entries = sqlite.search_code_entries(Some("project"), None, None, None)?;
+        let code_entries = self
+            .sqlite
+            .search_code_entries(Some("project"), None, None, None)?;
 
         let mut projects = Vec::new();
         for entry in code_entries {
@@ -501,23 +566,36 @@ impl DatabaseManager {
     }
 
     /// Get configuration
+    ///
+    /// Values are cached after the first lookup, so repeated reads such as the
+    /// similarity threshold in every vector search skip the SQLite query.
     pub async fn get_config(&self, key: &str) -> Option<JsonValue> {
-        let sqlite = self.sqlite.lock().await;
-        let code_entries = sqlite
+        if let Some(value) = self.cached_config(key) {
+            return Some(value);
+        }
+
+        let value = self.load_config(key)?;
+        self.config_cache
+            .lock()
+            .unwrap_or_else(|e| e.into_inner())
+            .insert(key.to_string(), value.clone());
+        Some(value)
+    }
+
+    /// Value cached by an earlier get_config or set_config
+    fn cached_config(&self, key: &str) -> Option<JsonValue> {
+        let cache = self.config_cache.lock().unwrap_or_else(|e| e.into_inner());
+        cache.get(key).cloned()
+    }
+
+    /// Read the newest stored value of a configuration key from SQLite
+    fn load_config(&self, key: &str) -> Option<JsonValue> {
+        let code_entries = self
+            .sqlite
             .search_code_entries(Some("config"), None, Some(key), None)
             .unwrap_or_default();
 
-        for entry in code_entries {
-            if let Some(metadata_str) = &entry.metadata {
-                if let Ok(metadata) = serde_json::from_str::<JsonValue>(metadata_str) {
-                    if let Some(value) = metadata.get("value") {
-                        return Some(value.clone());
-                    }
-                }
-            }
-        }
-
-        None
+        code_entries.iter().find_map(config_value)
     }
 
     /// Get configuration value (with default)
@@ -540,29 +618,14 @@ impl DatabaseManager {
         value: JsonValue,
         description: Option<&str>,
     ) -> Result<()> {
-        let config_data = CodeEntry {
-            id: String::new(),
-            code: format!("Config: {}", key),
-            language: "config".to_string(),
-            function_name: key.to_string(),
-            project: "system".to_string(),
-            file_path: "config".to_string(),
-            created_at: Utc::now(),
-            updated_at: Utc::now(),
-            metadata: Some(
-                json!({
-                    "type": "config",
-                    "key": key,
-                    "value": value,
-                    "description": description
-                })
-                .to_string(),
-            ),
-        };
+        let config_data = config_entry(key, &value, description);
 
-        let sqlite = self.sqlite.lock().await;
-        sqlite.insert_code_entry(config_data)?;
+        self.sqlite.insert_code_entry(config_data)?;
         debug!("Configuration set: {} = {}", key, value);
+        self.config_cache
+            .lock()
+            .unwrap_or_else(|e| e.into_inner())
+            .insert(key.to_string(), value);
         Ok(())
     }
 
@@ -574,25 +637,28 @@ impl DatabaseManager {
 
         // SQLite status
         {
-            let sqlite = self.sqlite.lock().await;
-            let (total_connections, idle_connections) = sqlite.get_pool_status();
+            let (total_connections, idle_connections) = self.sqlite.get_pool_status();
             sqlite_info.insert("status".to_string(), json!("connected"));
             sqlite_info.insert("total_connections".to_string(), json!(total_connections));
             sqlite_info.insert("idle_connections".to_string(), json!(idle_connections));
 
-            if let Ok(stats) = sqlite.get_statistics() {
+            if let Ok(stats) = self.sqlite.get_statistics() {
                 sqlite_info.insert("statistics".to_string(), json!(stats));
             }
         }
 
         // Qdrant status
         {
-            let qdrant = self.qdrant.lock().await;
-            let health = qdrant.health_check().await;
+            let health = self.qdrant.health_check().await;
             qdrant_info.insert(
                 "health".to_string(),
                 json!(if health { "healthy" } else { "unhealthy" }),
             );
+            let (cache_hits, cache_misses) = self.qdrant.search_cache_stats();
+            qdrant_info.insert(
+                "search_cache".to_string(),
+                json!({ "hits": cache_hits, "misses": cache_misses }),
+            );
 
             if !health {
                 overall_status = "unhealthy".to_string();
@@ -609,27 +675,23 @@ impl DatabaseManager {
     /// Batch store interfaces
     pub async fn batch_store_interfaces(
         &self,
-        interfaces_data: Vec<HashMap<String, JsonValue>>,
+        mut interfaces_data: Vec<HashMap<String, JsonValue>>,
     ) -> Result<Vec<(String, String)>> {
-        let mut results = Vec::new();
-        let mut vectors_data = Vec::new();
+        let mut vectors_data = Vec::with_capacity(interfaces_data.len());
 
         // Prepare vector data
-        for data in &interfaces_data {
+        for data in &mut interfaces_data {
+            // The SQLite rows never use the vector, so move it over as is rather
+            // than decoding it to f32 and encoding it back into JSON
+            let vector = data
+                .remove("vector")
+                .filter(JsonValue::is_array)
+                .unwrap_or_else(|| json!([]));
             let code = data.get("code").and_then(|v| v.as_str()).unwrap_or("");
-            let vector: Vec<f32> = data
-                .get("vector")
-                .and_then(|v| v.as_array())
-                .map(|arr| {
-                    arr.iter()
-                        .filter_map(|v| v.as_f64().map(|f| f as f32))
-                        .collect()
-                })
-                .unwrap_or_default();
 
             let mut vector_data = HashMap::new();
             vector_data.insert("code".to_string(), json!(code));
-            vector_data.insert("vector".to_string(), json!(vector));
+            vector_data.insert("vector".to_string(), vector);
             vector_data.insert(
                 "language".to_string(),
                 data.get("language").cloned().unwrap_or(json!("c")),
@@ -657,58 +719,54 @@ impl DatabaseManager {
         }
 
         // Batch insert vectors
-        let qdrant_ids = {
-            let qdrant = self.qdrant.lock().await;
-            qdrant.batch_insert_vectors(vectors_data).await?
-        };
-
-        // Insert SQLite metadata one by one
-        let sqlite = self.sqlite.lock().await;
-        for (i, data) in interfaces_data.iter().enumerate() {
-            if i < qdrant_ids.len() {
-                let code_entry = CodeEntry {
-                    id: String::new(),
-                    code: data
-                        .get("code")
-                        .and_then(|v| v.as_str())
-                        .unwrap_or("")
-                        .to_string(),
-                    language: data
-                        .get("language")
-                        .and_then(|v| v.as_str())
-                        .unwrap_or("c")
-                        .to_string(),
-                    function_name: data
-                        .get("name")
-                        .and_then(|v| v.as_str())
-                        .unwrap_or("")
-                        .to_string(),
-                    project: data
-                        .get("project_name")
-                        .and_then(|v| v.as_str())
-                        .unwrap_or("default")
-                        .to_string(),
-                    file_path: data
-                        .get("file_path")
-                        .and_then(|v| v.as_str())
-                        .unwrap_or("")
-                        .to_string(),
-                    created_at: Utc::now(),
-                    updated_at: Utc::now(),
-                    metadata: Some(
-                        json!({
-                            "qdrant_id": qdrant_ids[i],
-                            "inputs": data.get("inputs").cloned().unwrap_or(json!([])),
-                            "outputs": data.get("outputs").cloned().unwrap_or(json!([])),
-                        })
-                        .to_string(),
-                    ),
-                };
-
-                let interface_id = sqlite.insert_code_entry(code_entry)?;
-                results.push((interface_id, qdrant_ids[i].clone()));
-            }
-        }
+        let qdrant_ids = self.qdrant.batch_insert_vectors(vectors_data).await?;
+
+        // Insert SQLite metadata in one transaction
+        let code_entries: Vec<CodeEntry> = interfaces_data
+            .iter()
+            .zip(&qdrant_ids)
+            .map(|(data, qdrant_id)| CodeEntry {
+                id: String::new(),
+                code: data
+                    .get("code")
+                    .and_then(|v| v.as_str())
+                    .unwrap_or("")
+                    .to_string(),
+                language: data
+                    .get("language")
+                    .and_then(|v| v.as_str())
+                    .unwrap_or("c")
+                    .to_string(),
+                function_name: data
+                    .get("name")
+                    .and_then(|v| v.as_str())
+                    .unwrap_or("")
+                    .to_string(),
+                project: data
+                    .get("project_name")
+                    .and_then(|v| v.as_str())
+                    .unwrap_or("default")
+                    .to_string(),
+                file_path: data
+                    .get("file_path")
+                    .and_then(|v| v.as_str())
+                    .unwrap_or("")
+                    .to_string(),
+                created_at: Utc::now(),
+                updated_at: Utc::now(),
+                metadata: Some(
+                    json!({
+                        "qdrant_id": qdrant_id,
+                        "inputs": data.get("inputs").cloned().unwrap_or(json!([])),
+                        "outputs": data.get("outputs").cloned().unwrap_or(json!([])),
+                    })
+                    .to_string(),
+                ),
+            })
+            .collect();
+
+        let interface_ids = self.sqlite.insert_code_entries(code_entries)?;
+        let results: Vec<(String, String)> = interface_ids.into_iter().zip(qdrant_ids).collect();
 
         info!("Batch storage of {} interfaces completed", results.len());
         Ok(results)
@@ -716,26 +774,12 @@ impl DatabaseManager {
 
     /// Clear project data
     pub async fn clear_project_data(&self, project_name: &str) -> Result<bool> {
-        let sqlite = self.sqlite.lock().await;
-        let code_entries = sqlite.search_code_entries(None, Some(project_name), None, None)?;
-
-        // Delete vectors in Qdrant
-        let _qdrant = self.qdrant.lock().await;
-        for entry in &code_entries {
-            if let Some(metadata_str) = &entry.metadata {
-                if let Ok(metadata) = serde_json::from_str::<JsonValue>(metadata_str) {
-                    if let Some(qdrant_id) = metadata.get("qdrant_id").and_then(|v| v.as_str()) {
-                        // Note: Current Qdrant service doesn't have method to delete single vector, needs implementation
-                        debug!("Need to delete Qdrant vector: {}", qdrant_id);
-                    }
-                }
-            }
-        }
+        // Vectors carry the project in their payload, so Qdrant can select them
+        // itself and the SQLite rows never need to be read
+        self.qdrant.delete_project_vectors(project_name).await?;
 
         // Delete entries in SQLite
-        for entry in code_entries {
-            sqlite.delete_code_entry(&entry.id)?;
-        }
+        self.sqlite.delete_project_entries(project_name)?;
 
         info!("Project data cleared: {}", project_name);
         Ok(true)
@@ -747,38 +791,34 @@ impl DatabaseManager {
         query: &str,
         params: Vec<serde_json::Value>,
     ) -> Result<Vec<HashMap<String, serde_json::Value>>> {
-        let sqlite = self.sqlite.lock().await;
-        sqlite
+        self.sqlite
             .execute_raw_query(query, params)
             .await
             .map_err(|e| anyhow!("Database query failed: {}", e))
     }
 
     /// Get SQLite service reference for advanced operations
-    pub async fn get_sqlite_service(&self) -> tokio::sync::MutexGuard<'_, SqliteService> {
-        self.sqlite.lock().await
+    pub async fn get_sqlite_service(&self) -> &SqliteService {
+        &self.sqlite
     }
 
     /// Get currently used SQLite database file path (for diagnostics)
     pub async fn sqlite_db_path(&self) -> String {
-        let sqlite = self.sqlite.lock().await;
-        sqlite.db_path().to_string()
+        self.sqlite.db_path().to_string()
     }
 
     /// 获取SQLite统计信息（表内行数）
     pub async fn sqlite_statistics(
         &self,
     ) -> std::result::Result<std::collections::HashMap<String, i64>, String> {
-        let sqlite = self.sqlite.lock().await;
-        sqlite
+        self.sqlite
             .get_statistics()
             .map_err(|e| format!("Failed to get SQLite statistics: {}", e))
     }
 
     /// 保存代码条目
     pub async fn save_code_entry(&self, entry: sqlite_services::CodeEntry) -> Result<String> {
-        let sqlite = self.sqlite.lock().await;
-        sqlite
+        self.sqlite
             .insert_code_entry(entry)
             .map_err(|e| anyhow!("Failed to save code entry: {}", e))
     }
@@ -788,14 +828,30 @@ impl DatabaseManager {
         &self,
         result: sqlite_services::AnalysisResult,
     ) -> Result<String> {
-        let sqlite = self.sqlite.lock().await;
-        sqlite
+        self.sqlite
             .insert_analysis_result(result)
             .map_err(|e| anyhow!("Failed to save analysis result: {}", e))
     }
 
+    /// 批量保存代码条目及其分析结果（单个事务）
+    pub async fn save_code_entries_with_analysis(
+        &self,
+        records: Vec<(sqlite_services::CodeEntry, sqlite_services::AnalysisResult)>,
+    ) -> Result<Vec<String>> {
+        self.sqlite
+            .insert_code_entries_with_analysis(records)
+            .map_err(|e| anyhow!("Failed to save code entries with analysis: {}", e))
+    }
+
     /// Close database connections
+    ///
+    /// Connections are released when the last clone is dropped, so this only
+    /// marks the shared manager closed. Later calls, from this or any other
+    /// clone, return immediately.
     pub async fn close(&self) {
+        if self.closed.swap(true, Ordering::AcqRel) {
+            return;
+        }
         info!("Database manager is closing");
         // SQLite connection pool will automatically manage connection closing
         // Qdrant client will also automatically handle connection cleanup
@@ -803,6 +859,36 @@ impl DatabaseManager {
     }
 }
 
+/// Build the code entry that stores a configuration value
+fn config_entry(key: &str, value: &JsonValue, description: Option<&str>) -> CodeEntry {
+    CodeEntry {
+        id: String::new(),
+        code: format!("Config: {}", key),
+        language: "config".to_string(),
+        function_name: key.to_string(),
+        project: "system".to_string(),
+        file_path: "config".to_string(),
+        created_at: Utc::now(),
+        updated_at: Utc::now(),
+        metadata: Some(
+            json!({
+                "type": "config",
+                "key": key,
+                "value": value,
+                "description": description
+            })
+            .to_string(),
+        ),
+    }
+}
+
+/// Configuration value stored in a config entry's metadata
+fn config_value(entry: &CodeEntry) -> Option<JsonValue> {
+    let metadata_str = entry.metadata.as_ref()?;
+    let metadata = serde_json::from_str::<JsonValue>(metadata_str).ok()?;
+    metadata.get("value").cloned()
+}
+
 /// Convenience function to create database manager
 pub async fn create_database_manager(
     sqlite_path: Option<&str>,
@@ -8,11 +8,23 @@ pub struct QdrantConfig {
     pub port: Option<u16>,
     pub collection_name: String,
     pub vector_size: usize,
+    /// Store vectors of new collections with int8 scalar quantization (default true)
+    pub quantization: Option<bool>,
+    /// Keep the original float vectors of new collections on disk (default false)
+    pub on_disk: Option<bool>,
+    /// Batch upserts in flight at once during bulk inserts (default 4)
+    pub upload_concurrency: Option<usize>,
 }
 
 #[derive(Debug, Clone, Deserialize)]
 pub struct SqliteConfig {
     pub path: String,
+    /// Page cache per connection in KiB (default 64000)
+    pub cache_size_kib: Option<u64>,
+    /// Memory-mapped I/O size in bytes, 0 disables it (default 256 MiB)
+    pub mmap_size: Option<u64>,
+    /// Maximum pooled connections (default 15)
+    pub pool_size: Option<u32>,
 }
 
 #[derive(Debug, Clone, Deserialize)]
@@ -1,21 +1,114 @@
 use anyhow::{Context, Result};
+use futures::stream::{self, StreamExt, TryStreamExt};
 use log::{debug, error, info, warn};
+use qdrant_client::qdrant::point_id::PointIdOptions;
 use qdrant_client::qdrant::{
-    Condition, CreateCollectionBuilder, Distance, Filter, PointStruct, SearchPointsBuilder,
+    Condition, CreateCollectionBuilder, DeletePointsBuilder, Distance, Filter,
+    OptimizersConfigDiffBuilder, PointId, PointStruct, PointsIdsList, QuantizationType,
+    ScalarQuantizationBuilder, SearchPointsBuilder, UpdateCollectionBuilder, UpsertPoints,
     UpsertPointsBuilder, VectorParamsBuilder,
 };
 use qdrant_client::{Payload, Qdrant};
 use serde_json::Value as JsonValue;
-use std::collections::HashMap;
-use std::time::Duration;
+use std::collections::{HashMap, VecDeque};
+use std::sync::{Mutex, MutexGuard};
+use std::time::{Duration, Instant};
 use tokio::time::sleep;
 use uuid::Uuid;
 
 use crate::pkg_config::QdrantConfig;
 
-const DEFAULT_BATCH_SIZE: usize = 100;
+const DEFAULT_BATCH_SIZE: usize = 1024;
 const DEFAULT_TIMEOUT_SECS: u64 = 60;
 const DEFAULT_PORT: u16 = 6334; // Default use port 6334
+/// Upsert requests kept in flight at once when `qdrant.upload_concurrency` is
+/// unset, so network round trips and server-side indexing of consecutive
+/// batches overlap
+const DEFAULT_UPLOAD_CONCURRENCY: usize = 4;
+/// Batch inserts of at least this many vectors pause HNSW indexing until every
+/// batch is in, so the graph is built once rather than updated per batch
+const BULK_LOAD_MIN_VECTORS: usize = 10_000;
+/// Indexing threshold restored after a bulk load when the collection config
+/// does not report one
+const DEFAULT_INDEXING_THRESHOLD: u64 = 20_000;
+/// Similarity searches whose results are kept for repeated identical queries
+const SEARCH_CACHE_SIZE: usize = 256;
+/// How long a cached search result may be served
+const SEARCH_CACHE_TTL: Duration = Duration::from_secs(300);
+
+/// Plain string form of a point id, as accepted back by `delete_code_vectors`
+fn point_id_string(id: &PointId) -> Option<String> {
+    match id.point_id_options.as_ref()? {
+        PointIdOptions::Uuid(uuid) => Some(uuid.clone()),
+        PointIdOptions::Num(num) => Some(num.to_string()),
+    }
+}
+
+/// Exact parameters of a similarity search; floats are compared bit for bit
+#[derive(Clone, PartialEq, Eq, Hash)]
+struct SearchKey {
+    vector: Vec<u32>,
+    limit: usize,
+    language: Option<String>,
+    project: Option<String>,
+    score_threshold: u32,
+}
+
+/// Recent search results, evicted oldest first and dropped on every write
+#[derive(Default)]
+struct SearchCache {
+    entries: HashMap<SearchKey, (Instant, Vec<HashMap<String, JsonValue>>)>,
+    order: VecDeque<SearchKey>,
+    /// Bumped on every write, so a search that overlapped one is not cached
+    generation: u64,
+    hits: u64,
+    misses: u64,
+}
+
+impl SearchCache {
+    fn get(&mut self, key: &SearchKey) -> Option<Vec<HashMap<String, JsonValue>>> {
+        match self.entries.get(key) {
+            Some((stored_at, results)) if stored_at.elapsed() < SEARCH_CACHE_TTL => {
+                self.hits += 1;
+                Some(results.clone())
+            }
+            _ => {
+                self.misses += 1;
+                None
+            }
+        }
+    }
+
+    fn insert(
+        &mut self,
+        key: SearchKey,
+        results: Vec<HashMap<String, JsonValue>>,
+        generation: u64,
+    ) {
+        if generation != self.generation {
+            return;
+        }
+        // An expired entry is overwritten in place and keeps its eviction slot
+        if self
+            .entries
+            .insert(key.clone(), (Instant::now(), results))
+            .is_none()
+        {
+            self.order.push_back(key);
+            if self.order.len() > SEARCH_CACHE_SIZE {
+                if let Some(oldest) = self.order.pop_front() {
+                    self.entries.remove(&oldest);
+                }
+            }
+        }
+    }
+
+    fn invalidate(&mut self) {
+        self.entries.clear();
+        self.order.clear();
+        self.generation += 1;
+    }
+}
 
 /// Qdrant vector database server
 pub struct QdrantServer {
@@ -24,6 +117,13 @@ pub struct QdrantServer {
     vector_size: u64,
     _timeout: Duration,
     batch_size: usize,
+    quantization: bool,
+    on_disk: bool,
+    upload_concurrency: usize,
+    search_cache: Mutex<SearchCache>,
+    /// Held for the whole of a bulk load, so one load cannot re-enable
+    /// indexing while another is still writing
+    bulk_load_lock: tokio::sync::Mutex<()>,
 }
 
 #[allow(dead_code)]
@@ -49,6 +149,14 @@ impl QdrantServer {
             vector_size: qdrant_config.vector_size as u64,
             _timeout: timeout,
             batch_size: DEFAULT_BATCH_SIZE,
+            quantization: qdrant_config.quantization.unwrap_or(true),
+            on_disk: qdrant_config.on_disk.unwrap_or(false),
+            upload_concurrency: qdrant_config
+                .upload_concurrency
+                .unwrap_or(DEFAULT_UPLOAD_CONCURRENCY)
+                .max(1),
+            search_cache: Mutex::default(),
+            bulk_load_lock: tokio::sync::Mutex::new(()),
         };
 
         let vector_size = instance.vector_size;
@@ -81,19 +189,32 @@ impl QdrantServer {
     }
 
     /// Create new collection
+    ///
+    /// Unless disabled in the config, vectors are scalar-quantized to int8 and
+    /// kept in RAM; searches still rescore against the original float vectors,
+    /// which `on_disk` moves out of RAM.
     async fn create_collection(&self) -> Result<()> {
+        let mut collection = CreateCollectionBuilder::new(&self.collection_name).vectors_config(
+            VectorParamsBuilder::new(self.vector_size, Distance::Cosine).on_disk(self.on_disk),
+        );
+        if self.quantization {
+            collection = collection.quantization_config(
+                ScalarQuantizationBuilder::default()
+                    .r#type(QuantizationType::Int8.into())
+                    .quantile(0.99)
+                    .always_ram(true),
+            );
+        }
+
         let _response = self
             .client
-            .create_collection(
-                CreateCollectionBuilder::new(&self.collection_name)
-                    .vectors_config(VectorParamsBuilder::new(self.vector_size, Distance::Cosine)),
-            )
+            .create_collection(collection)
             .await
             .context("Failed to create collection")?;
 
         info!(
-            "Created Qdrant collection: {} (dimension: {})",
-            self.collection_name, self.vector_size
+            "Created Qdrant collection: {} (dimension: {}, int8 quantization: {}, on disk: {})",
+            self.collection_name, self.vector_size, self.quantization, self.on_disk
         );
         Ok(())
     }
@@ -106,6 +227,7 @@ impl QdrantServer {
             .context("Failed to delete collection")?;
 
         self.create_collection().await?;
+        self.search_cache().invalidate();
         info!("Recreated collection: {}", self.collection_name);
         Ok(())
     }
@@ -155,6 +277,7 @@ impl QdrantServer {
             .upsert_points(UpsertPointsBuilder::new(&self.collection_name, vec![point]))
             .await
             .context("Failed to insert point")?;
+        self.search_cache().invalidate();
 
         debug!("Inserted code vector: {}, ID: {}", function_name, point_id);
         Ok(point_id)
@@ -169,6 +292,22 @@ impl QdrantServer {
         project: Option<&str>,
         score_threshold: f32,
     ) -> Result<Vec<HashMap<String, JsonValue>>> {
+        let key = SearchKey {
+            vector: query_vector.iter().map(|v| v.to_bits()).collect(),
+            limit,
+            language: language.map(str::to_string),
+            project: project.map(str::to_string),
+            score_threshold: score_threshold.to_bits(),
+        };
+        let generation = {
+            let mut cache = self.search_cache();
+            if let Some(results) = cache.get(&key) {
+                debug!("Served {} similar code entries from cache", results.len());
+                return Ok(results);
+            }
+            cache.generation
+        };
+
         let mut filter_conditions = Vec::new();
 
         if let Some(lang) = language {
@@ -199,8 +338,8 @@ impl QdrantServer {
             .into_iter()
             .map(|point| {
                 let mut map = HashMap::new();
-                if let Some(id) = point.id {
-                    map.insert("id".to_string(), JsonValue::String(format!("{:?}", id)));
+                if let Some(id) = point.id.as_ref().and_then(point_id_string) {
+                    map.insert("id".to_string(), JsonValue::String(id));
                 }
                 map.insert(
                     "score".to_string(),
@@ -218,6 +357,7 @@ impl QdrantServer {
             .collect();
 
         debug!("Found {} similar code entries", results.len());
+        self.search_cache().insert(key, results.clone(), generation);
         Ok(results)
     }
 
@@ -236,27 +376,52 @@ impl QdrantServer {
             total_vectors, self.batch_size
         );
 
-        let mut all_point_ids = Vec::new();
-        let mut processed = 0;
         let total_batches = (total_vectors + self.batch_size - 1) / self.batch_size;
 
-        while processed < total_vectors {
-            let batch_end = std::cmp::min(processed + self.batch_size, total_vectors);
-            let batch_data = &vectors_data[processed..batch_end];
-            let batch_num = (processed / self.batch_size) + 1;
+        // Remember the collection's own threshold so the pause can be undone exactly
+        let bulk_load = if total_vectors >= BULK_LOAD_MIN_VECTORS {
+            let guard = self.bulk_load_lock.lock().await;
+            let threshold = self.indexing_threshold().await?;
+            self.set_indexing_threshold(0).await?;
+            Some((guard, threshold))
+        } else {
+            None
+        };
 
-            match self.insert_batch(batch_data.to_vec(), batch_num).await {
-                Ok(ids) => {
-                    all_point_ids.extend(ids);
-                    processed = batch_end;
-                    info!("Batch {}/{} insertion successful", batch_num, total_batches);
-                }
-                Err(e) => {
-                    error!("Batch insertion failed: {}", e);
-                    return Err(e);
+        // `buffered` yields batch results in input order, so ids line up with vectors_data
+        let batch_ids = stream::iter(vectors_data.chunks(self.batch_size))
+            .enumerate()
+            .map(|(batch_idx, batch_data)| async move {
+                let batch_num = batch_idx + 1;
+
+                match self.insert_batch(batch_data, batch_num).await {
+                    Ok(ids) => {
+                        info!("Batch {}/{} insertion successful", batch_num, total_batches);
+                        Ok(ids)
+                    }
+                    Err(e) => {
+                        error!("Batch insertion failed: {}", e);
+                        Err(e)
+                    }
                 }
+            })
+            .buffered(self.upload_concurrency)
+            .try_collect::<Vec<Vec<String>>>()
+            .await;
+        // Even a failed load may have written some batches
+        self.search_cache().invalidate();
+
+        // Re-enable indexing whether or not every batch made it in. Searches still
+        // work without the index, so a failure here is logged, not returned
+        if let Some((_guard, threshold)) = bulk_load {
+            if let Err(e) = self.set_indexing_threshold(threshold).await {
+                error!(
+                    "Failed to re-enable indexing for {}: {}",
+                    self.collection_name, e
+                );
             }
         }
+        let all_point_ids: Vec<String> = batch_ids?.into_iter().flatten().collect();
 
         info!(
             "Batch insertion completed, successfully inserted {}/{} vectors",
@@ -266,76 +431,108 @@ impl QdrantServer {
         Ok(all_point_ids)
     }
 
+    /// Read the collection's current optimizer indexing threshold
+    async fn indexing_threshold(&self) -> Result<u64> {
+        let info = self
+            .client
+            .collection_info(&self.collection_name)
+            .await
+            .context("Failed to get collection info")?;
+        Ok(info
+            .result
+            .and_then(|info| info.config)
+            .and_then(|config| config.optimizer_config)
+            .and_then(|optimizer| optimizer.indexing_threshold)
+            .unwrap_or(DEFAULT_INDEXING_THRESHOLD))
+    }
+
+    /// Set the collection's optimizer indexing threshold; 0 stops HNSW indexing
+    async fn set_indexing_threshold(&self, threshold: u64) -> Result<()> {
+        self.client
+            .update_collection(
+                UpdateCollectionBuilder::new(&self.collection_name).optimizers_config(
+                    OptimizersConfigDiffBuilder::default().indexing_threshold(threshold),
+                ),
+            )
+            .await
+            .context("Failed to update collection optimizer config")?;
+        debug!(
+            "Set indexing threshold of {} to {}",
+            self.collection_name, threshold
+        );
+        Ok(())
+    }
+
     /// Insert single batch (with retry mechanism)
+    ///
+    /// Points are built once, so malformed input fails the batch immediately;
+    /// only the upsert request itself is retried, with exponential backoff.
     async fn insert_batch(
         &self,
-        batch_data: Vec<HashMap<String, JsonValue>>,
+        batch_data: &[HashMap<String, JsonValue>],
         batch_num: usize,
     ) -> Result<Vec<String>> {
         const MAX_RETRIES: usize = 3;
-        let mut retries = 0;
+        let timestamp = chrono::Utc::now().to_rfc3339();
 
-        loop {
-            let points: Result<Vec<PointStruct>> = batch_data
-                .iter()
-                .map(|data| {
-                    let point_id = Uuid::new_v4().to_string();
-                    let vector: Vec<f32> = data
-                        .get("vector")
-                        .and_then(|v| v.as_array())
-                        .context("Missing vector data")?
-                        .iter()
-                        .map(|v| v.as_f64().unwrap_or(0.0) as f32)
-                        .collect();
-
-                    let mut payload = Payload::new();
-                    for (key, value) in data {
-                        if key != "vector" {
-                            match value {
-                                JsonValue::String(s) => payload.insert(key.clone(), s.clone()),
-                                JsonValue::Number(n) => {
-                                    if let Some(i) = n.as_i64() {
-                                        payload.insert(key.clone(), i);
-                                    } else if let Some(f) = n.as_f64() {
-                                        payload.insert(key.clone(), f);
-                                    }
+        let ids: Vec<String> = batch_data
+            .iter()
+            .map(|_| Uuid::new_v4().to_string())
+            .collect();
+        let points: Vec<PointStruct> = batch_data
+            .iter()
+            .zip(&ids)
+            .map(|(data, point_id)| {
+                let vector: Vec<f32> = data
+                    .get("vector")
+                    .and_then(|v| v.as_array())
+                    .context("Missing vector data")?
+                    .iter()
+                    .map(|v| v.as_f64().unwrap_or(0.0) as f32)
+                    .collect();
+
+                let mut payload = Payload::new();
+                for (key, value) in data {
+                    if key != "vector" {
+                        match value {
+                            JsonValue::String(s) => payload.insert(key.clone(), s.clone()),
+                            JsonValue::Number(n) => {
+                                if let Some(i) = n.as_i64() {
+                                    payload.insert(key.clone(), i);
+                                } else if let Some(f) = n.as_f64() {
+                                    payload.insert(key.clone(), f);
                                 }
-                                JsonValue::Bool(b) => payload.insert(key.clone(), *b),
-                                _ => payload.insert(key.clone(), value.to_string()),
-                            };
-                        }
+                            }
+                            JsonValue::Bool(b) => payload.insert(key.clone(), *b),
+                            _ => payload.insert(key.clone(), value.to_string()),
+                        };
                     }
-
-                    payload.insert("timestamp", chrono::Utc::now().to_rfc3339());
-                    payload.insert("batch_num", batch_num as i64);
-
-                    Ok(PointStruct::new(point_id.clone(), vector, payload))
-                })
-                .collect();
-
-            match points {
-                Ok(points) => {
-                    let ids: Vec<String> = points
-                        .iter()
-                        .filter_map(|p| p.id.as_ref().map(|id| format!("{:?}", id)))
-                        .collect();
-
-                    self.client
-                        .upsert_points(UpsertPointsBuilder::new(&self.collection_name, points))
-                        .await
-                        .context("Failed to batch insert points")?;
-                    return Ok(ids);
                 }
+
+                payload.insert("timestamp", timestamp.clone());
+                payload.insert("batch_num", batch_num as i64);
+
+                Ok(PointStruct::new(point_id.clone(), vector, payload))
+            })
+            .collect::<Result<_>>()
+            .with_context(|| format!("Failed to build points for batch {}", batch_num))?;
+
+        let request: UpsertPoints = UpsertPointsBuilder::new(&self.collection_name, points).into();
+
+        let mut retries = 0;
+        loop {
+            match self.client.upsert_points(request.clone()).await {
+                Ok(_) => return Ok(ids),
                 Err(e) if retries < MAX_RETRIES => {
                     retries += 1;
                     let wait_secs = 2u64.pow(retries as u32);
                     warn!(
-                        "Batch {} parsing failed (attempt {}/{}): {}, waiting {} seconds before retry",
+                        "Batch {} upsert failed (attempt {}/{}): {}, waiting {} seconds before retry",
                         batch_num, retries, MAX_RETRIES, e, wait_secs
                     );
                     sleep(Duration::from_secs(wait_secs)).await;
                 }
-                Err(e) => return Err(e),
+                Err(e) => return Err(e).context("Failed to batch insert points"),
             }
         }
     }
@@ -351,6 +548,49 @@ impl QdrantServer {
         Ok(None)
     }
 
+    /// Delete code vectors by ID in a single request
+    pub async fn delete_code_vectors(&self, point_ids: &[String]) -> Result<()> {
+        if point_ids.is_empty() {
+            return Ok(());
+        }
+
+        let ids = PointsIdsList {
+            ids: point_ids.iter().map(|id| id.clone().into()).collect(),
+        };
+        self.client
+            .delete_points(
+                DeletePointsBuilder::new(&self.collection_name)
+                    .points(ids)
+                    .wait(true),
+            )
+            .await
+            .context("Failed to delete points")?;
+        self.search_cache().invalidate();
+
+        debug!("Deleted {} code vectors", point_ids.len());
+        Ok(())
+    }
+
+    /// Delete every code vector whose payload belongs to `project`
+    ///
+    /// The server applies the filter itself, so this is one request however
+    /// many vectors the project has.
+    pub async fn delete_project_vectors(&self, project: &str) -> Result<()> {
+        let filter = Filter::all([Condition::matches("project", project.to_string())]);
+        self.client
+            .delete_points(
+                DeletePointsBuilder::new(&self.collection_name)
+                    .points(filter)
+                    .wait(true),
+            )
+            .await
+            .context("Failed to delete project points")?;
+        self.search_cache().invalidate();
+
+        debug!("Deleted code vectors of project: {}", project);
+        Ok(())
+    }
+
     /// Clear collection
     pub async fn clear_collection(&self) -> Result<()> {
         self.client
@@ -360,6 +600,7 @@ impl QdrantServer {
         self.create_collection()
             .await
             .context("Failed to recreate collection")?;
+        self.search_cache().invalidate();
         info!("Collection cleared and recreated: {}", self.collection_name);
         Ok(())
     }
@@ -373,6 +614,16 @@ impl QdrantServer {
             .unwrap_or(false)
     }
 
+    /// Search cache hit and miss counts since startup
+    pub fn search_cache_stats(&self) -> (u64, u64) {
+        let cache = self.search_cache();
+        (cache.hits, cache.misses)
+    }
+
+    fn search_cache(&self) -> MutexGuard<'_, SearchCache> {
+        self.search_cache.lock().unwrap_or_else(|e| e.into_inner())
+    }
+
     /// Set batch size
     pub fn set_batch_size(&mut self, size: usize) {
         self.batch_size = size;
@@ -394,6 +645,9 @@ mod tests {
             port,
             collection_name: "test_collection".to_string(),
             vector_size: 384,
+            quantization: None,
+            on_disk: None,
+            upload_concurrency: None,
         };
 
         QdrantServer::new(qdrant_config)
@@ -431,6 +685,67 @@ mod tests {
         assert_eq!(search_results.len(), 1);
     }
 
+    #[tokio::test]
+    async fn test_delete_batch_inserted_vectors() {
+        let client = create_test_client().await;
+
+        let vector = vec![0.25; 384];
+        let ids = client
+            .batch_insert_vectors(vec![HashMap::from([
+                ("vector".to_string(), JsonValue::from(vector.clone())),
+                (
+                    "project".to_string(),
+                    JsonValue::from("delete_test_project"),
+                ),
+            ])])
+            .await
+            .expect("Batch insert failed");
+        assert_eq!(ids.len(), 1);
+
+        let found = client
+            .search_similar_code(vector.clone(), 5, None, Some("delete_test_project"), 0.0)
+            .await
+            .expect("Search failed");
+        assert!(found
+            .iter()
+            .any(|r| r.get("id") == Some(&JsonValue::from(ids[0].as_str()))));
+
+        client
+            .delete_code_vectors(&ids)
+            .await
+            .expect("Failed to delete vectors");
+        let remaining = client
+            .search_similar_code(vector, 5, None, Some("delete_test_project"), 0.0)
+            .await
+            .expect("Search failed");
+        assert!(remaining.is_empty());
+    }
+
+    #[test]
+    fn test_search_cache() {
+        let key = SearchKey {
+            vector: vec![0.5f32.to_bits(); 4],
+            limit: 5,
+            language: Some("rust".to_string()),
+            project: None,
+            score_threshold: 0.7f32.to_bits(),
+        };
+        let results = vec![HashMap::from([("score".to_string(), JsonValue::from(0.9))])];
+
+        let mut cache = SearchCache::default();
+        assert!(cache.get(&key).is_none());
+        cache.insert(key.clone(), results.clone(), cache.generation);
+        assert_eq!(cache.get(&key), Some(results.clone()));
+
+        // A search that started before a write is not cached afterwards
+        let generation = cache.generation;
+        cache.invalidate();
+        assert!(cache.get(&key).is_none());
+        cache.insert(key.clone(), results, generation);
+        assert!(cache.get(&key).is_none());
+        assert_eq!((cache.hits, cache.misses), (1, 3));
+    }
+
     #[tokio::test]
     async fn test_port_config() {
         let qdrant_config = QdrantConfig {
@@ -438,6 +753,9 @@ mod tests {
             port: Some(6334),
             collection_name: "test_collection".to_string(),
             vector_size: 384,
+            quantization: None,
+            on_disk: None,
+            upload_concurrency: None,
         };
         // Test explicit port configuration
         let client = QdrantServer::new(qdrant_config)
@@ -9,10 +9,59 @@ use uuid::Uuid;
 
 use crate::pkg_config::SqliteConfig;
 
+/// SQL expression for the last path component of `file_path`.
+///
+/// Strips everything up to the final '/': the inner `rtrim` leaves the directory
+/// prefix, which `replace` then removes. Backs the indexed `file_name` column
+/// so lookups by file name don't need a `LIKE '%name'` table scan.
+const FILE_NAME_EXPR: &str =
+    "replace(file_path, rtrim(file_path, replace(file_path, '/', '')), '')";
+
+/// SQL expression for the `qdrant_id` recorded in an entry's metadata JSON.
+///
+/// Backs the indexed `qdrant_id` column, so similarity hits are joined back to
+/// their entries by key instead of parsing every row's metadata. Rows whose
+/// metadata is missing or not valid JSON get NULL.
+const QDRANT_ID_EXPR: &str =
+    "CASE WHEN json_valid(metadata) THEN json_extract(metadata, '$.qdrant_id') END";
+
+/// Function names bound per `IN (...)` query, kept well under SQLite's
+/// default limit of 999 bound parameters.
+const MAX_NAMES_PER_QUERY: usize = 500;
+
+/// Prepared statements cached per pooled connection. Queries go through
+/// `prepare_cached`, and the default capacity of 16 is smaller than the set of
+/// distinct statements (including each search filter combination) in use.
+const STATEMENT_CACHE_CAPACITY: usize = 64;
+
 /// Type alias for the connection pool
 type SqlitePool = Pool<SqliteConnectionManager>;
 type PooledSqliteConnection = PooledConnection<SqliteConnectionManager>;
 
+/// Per-connection settings applied when the pool opens a file-backed connection.
+///
+/// `busy_timeout` comes first so the `journal_mode` switch waits for, rather
+/// than fails on, other connections opened concurrently by the pool. WAL lets
+/// readers proceed while a writer is active; `synchronous=NORMAL` is durable
+/// under WAL except for the last commits on power loss. WAL mode keeps
+/// `-wal`/`-shm` sidecar files next to the database. The page cache and mmap
+/// sizes follow, taken from `SqliteConfig`.
+const CONNECTION_PRAGMAS: &str = "
+    PRAGMA busy_timeout = 5000;
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+";
+
+/// Page cache per connection in KiB when `sqlite.cache_size_kib` is unset
+const DEFAULT_CACHE_SIZE_KIB: u64 = 64000;
+/// Memory-mapped I/O size in bytes when `sqlite.mmap_size` is unset
+const DEFAULT_MMAP_SIZE: u64 = 256 * 1024 * 1024;
+/// Maximum pooled connections when `sqlite.pool_size` is unset
+const DEFAULT_POOL_SIZE: u32 = 15;
+/// Connections kept open between bursts of queries
+const MIN_IDLE_CONNECTIONS: u32 = 5;
+
 /// Custom error type for database operations
 #[derive(Debug)]
 pub enum DatabaseError {
@@ -104,10 +153,23 @@ impl SqliteService {
     /// Create a new SQLite service instance with connection pooling
     pub fn new(sqlite_config: SqliteConfig) -> Result<Self> {
         let db_path = sqlite_config.path;
-        let manager = SqliteConnectionManager::file(&db_path);
+        let pool_size = sqlite_config.pool_size.unwrap_or(DEFAULT_POOL_SIZE).max(1);
+        // A negative cache_size is a size in KiB rather than a page count
+        let size_pragmas = format!(
+            "PRAGMA cache_size = -{}; PRAGMA mmap_size = {};",
+            sqlite_config
+                .cache_size_kib
+                .unwrap_or(DEFAULT_CACHE_SIZE_KIB),
+            sqlite_config.mmap_size.unwrap_or(DEFAULT_MMAP_SIZE)
+        );
+        let manager = SqliteConnectionManager::file(&db_path).with_init(move |conn| {
+            conn.set_prepared_statement_cache_capacity(STATEMENT_CACHE_CAPACITY);
+            conn.execute_batch(CONNECTION_PRAGMAS)?;
+            conn.execute_batch(&size_pragmas)
+        });
         let pool = Pool::builder()
-            .max_size(15) // Maximum number of connections in the pool
-            .min_idle(Some(5)) // Minimum number of idle connections
+            .max_size(pool_size)
+            .min_idle(Some(MIN_IDLE_CONNECTIONS.min(pool_size)))
             .build(manager)?;
 
         let service = SqliteService {
@@ -152,7 +214,8 @@ impl SqliteService {
 
         // Create code_entries tablße
         conn.execute(
-            "CREATE TABLE IF NOT EXISTS code_entries (
+            &format!(
+                "CREATE TABLE IF NOT EXISTS code_entries (
                 id TEXT PRIMARY KEY,
                 code TEXT NOT NULL,
                 language TEXT NOT NULL,
@@ -161,10 +224,45 @@ impl SqliteService {
                 file_path TEXT,
                 created_at TEXT NOT NULL,
                 updated_at TEXT NOT NULL,
-                metadata TEXT
+                metadata TEXT,
+                file_name TEXT GENERATED ALWAYS AS ({}) VIRTUAL,
+                qdrant_id TEXT GENERATED ALWAYS AS ({}) VIRTUAL
             )",
+                FILE_NAME_EXPR, QDRANT_ID_EXPR
+            ),
+            [],
+        )?;
+
+        // Databases created before file_name existed get it added in place
+        let has_file_name: bool = conn.query_row(
+            "SELECT COUNT(*) > 0 FROM pragma_table_xinfo('code_entries') WHERE name = 'file_name'",
             [],
+            |row| row.get(0),
         )?;
+        if !has_file_name {
+            conn.execute(
+                &format!(
+                    "ALTER TABLE code_entries ADD COLUMN file_name TEXT GENERATED ALWAYS AS ({}) VIRTUAL",
+                    FILE_NAME_EXPR
+                ),
+                [],
+            )?;
+        }
+
+        let has_qdrant_id: bool = conn.query_row(
+            "SELECT COUNT(*) > 0 FROM pragma_table_xinfo('code_entries') WHERE name = 'qdrant_id'",
+            [],
+            |row| row.get(0),
+        )?;
+        if !has_qdrant_id {
+            conn.execute(
+                &format!(
+                    "ALTER TABLE code_entries ADD COLUMN qdrant_id TEXT GENERATED ALWAYS AS ({}) VIRTUAL",
+                    QDRANT_ID_EXPR
+                ),
+                [],
+            )?;
+        }
 
         // Create conversion_results table
         conn.execute(
@@ -208,6 +306,26 @@ impl SqliteService {
             [],
         )?;
 
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_code_entries_file_path ON code_entries(file_path)",
+            [],
+        )?;
+
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_code_entries_file_name ON code_entries(file_name)",
+            [],
+        )?;
+
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_code_entries_function_name ON code_entries(function_name, project)",
+            [],
+        )?;
+
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_code_entries_qdrant_id ON code_entries(qdrant_id)",
+            [],
+        )?;
+
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_conversion_results_source_id ON conversion_results(source_id)",
             [],
@@ -233,30 +351,70 @@ impl SqliteService {
         entry.updated_at = now;
 
         let conn = self.get_connection()?;
-        conn.execute(
+        conn.prepare_cached(
             "INSERT INTO code_entries (id, code, language, function_name, project, file_path, created_at, updated_at, metadata)
              VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9)",
-            params![
-                &entry.id,
-                &entry.code,
-                &entry.language,
-                &entry.function_name,
-                &entry.project,
-                &entry.file_path,
-                entry.created_at.to_rfc3339(),
-                entry.updated_at.to_rfc3339(),
-                &entry.metadata
-            ],
-        )?;
+        )?
+        .execute(params![
+            &entry.id,
+            &entry.code,
+            &entry.language,
+            &entry.function_name,
+            &entry.project,
+            &entry.file_path,
+            entry.created_at.to_rfc3339(),
+            entry.updated_at.to_rfc3339(),
+            &entry.metadata
+        ])?;
 
         debug!("Inserted code entry with ID: {}", entry.id);
         Ok(entry.id)
     }
 
+    /// Insert several code entries in a single transaction
+    ///
+    /// The insert statement is prepared once and reused for every row, and all
+    /// rows are committed together. Returns the ids in input order.
+    pub fn insert_code_entries(&self, entries: Vec<CodeEntry>) -> Result<Vec<String>> {
+        let mut conn = self.get_connection()?;
+        let tx = conn.transaction()?;
+        let now_str = Utc::now().to_rfc3339();
+        let mut ids = Vec::with_capacity(entries.len());
+
+        {
+            let mut stmt = tx.prepare_cached(
+                "INSERT INTO code_entries (id, code, language, function_name, project, file_path, created_at, updated_at, metadata)
+                 VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9)",
+            )?;
+            for mut entry in entries {
+                if entry.id.is_empty() {
+                    entry.id = Uuid::new_v4().to_string();
+                }
+                stmt.execute(params![
+                    &entry.id,
+                    &entry.code,
+                    &entry.language,
+                    &entry.function_name,
+                    &entry.project,
+                    &entry.file_path,
+                    &now_str,
+                    &now_str,
+                    &entry.metadata
+                ])?;
+                ids.push(entry.id);
+            }
+        }
+
+        tx.commit()?;
+
+        debug!("Inserted {} code entries in one transaction", ids.len());
+        Ok(ids)
+    }
+
     /// Get a code entry by ID
     pub fn get_code_entry(&self, id: &str) -> Result<Option<CodeEntry>> {
         let conn = self.get_connection()?;
-        let mut stmt = conn.prepare(
+        let mut stmt = conn.prepare_cached(
             "SELECT id, code, language, function_name, project, file_path, created_at, updated_at, metadata
              FROM code_entries WHERE id = ?1",
         )?;
@@ -301,11 +459,13 @@ impl SqliteService {
 
         query.push_str(" ORDER BY updated_at DESC");
 
+        // Bind the limit too, so each filter combination maps to one cached statement
         if let Some(limit_val) = limit {
-            query.push_str(&format!(" LIMIT {}", limit_val));
+            query.push_str(" LIMIT ?");
+            params.push(limit_val.to_string());
         }
 
-        let mut stmt = conn.prepare(&query)?;
+        let mut stmt = conn.prepare_cached(&query)?;
         let param_refs: Vec<&str> = params.iter().map(AsRef::as_ref).collect();
         let entry_iter = stmt.query_map(rusqlite::params_from_iter(param_refs), |row| {
             self.row_to_code_entry(row)
@@ -320,6 +480,140 @@ impl SqliteService {
         Ok(entries)
     }
 
+    /// Search code entries whose code or function name contains `text`
+    ///
+    /// The substring match (case-sensitive, like `str::contains`) runs inside
+    /// SQLite, so only matching rows are read back.
+    pub fn search_code_entries_by_text(
+        &self,
+        text: &str,
+        language: Option<&str>,
+        project: Option<&str>,
+    ) -> Result<Vec<CodeEntry>> {
+        let conn = self.get_connection()?;
+
+        let mut query = "SELECT id, code, language, function_name, project, file_path, created_at, updated_at, metadata FROM code_entries WHERE (instr(code, ?1) > 0 OR instr(function_name, ?1) > 0)".to_string();
+        let mut params = vec![text];
+
+        if let Some(lang) = language {
+            query.push_str(" AND language = ?");
+            params.push(lang);
+        }
+
+        if let Some(proj) = project {
+            query.push_str(" AND project = ?");
+            params.push(proj);
+        }
+
+        query.push_str(" ORDER BY updated_at DESC");
+
+        let mut stmt = conn.prepare_cached(&query)?;
+        let entry_iter = stmt.query_map(rusqlite::params_from_iter(params), |row| {
+            self.row_to_code_entry(row)
+        })?;
+
+        let mut entries = Vec::new();
+        for entry in entry_iter {
+            entries.push(entry?);
+        }
+
+        debug!(
+            "Found {} code entries containing the query text",
+            entries.len()
+        );
+        Ok(entries)
+    }
+
+    /// Search code entries whose function name is any of `function_names`
+    ///
+    /// Looks names up with `function_name IN (...)` in batches of
+    /// `MAX_NAMES_PER_QUERY`, rather than one query per name.
+    pub fn search_code_entries_by_names(
+        &self,
+        function_names: &[&str],
+        project: Option<&str>,
+    ) -> Result<Vec<CodeEntry>> {
+        let conn = self.get_connection()?;
+        let mut entries = Vec::new();
+
+        for names in function_names.chunks(MAX_NAMES_PER_QUERY) {
+            let placeholders = vec!["?"; names.len()].join(", ");
+            let mut query = format!(
+                "SELECT id, code, language, function_name, project, file_path, created_at, updated_at, metadata FROM code_entries WHERE function_name IN ({})",
+                placeholders
+            );
+            let mut params: Vec<&str> = names.to_vec();
+            if let Some(proj) = project {
+                query.push_str(" AND project = ?");
+                params.push(proj);
+            }
+            query.push_str(" ORDER BY updated_at DESC");
+
+            let mut stmt = conn.prepare_cached(&query)?;
+            let entry_iter = stmt.query_map(rusqlite::params_from_iter(params), |row| {
+                self.row_to_code_entry(row)
+            })?;
+            for entry in entry_iter {
+                entries.push(entry?);
+            }
+        }
+
+        debug!(
+            "Found {} code entries for {} function names",
+            entries.len(),
+            function_names.len()
+        );
+        Ok(entries)
+    }
+
+    /// Search code entries whose metadata records any of `qdrant_ids`
+    ///
+    /// Uses the indexed `qdrant_id` column with `IN (...)` in batches of
+    /// `MAX_NAMES_PER_QUERY`, so the cost follows the number of ids rather
+    /// than the size of the table.
+    pub fn search_code_entries_by_qdrant_ids(
+        &self,
+        qdrant_ids: &[&str],
+        language: Option<&str>,
+        project: Option<&str>,
+    ) -> Result<Vec<CodeEntry>> {
+        let conn = self.get_connection()?;
+        let mut entries = Vec::new();
+
+        for ids in qdrant_ids.chunks(MAX_NAMES_PER_QUERY) {
+            let placeholders = vec!["?"; ids.len()].join(", ");
+            let mut query = format!(
+                "SELECT id, code, language, function_name, project, file_path, created_at, updated_at, metadata FROM code_entries WHERE qdrant_id IN ({})",
+                placeholders
+            );
+            let mut params: Vec<&str> = ids.to_vec();
+            if let Some(lang) = language {
+                query.push_str(" AND language = ?");
+                params.push(lang);
+            }
+            if let Some(proj) = project {
+                query.push_str(" AND project = ?");
+                params.push(proj);
+            }
+            query.push_str(" ORDER BY updated_at DESC");
+
+            let mut stmt = conn.prepare_cached(&query)?;
+            let entry_iter = stmt.query_map(rusqlite::params_from_iter(params), |row| {
+                self.row_to_code_entry(row)
+            })?;
+            for entry in entry_iter {
+                entries.push(entry?);
+            }
+        }
+
+        debug!(
+            "Found {} code entries for {} qdrant ids",
+            entries.len(),
+            qdrant_ids.len()
+        );
+        Ok(entries)
+    }
+
     /// Insert a conversion result
     pub fn insert_conversion_result(&self, mut result: ConversionResult) -> Result<String> {
         if result.id.is_empty() {
@@ -329,30 +623,73 @@ impl SqliteService {
         result.created_at = Utc::now();
 
         let conn = self.get_connection()?;
-        conn.execute(
+        conn.prepare_cached(
             "INSERT INTO conversion_results (id, source_id, original_code, converted_code, conversion_type, status, error_message, created_at, metadata)
              VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9)",
-            params![
-                &result.id,
-                &result.source_id,
-                &result.original_code,
-                &result.converted_code,
-                &result.conversion_type,
-                &result.status,
-                &result.error_message,
-                result.created_at.to_rfc3339(),
-                &result.metadata
-            ],
-        )?;
+        )?
+        .execute(params![
+            &result.id,
+            &result.source_id,
+            &result.original_code,
+            &result.converted_code,
+            &result.conversion_type,
+            &result.status,
+            &result.error_message,
+            result.created_at.to_rfc3339(),
+            &result.metadata
+        ])?;
 
         debug!("Inserted conversion result with ID: {}", result.id);
         Ok(result.id)
     }
 
+    /// Insert several conversion results in a single transaction
+    ///
+    /// Mirrors `insert_code_entries`: one prepared statement, one commit.
+    /// Returns the ids in input order.
+    pub fn insert_conversion_results(&self, results: Vec<ConversionResult>) -> Result<Vec<String>> {
+        let mut conn = self.get_connection()?;
+        let tx = conn.transaction()?;
+        let now_str = Utc::now().to_rfc3339();
+        let mut ids = Vec::with_capacity(results.len());
+
+        {
+            let mut stmt = tx.prepare_cached(
+                "INSERT INTO conversion_results (id, source_id, original_code, converted_code, conversion_type, status, error_message, created_at, metadata)
+                 VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9)",
+            )?;
+            for mut result in results {
+                if result.id.is_empty() {
+                    result.id = Uuid::new_v4().to_string();
+                }
+                stmt.execute(params![
+                    &result.id,
+                    &result.source_id,
+                    &result.original_code,
+                    &result.converted_code,
+                    &result.conversion_type,
+                    &result.status,
+                    &result.error_message,
+                    &now_str,
+                    &result.metadata
+                ])?;
+                ids.push(result.id);
+            }
+        }
+
+        tx.commit()?;
+
+        debug!(
+            "Inserted {} conversion results in one transaction",
+            ids.len()
+        );
+        Ok(ids)
+    }
+
     /// Get conversion results for a source code entry
     pub fn get_conversion_results(&self, source_id: &str) -> Result<Vec<ConversionResult>> {
         let conn = self.get_connection()?;
-        let mut stmt = conn.prepare(
+        let mut stmt = conn.prepare_cached(
             "SELECT id, source_id, original_code, converted_code, conversion_type, status, error_message, created_at, metadata
              FROM conversion_results WHERE source_id = ?1 ORDER BY created_at DESC",
         )?;
@@ -381,27 +718,95 @@ impl SqliteService {
         result.created_at = Utc::now();
 
         let conn = self.get_connection()?;
-        conn.execute(
+        conn.prepare_cached(
             "INSERT INTO analysis_results (id, code_id, analysis_type, result, score, created_at)
              VALUES (?1, ?2, ?3, ?4, ?5, ?6)",
-            params![
-                &result.id,
-                &result.code_id,
-                &result.analysis_type,
-                &result.result,
-                result.score,
-                result.created_at.to_rfc3339()
-            ],
-        )?;
+        )?
+        .execute(params![
+            &result.id,
+            &result.code_id,
+            &result.analysis_type,
+            &result.result,
+            result.score,
+            result.created_at.to_rfc3339()
+        ])?;
 
         debug!("Inserted analysis result with ID: {}", result.id);
         Ok(result.id)
     }
 
+    /// Insert code entries together with their analysis results in a single transaction
+    ///
+    /// Each analysis result is linked to the code entry it is paired with, so callers
+    /// can leave `code_id` empty. Either every row is written or none is.
+    pub fn insert_code_entries_with_analysis(
+        &self,
+        records: Vec<(CodeEntry, AnalysisResult)>,
+    ) -> Result<Vec<String>> {
+        let mut conn = self.get_connection()?;
+        let tx = conn.transaction()?;
+        let now = Utc::now();
+        let now_str = now.to_rfc3339();
+        let mut ids = Vec::with_capacity(records.len());
+
+        {
+            // Prepare both inserts once for the whole batch instead of once per row
+            let mut entry_stmt = tx.prepare_cached(
+                "INSERT INTO code_entries (id, code, language, function_name, project, file_path, created_at, updated_at, metadata)
+                 VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9)",
+            )?;
+            let mut result_stmt = tx.prepare_cached(
+                "INSERT INTO analysis_results (id, code_id, analysis_type, result, score, created_at)
+                 VALUES (?1, ?2, ?3, ?4, ?5, ?6)",
+            )?;
+
+            for (mut entry, mut result) in records {
+                if entry.id.is_empty() {
+                    entry.id = Uuid::new_v4().to_string();
+                }
+                if result.id.is_empty() {
+                    result.id = Uuid::new_v4().to_string();
+                }
+                result.code_id = entry.id.clone();
+
+                entry_stmt.execute(params![
+                    &entry.id,
+                    &entry.code,
+                    &entry.language,
+                    &entry.function_name,
+                    &entry.project,
+                    &entry.file_path,
+                    &now_str,
+                    &now_str,
+                    &entry.metadata
+                ])?;
+
+                result_stmt.execute(params![
+                    &result.id,
+                    &result.code_id,
+                    &result.analysis_type,
+                    &result.result,
+                    result.score,
+                    &now_str
+                ])?;
+
+                ids.push(entry.id);
+            }
+        }
+
+        tx.commit()?;
+
+        debug!(
+            "Inserted {} code entries with analysis results in one transaction",
+            ids.len()
+        );
+        Ok(ids)
+    }
+
     /// Get analysis results for a code entry
     pub fn get_analysis_results(&self, code_id: &str) -> Result<Vec<AnalysisResult>> {
         let conn = self.get_connection()?;
-        let mut stmt = conn.prepare(
+        let mut stmt = conn.prepare_cached(
             "SELECT id, code_id, analysis_type, result, score, created_at
              FROM analysis_results WHERE code_id = ?1 ORDER BY created_at DESC",
         )?;
@@ -426,20 +831,20 @@ impl SqliteService {
         let updated_at = Utc::now();
 
         let conn = self.get_connection()?;
-        let rows_affected = conn.execute(
+        let rows_affected = conn.prepare_cached(
             "UPDATE code_entries SET code = ?1, language = ?2, function_name = ?3, project = ?4, file_path = ?5, updated_at = ?6, metadata = ?7
              WHERE id = ?8",
-            params![
-                &entry.code,
-                &entry.language,
-                &entry.function_name,
-                &entry.project,
-                &entry.file_path,
-                updated_at.to_rfc3339(),
-                &entry.metadata,
-                &entry.id
-            ],
-        )?;
+        )?
+        .execute(params![
+            &entry.code,
+            &entry.language,
+            &entry.function_name,
+            &entry.project,
+            &entry.file_path,
+            updated_at.to_rfc3339(),
+            &entry.metadata,
+            &entry.id
+        ])?;
 
         if rows_affected == 0 {
             warn!("No code entry found with ID: {}", entry.id);
@@ -477,6 +882,32 @@ impl SqliteService {
         Ok(())
     }
 
+    /// Delete all code entries of a project and their related records
+    ///
+    /// Returns the number of code entries removed.
+    pub fn delete_project_entries(&self, project: &str) -> Result<usize> {
+        let conn = self.get_connection()?;
+        let tx = conn.unchecked_transaction()?;
+
+        tx.execute(
+            "DELETE FROM analysis_results WHERE code_id IN (SELECT id FROM code_entries WHERE project = ?1)",
+            [project],
+        )?;
+        tx.execute(
+            "DELETE FROM conversion_results WHERE source_id IN (SELECT id FROM code_entries WHERE project = ?1)",
+            [project],
+        )?;
+        let rows_affected = tx.execute("DELETE FROM code_entries WHERE project = ?1", [project])?;
+
+        tx.commit()?;
+
+        debug!(
+            "Deleted {} code entries and related records for project: {}",
+            rows_affected, project
+        );
+        Ok(rows_affected)
+    }
+
     /// Get database statistics
     pub fn get_statistics(&self) -> Result<HashMap<String, i64>> {
         let conn = self.get_connection()?;
@@ -609,7 +1040,9 @@ impl SqliteService {
         params: Vec<serde_json::Value>,
     ) -> Result<Vec<HashMap<String, serde_json::Value>>> {
         let conn = self.get_connection()?;
-        let mut stmt = conn.prepare(query)?;
+        // Callers pass fixed query strings, so reuse the connection's compiled statement
+        let mut stmt = conn.prepare_cached(query)?;
+        let column_names: Vec<String> = stmt.column_names().into_iter().map(String::from).collect();
 
         // Convert JSON values to owned rusqlite parameters
         let rusqlite_params: Vec<Box<dyn rusqlite::ToSql + Send + Sync>> = params
@@ -638,11 +1071,9 @@ impl SqliteService {
             .collect();
 
         let rows = stmt.query_map(param_refs.as_slice(), |row| {
-            let column_count = row.as_ref().column_count();
-            let mut result = HashMap::new();
+            let mut result = HashMap::with_capacity(column_names.len());
 
-            for i in 0..column_count {
-                let column_name = row.as_ref().column_name(i).unwrap_or("unknown").to_string();
+            for (i, column_name) in column_names.iter().enumerate() {
                 let value: serde_json::Value = match row.get_ref(i)? {
                     rusqlite::types::ValueRef::Null => serde_json::Value::Null,
                     rusqlite::types::ValueRef::Integer(i) => {
@@ -660,7 +1091,7 @@ impl SqliteService {
                         serde_json::Value::String(BASE64_STANDARD.encode(b))
                     }
                 };
-                result.insert(column_name, value);
+                result.insert(column_name.clone(), value);
             }
             Ok(result)
         })?;
@@ -682,6 +1113,33 @@ unsafe impl Sync for SqliteService {}
 mod tests {
     use super::*;
 
+    /// A C declaration entry for `name` in `project`, with no id or metadata
+    fn entry(project: &str, name: &str) -> CodeEntry {
+        CodeEntry {
+            id: "".to_string(),
+            code: format!("int {}(void);", name),
+            language: "c".to_string(),
+            function_name: name.to_string(),
+            project: project.to_string(),
+            file_path: "src/test.c".to_string(),
+            created_at: Utc::now(),
+            updated_at: Utc::now(),
+            metadata: None,
+        }
+    }
+
+    /// An empty function_definition analysis, linked to its entry on insert
+    fn analysis() -> AnalysisResult {
+        AnalysisResult {
+            id: "".to_string(),
+            code_id: "".to_string(),
+            analysis_type: "function_definition".to_string(),
+            result: "{}".to_string(),
+            score: None,
+            created_at: Utc::now(),
+        }
+    }
+
     #[tokio::test]
     async fn test_sqlite_service_creation() {
         let service = SqliteService::new_in_memory().unwrap();
@@ -768,6 +1226,139 @@ mod tests {
             .search_code_entries(None, Some("project1"), None, Some(1))
             .unwrap();
         assert_eq!(limited_entries.len(), 1);
+
+        // Search by several names at once
+        let named_entries = service
+            .search_code_entries_by_names(&["test1", "test2", "missing"], Some("project1"))
+            .unwrap();
+        assert_eq!(named_entries.len(), 2);
+        let other_project = service
+            .search_code_entries_by_names(&["test1"], Some("project2"))
+            .unwrap();
+        assert!(other_project.is_empty());
+
+        // Substring search over code and function names
+        let int_entries = service
+            .search_code_entries_by_text("int ", None, Some("project1"))
+            .unwrap();
+        assert_eq!(int_entries.len(), 1);
+        assert_eq!(int_entries[0].function_name, "test2");
+        let named = service
+            .search_code_entries_by_text("test", Some("rust"), None)
+            .unwrap();
+        assert_eq!(named.len(), 1);
+    }
+
+    #[tokio::test]
+    async fn test_insert_code_entries_with_analysis() {
+        let service = SqliteService::new_in_memory().unwrap();
+
+        let records: Vec<(CodeEntry, AnalysisResult)> = (0..3)
+            .map(|i| (entry("bulk_project", &format!("f{}", i)), analysis()))
+            .collect();
+
+        let ids = service.insert_code_entries_with_analysis(records).unwrap();
+        assert_eq!(ids.len(), 3);
+
+        let entries = service
+            .search_code_entries(None, Some("bulk_project"), None, None)
+            .unwrap();
+        assert_eq!(entries.len(), 3);
+
+        let analysis = service.get_analysis_results(&ids[0]).unwrap();
+        assert_eq!(analysis.len(), 1);
+        assert_eq!(analysis[0].analysis_type, "function_definition");
+    }
+
+    #[tokio::test]
+    async fn test_insert_code_entries() {
+        let service = SqliteService::new_in_memory().unwrap();
+
+        let entries: Vec<CodeEntry> = (0..3)
+            .map(|i| {
+                let mut code_entry = entry("batch_project", &format!("g{}", i));
+                if i == 0 {
+                    code_entry.id = "fixed-id".to_string();
+                }
+                code_entry
+            })
+            .collect();
+
+        let ids = service.insert_code_entries(entries).unwrap();
+        assert_eq!(ids.len(), 3);
+        assert_eq!(ids[0], "fixed-id");
+
+        let stored = service.get_code_entry(&ids[2]).unwrap().unwrap();
+        assert_eq!(stored.function_name, "g2");
+    }
+
+    #[tokio::test]
+    async fn test_search_code_entries_by_qdrant_ids() {
+        let service = SqliteService::new_in_memory().unwrap();
+
+        let metadata = [
+            Some(r#"{"qdrant_id": "q1"}"#),
+            Some(r#"{"qdrant_id": "q2"}"#),
+            Some("not json"),
+            None,
+        ];
+        let entries: Vec<CodeEntry> = metadata
+            .iter()
+            .enumerate()
+            .map(|(i, metadata)| CodeEntry {
+                metadata: metadata.map(str::to_string),
+                ..entry("qdrant_project", &format!("q{}", i))
+            })
+            .collect();
+        service.insert_code_entries(entries).unwrap();
+
+        let found = service
+            .search_code_entries_by_qdrant_ids(&["q2", "missing"], Some("c"), None)
+            .unwrap();
+        assert_eq!(found.len(), 1);
+        assert_eq!(found[0].function_name, "q1");
+    }
+
+    #[tokio::test]
+    async fn test_insert_conversion_results() {
+        let service = SqliteService::new_in_memory().unwrap();
+
+        let results: Vec<ConversionResult> = (0..3)
+            .map(|i| ConversionResult {
+                id: "".to_string(),
+                source_id: "batch-source".to_string(),
+                original_code: format!("int g{}(void);", i),
+                converted_code: format!("fn g{}() -> i32 {{ 0 }}", i),
+                conversion_type: "c_to_rust".to_string(),
+                status: "success".to_string(),
+                error_message: None,
+                created_at: Utc::now(),
+                metadata: None,
+            })
+            .collect();
+
+        let ids = service.insert_conversion_results(results).unwrap();
+        assert_eq!(ids.len(), 3);
+
+        let stored = service.get_conversion_results("batch-source").unwrap();
+        assert_eq!(stored.len(), 3);
+    }
+
+    #[tokio::test]
+    async fn test_delete_project_entries() {
+        let service = SqliteService::new_in_memory().unwrap();
+
+        let records: Vec<(CodeEntry, AnalysisResult)> = ["doomed", "doomed", "kept"]
+            .iter()
+            .enumerate()
+            .map(|(i, project)| (entry(project, &format!("h{}", i)), analysis()))
+            .collect();
+        let ids = service.insert_code_entries_with_analysis(records).unwrap();
+
+        assert_eq!(service.delete_project_entries("doomed").unwrap(), 2);
+        assert!(service.get_code_entry(&ids[0]).unwrap().is_none());
+        assert!(service.get_analysis_results(&ids[0]).unwrap().is_empty());
+        assert_eq!(service.get_analysis_results(&ids[2]).unwrap().len(), 1);
     }
 
     #[tokio::test]
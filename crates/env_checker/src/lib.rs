@@ -64,6 +64,13 @@ impl EnvironmentCheckSummary {
 }
 
 pub async fn check_all() -> EnvironmentCheckSummary {
+    check_environment(true).await
+}
+
+/// Run the environment checks, probing the AI provider only when `check_ai` is set
+///
+/// Commands that never call the LLM can skip the provider round trip.
+pub async fn check_environment(check_ai: bool) -> EnvironmentCheckSummary {
     let config = match check_default_config() {
         Ok(report) => ConfigCheckResult {
             report: Some(report),
@@ -97,15 +104,22 @@ pub async fn check_all() -> EnvironmentCheckSummary {
         },
     };
 
-    let ai = match ai_service_init().await {
-        Ok(status) => ServiceCheckResult {
-            status: Some(status),
-            error: None,
-        },
-        Err(err) => ServiceCheckResult {
+    let ai = if !check_ai {
+        ServiceCheckResult {
             status: None,
-            error: Some(err.to_string()),
-        },
+            error: None,
+        }
+    } else {
+        match ai_service_init().await {
+            Ok(status) => ServiceCheckResult {
+                status: Some(status),
+                error: None,
+            },
+            Err(err) => ServiceCheckResult {
+                status: None,
+                error: Some(err.to_string()),
+            },
+        }
     };
 
     EnvironmentCheckSummary {
@@ -3,13 +3,14 @@ use anyhow::Result;
 pub mod deepseek_provider;
 pub mod ollama_provider;
 pub mod openai_provider;
+mod provider_cache;
 pub mod utils;
 pub mod xai_provider;
 
 pub mod pkg_config;
 
 pub async fn llm_request(messages: Vec<String>) -> Result<String> {
-    let config = pkg_config::get_config()?;
+    let config = pkg_config::shared_config()?;
     match config.provider.as_str() {
         "deepseek" => deepseek_provider::DeepSeekProvider::get_llm_request(messages).await,
         "ollama" => ollama_provider::OllamaProvider::get_llm_request(messages).await,
@@ -35,7 +36,7 @@ pub async fn llm_request_with_prompt(messages: Vec<String>, prompt: String) -> R
     }
 
     // Original single request approach
-    let config = pkg_config::get_config()?;
+    let config = pkg_config::shared_config()?;
     match config.provider.as_str() {
         "deepseek" => {
             deepseek_provider::DeepSeekProvider::chat_with_prompt_static(messages, prompt).await
@@ -53,8 +54,8 @@ pub async fn llm_request_with_prompt(messages: Vec<String>, prompt: String) -> R
 
 /// Get chunking configuration with fallback defaults
 fn get_chunking_config() -> (bool, usize) {
-    if let Ok(config) = pkg_config::get_config() {
-        let chunking_config = config.chunking.unwrap_or_default();
+    if let Ok(config) = pkg_config::shared_config() {
+        let chunking_config = config.chunking.clone().unwrap_or_default();
         (
             chunking_config.enabled.unwrap_or(true),
             chunking_config.max_tokens.unwrap_or(120000),
@@ -116,7 +117,7 @@ pub async fn llm_request_with_prompt_chunked(
 
 /// Direct LLM request without automatic chunking (for internal use)
 async fn llm_request_with_prompt_direct(messages: Vec<String>, prompt: String) -> Result<String> {
-    let config = pkg_config::get_config()?;
+    let config = pkg_config::shared_config()?;
     match config.provider.as_str() {
         "deepseek" => {
             deepseek_provider::DeepSeekProvider::chat_with_prompt_static(messages, prompt).await
@@ -1,8 +1,12 @@
 use anyhow::Result;
 use anyhow::anyhow;
 use siumai::prelude::*;
+use std::sync::Arc;
 
-use crate::pkg_config::{OllamaConfig, get_config};
+use crate::pkg_config::{OllamaConfig, get_config, shared_config};
+use crate::provider_cache::ProviderCache;
+
+static SHARED: ProviderCache<OllamaConfig, OllamaProvider> = ProviderCache::new();
 
 pub struct OllamaProvider {
     client: Siumai,
@@ -41,6 +45,16 @@ impl OllamaProvider {
         Ok(Self { client })
     }
 
+    /// Get the provider for the current config, reusing the previous client
+    /// (and its connection pool) while the ollama settings are unchanged.
+    pub async fn shared() -> Result<Arc<Self>> {
+        let config = match shared_config() {
+            Ok(config) => config,
+            Err(err) => return Err(anyhow!("can't get config with error: {}", err)),
+        };
+        SHARED.get_or_build(&config.llm.ollama, Self::new).await
+    }
+
     pub async fn chat_with_prompt(&self, message: &str, system_prompt: &str) -> Result<String> {
         let request = vec![user!(message), system!(system_prompt)];
         let response = self.client.chat_with_tools(request, None).await?;
@@ -53,7 +67,7 @@ impl OllamaProvider {
     }
 
     pub async fn get_llm_request(messages: Vec<String>) -> Result<String> {
-        let provider = Self::init_with_config().await?;
+        let provider = Self::shared().await?;
         let chat_messages: Vec<ChatMessage> = messages.into_iter().map(|msg| user!(msg)).collect();
         provider.chat(chat_messages).await
     }
@@ -62,7 +76,7 @@ impl OllamaProvider {
         messages: Vec<String>,
         system_prompt: String,
     ) -> Result<String> {
-        let provider = Self::init_with_config().await?;
+        let provider = Self::shared().await?;
         let combined_message = messages.join(" ");
         provider
             .chat_with_prompt(&combined_message, &system_prompt)
@@ -1,28 +1,31 @@
 use anyhow::Result;
 use config::{Config, File};
+use std::path::{Path, PathBuf};
+use std::sync::{Arc, Mutex};
+use std::time::SystemTime;
 
 use serde::Deserialize;
 
-#[derive(Debug, Clone, Deserialize)]
+#[derive(Debug, Clone, PartialEq, Eq, Deserialize)]
 pub struct OllamaConfig {
     pub model: String,
     pub base_url: String,
     pub api_key: String,
 }
 
-#[derive(Debug, Clone, Deserialize)]
+#[derive(Debug, Clone, PartialEq, Eq, Deserialize)]
 pub struct OpenAIConfig {
     pub model: String,
     pub api_key: String,
 }
 
-#[derive(Debug, Clone, Deserialize)]
+#[derive(Debug, Clone, PartialEq, Eq, Deserialize)]
 pub struct XAIConfig {
     pub model: String,
     pub api_key: String,
 }
 
-#[derive(Debug, Clone, Deserialize)]
+#[derive(Debug, Clone, PartialEq, Eq, Deserialize)]
 pub struct DeepSeekConfig {
     pub model: String,
     pub api_key: String,
@@ -53,14 +56,51 @@ impl Default for ChunkingConfig {
     }
 }
 
+/// On-disk cache of translation responses kept by the agent
+#[derive(Debug, Clone, Deserialize)]
+pub struct ResponseCacheConfig {
+    pub enabled: Option<bool>,
+    pub max_entries: Option<usize>,
+}
+
 #[derive(Debug, Clone, Deserialize)]
 pub struct LLMConfig {
     pub provider: String,
     pub llm: LLMProviders,
     pub chunking: Option<ChunkingConfig>,
+    pub response_cache: Option<ResponseCacheConfig>,
 }
 
+impl LLMConfig {
+    /// Model name configured for the selected provider
+    pub fn model(&self) -> &str {
+        match self.provider.as_str() {
+            "ollama" => &self.llm.ollama.model,
+            "openai" => &self.llm.openai.model,
+            "xai" => &self.llm.xai.model,
+            "deepseek" => &self.llm.deepseek.model,
+            _ => "",
+        }
+    }
+}
+
+/// Last parsed config, keyed by file path and modification time.
+static CONFIG_CACHE: Mutex<Option<(PathBuf, Option<SystemTime>, Arc<LLMConfig>)>> =
+    Mutex::new(None);
+
+/// Load the LLM config, re-parsing the file only when it has changed on disk.
+///
+/// Returns an owned copy; read-only callers should prefer [`shared_config`].
 pub fn get_config() -> Result<LLMConfig, config::ConfigError> {
+    shared_config().map(|config| LLMConfig::clone(&config))
+}
+
+/// Load the LLM config as a shared, read-only value.
+///
+/// Every LLM request reads the config, so the parsed value is cached and
+/// reused while the file's modification time stays the same. Handing out the
+/// cached `Arc` spares each request a copy of every provider's settings.
+pub fn shared_config() -> Result<Arc<LLMConfig>, config::ConfigError> {
     // Try multiple possible paths for the config file
     let possible_paths = [
         "config/config.toml",       // From project root
@@ -68,24 +108,33 @@ pub fn get_config() -> Result<LLMConfig, config::ConfigError> {
         "../../config/config.toml", // From deeper nested directories
     ];
 
-    let mut config_builder = Config::builder();
-    let mut found_config = false;
+    let path = possible_paths
+        .iter()
+        .map(Path::new)
+        .find(|path| path.exists())
+        .ok_or_else(|| {
+            config::ConfigError::NotFound(
+                "config.toml not found in any expected location".to_string(),
+            )
+        })?;
+    // Key on the absolute path: the working directory may change between calls
+    let key = std::fs::canonicalize(path).unwrap_or_else(|_| path.to_path_buf());
+    let modified = std::fs::metadata(&key).and_then(|m| m.modified()).ok();
 
-    for path in &possible_paths {
-        if std::path::Path::new(path).exists() {
-            config_builder = config_builder.add_source(File::with_name(path));
-            found_config = true;
-            break;
+    let mut cache = CONFIG_CACHE.lock().unwrap_or_else(|e| e.into_inner());
+    if let Some((cached_path, cached_modified, config)) = cache.as_ref() {
+        if *cached_path == key && modified.is_some() && *cached_modified == modified {
+            return Ok(Arc::clone(config));
         }
     }
 
-    if !found_config {
-        return Err(config::ConfigError::NotFound(
-            "config.toml not found in any expected location".to_string(),
-        ));
-    }
+    let config = Arc::new(load_config(path)?);
+    *cache = Some((key, modified, Arc::clone(&config)));
+    Ok(config)
+}
 
-    let config = config_builder.build()?;
+fn load_config(path: &Path) -> Result<LLMConfig, config::ConfigError> {
+    let config = Config::builder().add_source(File::from(path)).build()?;
     let config: LLMConfig = config.try_deserialize()?;
 
     match config.provider.as_str() {
@@ -0,0 +1,38 @@
+use anyhow::Result;
+use std::sync::Arc;
+use tokio::sync::Mutex;
+
+/// Provider built from the last seen settings, reused so requests share one HTTP client
+/// (and its connection pool) while those settings are unchanged.
+pub(crate) struct ProviderCache<C, P> {
+    slot: Mutex<Option<(C, Arc<P>)>>,
+}
+
+impl<C, P> ProviderCache<C, P> {
+    pub(crate) const fn new() -> Self {
+        Self {
+            slot: Mutex::const_new(None),
+        }
+    }
+}
+
+impl<C: Clone + PartialEq, P> ProviderCache<C, P> {
+    /// Return the cached provider if it was built from `config`, otherwise build
+    /// a new one with `build` and cache it in place of the old one.
+    pub(crate) async fn get_or_build<F, Fut>(&self, config: &C, build: F) -> Result<Arc<P>>
+    where
+        F: FnOnce(C) -> Fut,
+        Fut: Future<Output = Result<P>>,
+    {
+        let mut slot = self.slot.lock().await;
+        if let Some((cached, provider)) = slot.as_ref() {
+            if cached == config {
+                return Ok(Arc::clone(provider));
+            }
+        }
+
+        let provider = Arc::new(build(config.clone()).await?);
+        *slot = Some((config.clone(), Arc::clone(&provider)));
+        Ok(provider)
+    }
+}
@@ -1,8 +1,12 @@
 use anyhow::Result;
 use anyhow::anyhow;
 use siumai::prelude::*;
+use std::sync::Arc;
 
-use crate::pkg_config::{XAIConfig, get_config};
+use crate::pkg_config::{XAIConfig, get_config, shared_config};
+use crate::provider_cache::ProviderCache;
+
+static SHARED: ProviderCache<XAIConfig, XAIProvider> = ProviderCache::new();
 
 pub struct XAIProvider {
     client: Siumai,
@@ -38,6 +42,16 @@ impl XAIProvider {
         Ok(Self { client })
     }
 
+    /// Get the provider for the current config, reusing the previous client
+    /// (and its connection pool) while the xai settings are unchanged.
+    pub async fn shared() -> Result<Arc<Self>> {
+        let config = match shared_config() {
+            Ok(config) => config,
+            Err(err) => return Err(anyhow!("can't get config with error: {}", err)),
+        };
+        SHARED.get_or_build(&config.llm.xai, Self::new).await
+    }
+
     pub async fn chat_with_prompt(&self, message: &str, system_prompt: &str) -> Result<String> {
         let request = vec![user!(message), system!(system_prompt)];
         let response = self.client.chat_with_tools(request, None).await?;
@@ -50,7 +64,7 @@ impl XAIProvider {
     }
 
     pub async fn get_llm_request(messages: Vec<String>) -> Result<String> {
-        let provider = Self::init_with_config().await?;
+        let provider = Self::shared().await?;
         let chat_messages: Vec<ChatMessage> = messages.into_iter().map(|msg| user!(msg)).collect();
         provider.chat(chat_messages).await
     }
@@ -59,7 +73,7 @@ impl XAIProvider {
         messages: Vec<String>,
         system_prompt: String,
     ) -> Result<String> {
-        let provider = Self::init_with_config().await?;
+        let provider = Self::shared().await?;
         let combined_message = messages.join(" ");
         provider
             .chat_with_prompt(&combined_message, &system_prompt)
@@ -1,4 +1,5 @@
 use anyhow::{Result, anyhow};
+use db_services::sqlite_services::{AnalysisResult, CodeEntry};
 use db_services::{DatabaseManager, create_database_manager};
 use dirs;
 use log::{debug, error, info, warn};
@@ -868,6 +869,9 @@ impl ClangdAnalyzer {
 
     /// Save all analysis results to database
     /// This is the unified entry point for persisting LSP analysis results
+    ///
+    /// All functions, structs, variables and macros are written in a single
+    /// transaction instead of one autocommit per row.
     pub async fn save_analysis_results_to_database(&self) -> Result<()> {
         let Some(ref db_manager) = self.database_manager else {
             debug!("No database manager configured, skipping save");
@@ -876,37 +880,56 @@ impl ClangdAnalyzer {
 
         info!("Saving analysis results to database...");
 
-        // Save functions
+        let mut records = Vec::with_capacity(
+            self.functions.len() + self.classes.len() + self.variables.len() + self.macros.len(),
+        );
+
+        // Functions
         if !self.functions.is_empty() {
-            self.save_functions_to_database(db_manager).await?;
+            self.collect_function_records(&mut records)?;
         }
 
-        // Save classes/structs
+        // Classes/structs
         if !self.classes.is_empty() {
-            self.save_classes_to_database(db_manager).await?;
+            self.collect_class_records(&mut records)?;
         }
 
-        // Save variables
+        // Variables
         if !self.variables.is_empty() {
-            self.save_variables_to_database(db_manager).await?;
+            self.collect_variable_records(&mut records)?;
         }
 
-        // Save macros
+        // Macros
         if !self.macros.is_empty() {
-            info!("Saving {} macros to database", self.macros.len());
-            self.save_macros_to_database(db_manager).await?;
+            self.collect_macro_records(&mut records)?;
         }
 
-        info!("Successfully saved all analysis results to database");
+        if records.is_empty() {
+            debug!("No analysis results to save");
+            return Ok(());
+        }
+
+        let saved = db_manager.save_code_entries_with_analysis(records).await?;
+
+        info!(
+            "Successfully saved all analysis results to database ({} entries)",
+            saved.len()
+        );
         Ok(())
     }
 
-    /// Save function definitions to database
-    async fn save_functions_to_database(&self, db_manager: &DatabaseManager) -> Result<()> {
-        info!("Saving {} functions to database", self.functions.len());
+    /// Build code entry / analysis result pairs for function definitions
+    fn collect_function_records(
+        &self,
+        records: &mut Vec<(CodeEntry, AnalysisResult)>,
+    ) -> Result<()> {
+        info!("Preparing {} functions for database", self.functions.len());
+
+        let project = self.project_root.to_string_lossy().to_string();
+        let now = chrono::Utc::now();
 
         for function in &self.functions {
-            // First create a code entry for the function
+            // Code entry for the function
             let params_str = function
                 .parameters
                 .iter()
@@ -918,15 +941,15 @@ impl ClangdAnalyzer {
                 function.return_type, function.name, params_str
             );
 
-            let code_entry = db_services::sqlite_services::CodeEntry {
+            let code_entry = CodeEntry {
                 id: String::new(), // Will be generated
                 code,
                 language: "c".to_string(),
                 function_name: function.name.clone(),
-                project: self.project_root.to_string_lossy().to_string(),
+                project: project.clone(),
                 file_path: function.file.to_string_lossy().to_string(),
-                created_at: chrono::Utc::now(),
-                updated_at: chrono::Utc::now(),
+                created_at: now,
+                updated_at: now,
                 metadata: Some(
                     json!({
                         "type": "function_definition",
@@ -938,24 +961,10 @@ impl ClangdAnalyzer {
                 ),
             };
 
-            debug!("Saving code entry for function {}", function.name);
-
-            // Save the code entry and get its ID
-            let code_id = match db_manager.save_code_entry(code_entry).await {
-                Ok(id) => id,
-                Err(e) => {
-                    warn!(
-                        "Failed to save code entry for function {}: {}",
-                        function.name, e
-                    );
-                    continue;
-                }
-            };
-
-            // Now create the analysis result using the code entry ID
-            let analysis_result = db_services::sqlite_services::AnalysisResult {
-                id: String::new(), // Will be generated by insert_analysis_result
-                code_id,
+            // Analysis result, linked to the code entry on insert
+            let analysis_result = AnalysisResult {
+                id: String::new(),
+                code_id: String::new(),
                 analysis_type: "function_definition".to_string(),
                 result: serde_json::to_string(&json!({
                     "name": function.name,
@@ -966,25 +975,27 @@ impl ClangdAnalyzer {
                     "language": "c" // Default to C, could be enhanced later
                 }))?,
                 score: None,
-                created_at: chrono::Utc::now(),
+                created_at: now,
             };
 
-            debug!("Saving Function metadata: {:?}", analysis_result);
-
-            if let Err(e) = db_manager.save_analysis_result(analysis_result).await {
-                warn!("Failed to save function {}: {}", function.name, e);
-            }
+            records.push((code_entry, analysis_result));
         }
 
         Ok(())
     }
 
-    /// Save class/struct definitions to database
-    async fn save_classes_to_database(&self, db_manager: &DatabaseManager) -> Result<()> {
-        info!("Saving {} classes/structs to database", self.classes.len());
+    /// Build code entry / analysis result pairs for class/struct definitions
+    fn collect_class_records(&self, records: &mut Vec<(CodeEntry, AnalysisResult)>) -> Result<()> {
+        info!(
+            "Preparing {} classes/structs for database",
+            self.classes.len()
+        );
+
+        let project = self.project_root.to_string_lossy().to_string();
+        let now = chrono::Utc::now();
 
         for class in &self.classes {
-            // First create a code entry for the class/struct
+            // Code entry for the class/struct
             let members_str = class
                 .members
                 .iter()
@@ -993,15 +1004,15 @@ impl ClangdAnalyzer {
                 .join("\n");
             let code = format!("struct {} {{\n{}\n}};", class.name, members_str);
 
-            let code_entry = db_services::sqlite_services::CodeEntry {
+            let code_entry = CodeEntry {
                 id: String::new(), // Will be generated
                 code,
                 language: "c".to_string(),
                 function_name: String::new(),
-                project: self.project_root.to_string_lossy().to_string(),
+                project: project.clone(),
                 file_path: class.file.to_string_lossy().to_string(),
-                created_at: chrono::Utc::now(),
-                updated_at: chrono::Utc::now(),
+                created_at: now,
+                updated_at: now,
                 metadata: Some(
                     json!({
                         "type": "struct_definition",
@@ -1013,24 +1024,9 @@ impl ClangdAnalyzer {
                 ),
             };
 
-            debug!("Saving Class metadata: {:?}", code_entry);
-
-            // Save the code entry and get its ID
-            let code_id = match db_manager.save_code_entry(code_entry).await {
-                Ok(id) => id,
-                Err(e) => {
-                    warn!(
-                        "Failed to save code entry for class/struct {}: {}",
-                        class.name, e
-                    );
-                    continue;
-                }
-            };
-
-            // Now create the analysis result using the code entry ID
-            let analysis_result = db_services::sqlite_services::AnalysisResult {
+            let analysis_result = AnalysisResult {
                 id: String::new(),
-                code_id,
+                code_id: String::new(),
                 analysis_type: "struct_definition".to_string(),
                 result: serde_json::to_string(&json!({
                     "name": class.name,
@@ -1040,32 +1036,35 @@ impl ClangdAnalyzer {
                     "language": "c"
                 }))?,
                 score: None,
-                created_at: chrono::Utc::now(),
+                created_at: now,
             };
 
-            if let Err(e) = db_manager.save_analysis_result(analysis_result).await {
-                warn!("Failed to save class/struct {}: {}", class.name, e);
-            }
+            records.push((code_entry, analysis_result));
         }
 
         Ok(())
     }
 
-    /// Save variable definitions to database
-    async fn save_variables_to_database(&self, db_manager: &DatabaseManager) -> Result<()> {
-        info!("Saving {} variables to database", self.variables.len());
+    /// Build code entry / analysis result pairs for variable definitions
+    fn collect_variable_records(
+        &self,
+        records: &mut Vec<(CodeEntry, AnalysisResult)>,
+    ) -> Result<()> {
+        info!("Preparing {} variables for database", self.variables.len());
+
+        let project = self.project_root.to_string_lossy().to_string();
+        let now = chrono::Utc::now();
 
         for variable in &self.variables {
-            // First create a code entry for the variable
-            let code_entry = db_services::sqlite_services::CodeEntry {
+            let code_entry = CodeEntry {
                 id: String::new(), // Will be generated
                 code: format!("{} {};", variable.r#type, variable.name),
                 language: "c".to_string(),
                 function_name: String::new(),
-                project: self.project_root.to_string_lossy().to_string(),
+                project: project.clone(),
                 file_path: variable.file.to_string_lossy().to_string(),
-                created_at: chrono::Utc::now(),
-                updated_at: chrono::Utc::now(),
+                created_at: now,
+                updated_at: now,
                 metadata: Some(
                     json!({
                         "type": "variable_definition",
@@ -1076,22 +1075,9 @@ impl ClangdAnalyzer {
                 ),
             };
 
-            // Save the code entry and get its ID
-            let code_id = match db_manager.save_code_entry(code_entry).await {
-                Ok(id) => id,
-                Err(e) => {
-                    warn!(
-                        "Failed to save code entry for variable {}: {}",
-                        variable.name, e
-                    );
-                    continue;
-                }
-            };
-
-            // Now create the analysis result using the code entry ID
-            let analysis_result = db_services::sqlite_services::AnalysisResult {
+            let analysis_result = AnalysisResult {
                 id: String::new(),
-                code_id,
+                code_id: String::new(),
                 analysis_type: "variable_definition".to_string(),
                 result: serde_json::to_string(&json!({
                     "name": variable.name,
@@ -1101,34 +1087,34 @@ impl ClangdAnalyzer {
                     "language": "c"
                 }))?,
                 score: None,
-                created_at: chrono::Utc::now(),
+                created_at: now,
             };
 
-            if let Err(e) = db_manager.save_analysis_result(analysis_result).await {
-                warn!("Failed to save variable {}: {}", variable.name, e);
-            }
+            records.push((code_entry, analysis_result));
         }
 
         Ok(())
     }
 
-    /// Save macro definitions to database
-    async fn save_macros_to_database(&self, db_manager: &DatabaseManager) -> Result<()> {
-        info!("Saving {} macros to database", self.macros.len());
+    /// Build code entry / analysis result pairs for macro definitions
+    fn collect_macro_records(&self, records: &mut Vec<(CodeEntry, AnalysisResult)>) -> Result<()> {
+        info!("Preparing {} macros for database", self.macros.len());
+
+        let project = self.project_root.to_string_lossy().to_string();
+        let now = chrono::Utc::now();
 
         for macro_info in &self.macros {
-            // First create a code entry for the macro
             let code = format!("#define {} {}", macro_info.name, macro_info.value);
 
-            let code_entry = db_services::sqlite_services::CodeEntry {
+            let code_entry = CodeEntry {
                 id: String::new(), // Will be generated
                 code,
                 language: "c".to_string(),
                 function_name: String::new(),
-                project: self.project_root.to_string_lossy().to_string(),
+                project: project.clone(),
                 file_path: macro_info.file.to_string_lossy().to_string(),
-                created_at: chrono::Utc::now(),
-                updated_at: chrono::Utc::now(),
+                created_at: now,
+                updated_at: now,
                 metadata: Some(
                     json!({
                         "type": "macro_definition",
@@ -1140,22 +1126,9 @@ impl ClangdAnalyzer {
                 ),
             };
 
-            // Save the code entry and get its ID
-            let code_id = match db_manager.save_code_entry(code_entry).await {
-                Ok(id) => id,
-                Err(e) => {
-                    warn!(
-                        "Failed to save code entry for macro {}: {}",
-                        macro_info.name, e
-                    );
-                    continue;
-                }
-            };
-
-            // Now create the analysis result using the code entry ID
-            let analysis_result = db_services::sqlite_services::AnalysisResult {
+            let analysis_result = AnalysisResult {
                 id: String::new(),
-                code_id,
+                code_id: String::new(),
                 analysis_type: "macro_definition".to_string(),
                 result: serde_json::to_string(&json!({
                     "name": macro_info.name,
@@ -1165,12 +1138,10 @@ impl ClangdAnalyzer {
                     "language": "c"
                 }))?,
                 score: None,
-                created_at: chrono::Utc::now(),
+                created_at: now,
             };
 
-            if let Err(e) = db_manager.save_analysis_result(analysis_result).await {
-                warn!("Failed to save macro {}: {}", macro_info.name, e);
-            }
+            records.push((code_entry, analysis_result));
         }
 
         Ok(())
@@ -7,8 +7,10 @@
 use anyhow::Result;
 use log::{info, warn};
 use main_processor::{pkg_config, MainProcessor};
+use std::path::{Path, PathBuf};
 use tempfile::TempDir;
 use tokio::fs;
+use tokio::task::JoinSet;
 
 /// Example C code for testing
 const EXAMPLE_C_CODE: &str = r#"
@@ -69,20 +71,48 @@ int main() {
 /// Initialize logging for the example
 fn init_logging() {}
 
+/// Create the per-example directory inside the shared workspace
+async fn example_dir(workspace: &Path, name: &str) -> Result<PathBuf> {
+    let dir = workspace.join(name);
+    fs::create_dir_all(&dir).await?;
+    Ok(dir)
+}
+
+/// Write a `main.c` for each project concurrently, returning project dirs in input order
+async fn write_projects(root: &Path, projects: &[(&str, &'static str)]) -> Result<Vec<PathBuf>> {
+    let paths: Vec<PathBuf> = projects.iter().map(|(name, _)| root.join(name)).collect();
+
+    let mut writes = JoinSet::new();
+    for (project_path, (_, code)) in paths.iter().cloned().zip(projects) {
+        let code = *code;
+        writes.spawn(async move {
+            fs::create_dir_all(&project_path).await?;
+            fs::write(project_path.join("main.c"), code).await
+        });
+    }
+    while let Some(written) = writes.join_next().await {
+        written??;
+    }
+
+    Ok(paths)
+}
+
 /// Example 1: Quick single file translation
-async fn example_single_file_translation() -> Result<()> {
+async fn example_single_file_translation(
+    processor: &MainProcessor,
+    workspace: &Path,
+) -> Result<()> {
     info!("=== Example 1: Single File Translation ===");
 
     // Create a temporary C file
-    let temp_dir = TempDir::new()?;
-    let c_file_path = temp_dir.path().join("person.c");
+    let c_file_path = example_dir(workspace, "single_file")
+        .await?
+        .join("person.c");
 
     fs::write(&c_file_path, EXAMPLE_C_CODE).await?;
     info!("Created test C file: {}", c_file_path.display());
 
-    // Create processor and translate
-    let cfg = pkg_config::get_config().unwrap_or_default();
-    let processor = MainProcessor::new(cfg);
+    // Translate with the shared processor
     match processor.process_single(&c_file_path).await {
         Ok(()) => {
             info!("✅ Translation successful!");
@@ -111,10 +141,10 @@ async fn example_single_file_translation() -> Result<()> {
 }
 
 /// Example 2: Batch translation of multiple files
-async fn example_batch_translation() -> Result<()> {
+async fn example_batch_translation(processor: &MainProcessor, workspace: &Path) -> Result<()> {
     info!("=== Example 2: Batch Translation ===");
 
-    let temp_dir = TempDir::new()?;
+    let batch_dir = example_dir(workspace, "batch").await?;
 
     // Create multiple small C projects
     let projects = vec![
@@ -148,20 +178,11 @@ int main() {
         ),
     ];
 
-    let mut project_paths = Vec::new();
-
-    for (name, code) in projects {
-        let project_path = temp_dir.path().join(name);
-        fs::create_dir_all(&project_path).await?;
-        fs::write(project_path.join("main.c"), code).await?;
-        project_paths.push(project_path);
-    }
+    let project_paths = write_projects(&batch_dir, &projects).await?;
 
     info!("Created {} test projects", project_paths.len());
 
     // Perform batch translation
-    let cfg = pkg_config::get_config().unwrap_or_default();
-    let processor = MainProcessor::new(cfg);
     match processor.process_batch(project_paths).await {
         Ok(()) => {
             info!("✅ Batch translation completed successfully!");
@@ -175,12 +196,10 @@ int main() {
 }
 
 /// Example 3: Working with directory structures
-async fn example_directory_structure() -> Result<()> {
+async fn example_directory_structure(processor: &MainProcessor, workspace: &Path) -> Result<()> {
     info!("=== Example 3: Directory Structure Translation ===");
 
-    let temp_dir = TempDir::new()?;
-    let root_dir = temp_dir.path().join("c_projects_root");
-    fs::create_dir_all(&root_dir).await?;
+    let root_dir = example_dir(workspace, "c_projects_root").await?;
 
     // Create a directory structure with multiple C projects
     let structure = vec![
@@ -198,19 +217,11 @@ async fn example_directory_structure() -> Result<()> {
         ),
     ];
 
-    let mut paths = Vec::new();
-    for (name, content) in structure {
-        let project_path = root_dir.join(name);
-        fs::create_dir_all(&project_path).await?;
-        fs::write(project_path.join("main.c"), content).await?;
-        paths.push(project_path);
-    }
+    let paths = write_projects(&root_dir, &structure).await?;
 
     info!("Created directory structure with multiple projects");
 
     // Process all projects
-    let cfg = pkg_config::get_config().unwrap_or_default();
-    let processor = MainProcessor::new(cfg);
     match processor.process_batch(paths).await {
         Ok(()) => {
             info!("✅ Directory structure translation completed!");
@@ -224,11 +235,9 @@ async fn example_directory_structure() -> Result<()> {
 }
 
 /// Example 4: Error handling scenarios
-async fn example_error_handling() -> Result<()> {
+async fn example_error_handling(processor: &MainProcessor, workspace: &Path) -> Result<()> {
     info!("=== Example 4: Error Handling ===");
 
-    let temp_dir = TempDir::new()?;
-
     // Create a problematic C file (intentionally malformed for testing)
     let problematic_c = r#"
 // This C code has some complex patterns that might challenge translation
@@ -258,13 +267,13 @@ int main() {
 }
 "#;
 
-    let c_file = temp_dir.path().join("complex.c");
+    let c_file = example_dir(workspace, "error_handling")
+        .await?
+        .join("complex.c");
     fs::write(&c_file, problematic_c).await?;
 
     info!("Created complex C file for testing error handling");
 
-    let cfg = pkg_config::get_config().unwrap_or_default();
-    let processor = MainProcessor::new(cfg);
     match processor.process_single(&c_file).await {
         Ok(()) => {
             info!("✅ Complex translation succeeded!");
@@ -279,12 +288,10 @@ int main() {
 }
 
 /// Example 5: Multi-file project with headers
-async fn example_multi_file_project() -> Result<()> {
+async fn example_multi_file_project(processor: &MainProcessor, workspace: &Path) -> Result<()> {
     info!("=== Example 5: Multi-file Project ===");
 
-    let temp_dir = TempDir::new()?;
-    let project_dir = temp_dir.path().join("multi_file_project");
-    fs::create_dir_all(&project_dir).await?;
+    let project_dir = example_dir(workspace, "multi_file_project").await?;
 
     // Create multiple files for a project
     let main_c = r#"
@@ -320,15 +327,15 @@ int multiply_numbers(int a, int b);
 #endif // UTILS_H
 "#;
 
-    fs::write(project_dir.join("main.c"), main_c).await?;
-    fs::write(project_dir.join("utils.c"), utils_c).await?;
-    fs::write(project_dir.join("utils.h"), utils_h).await?;
+    tokio::try_join!(
+        fs::write(project_dir.join("main.c"), main_c),
+        fs::write(project_dir.join("utils.c"), utils_c),
+        fs::write(project_dir.join("utils.h"), utils_h),
+    )?;
 
     info!("Created multi-file C project");
 
     // Process the project
-    let cfg = pkg_config::get_config().unwrap_or_default();
-    let processor = MainProcessor::new(cfg);
     match processor.process_single(&project_dir).await {
         Ok(()) => {
             info!("✅ Multi-file project translation completed!");
@@ -348,20 +355,25 @@ async fn main() -> Result<()> {
     info!("🚀 Starting C to Rust Translation Examples");
     info!("==========================================");
 
+    // One workspace and one processor are shared by all examples
+    let workspace = TempDir::new()?;
+    let cfg = pkg_config::get_config().unwrap_or_default();
+    let processor = MainProcessor::new(cfg);
+
     // Run all examples
-    example_single_file_translation().await?;
+    example_single_file_translation(&processor, workspace.path()).await?;
     println!("\n");
 
-    example_batch_translation().await?;
+    example_batch_translation(&processor, workspace.path()).await?;
     println!("\n");
 
-    example_directory_structure().await?;
+    example_directory_structure(&processor, workspace.path()).await?;
     println!("\n");
 
-    example_error_handling().await?;
+    example_error_handling(&processor, workspace.path()).await?;
     println!("\n");
 
-    example_multi_file_project().await?;
+    example_multi_file_project(&processor, workspace.path()).await?;
 
     info!("\n🎉 All examples completed successfully!");
     info!("==========================================");
@@ -392,11 +404,18 @@ mod tests {
 
         init_logging();
 
+        let workspace = TempDir::new().unwrap();
+        let cfg = pkg_config::get_config().unwrap_or_default();
+        let processor = MainProcessor::new(cfg);
+        let ws = workspace.path();
+
         // Test that all example functions can be called without panicking
-        assert!(example_single_file_translation().await.is_ok());
-        assert!(example_batch_translation().await.is_ok());
-        assert!(example_directory_structure().await.is_ok());
-        assert!(example_error_handling().await.is_ok());
-        assert!(example_multi_file_project().await.is_ok());
+        assert!(example_single_file_translation(&processor, ws)
+            .await
+            .is_ok());
+        assert!(example_batch_translation(&processor, ws).await.is_ok());
+        assert!(example_directory_structure(&processor, ws).await.is_ok());
+        assert!(example_error_handling(&processor, ws).await.is_ok());
+        assert!(example_multi_file_project(&processor, ws).await.is_ok());
     }
 }
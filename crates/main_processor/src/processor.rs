@@ -1,6 +1,7 @@
 use anyhow::{anyhow, Context, Result};
 use indicatif::{MultiProgress, ProgressBar, ProgressStyle};
 use log::{error, info};
+use relation_analy::{entry_is_dir, entry_is_file};
 use single_processor::{singlefile_processor, StageCallback};
 use std::collections::{HashMap, HashSet, VecDeque};
 use std::path::{Path, PathBuf};
@@ -92,7 +93,7 @@ async fn scan_directory_for_projects(dir_path: &Path) -> Result<(Vec<PathBuf>, u
     let mut entries = fs::read_dir(dir_path).await?;
     while let Some(entry) = entries.next_entry().await? {
         let p = entry.path();
-        if !p.is_dir() {
+        if !entry_is_dir(&p, entry.file_type().await?) {
             continue;
         }
 
@@ -104,7 +105,7 @@ async fn scan_directory_for_projects(dir_path: &Path) -> Result<(Vec<PathBuf>, u
         let mut sub = fs::read_dir(&p).await?;
         while let Some(se) = sub.next_entry().await? {
             let fp = se.path();
-            if fp.is_file() {
+            if entry_is_file(&fp, se.file_type().await?) {
                 if let Some(ext) = fp.extension() {
                     if ext == "c" || ext == "h" {
                         has_ch = true;
@@ -189,35 +190,44 @@ pub async fn process_batch_paths(cfg: MainProcessorConfig, paths: Vec<PathBuf>)
     overall.set_prefix("Total Progress");
     overall.set_message("Processing...");
 
+    // Show every task as waiting up front, then feed them to the workers
+    let queued: Vec<(PathBuf, ProgressBar, String)> = paths
+        .into_iter()
+        .enumerate()
+        .map(|(index, p)| {
+            let pb = m.add(ProgressBar::new_spinner());
+            pb.set_style(progress_style_task());
+            pb.set_prefix(format_task_prefix(index + 1, total_tasks));
+
+            let file_name = p
+                .file_name()
+                .unwrap_or_default()
+                .to_string_lossy()
+                .to_string();
+            pb.set_message(format!("{} - Waiting to start", file_name));
+            (p, pb, file_name)
+        })
+        .collect();
+
     let sem = Arc::new(Semaphore::new(concurrent));
     let mut handles = Vec::with_capacity(total_tasks);
 
-    for (index, p) in paths.into_iter().enumerate() {
-        let step_number = index + 1;
-        let pb = m.add(ProgressBar::new_spinner());
-        pb.set_style(progress_style_task());
-        pb.set_prefix(format_task_prefix(step_number, total_tasks));
-
-        let file_name = p
-            .file_name()
-            .unwrap_or_default()
-            .to_string_lossy()
-            .to_string();
-        pb.set_message(format!("{} - Waiting to start", file_name));
-
-        let permit = sem.clone();
+    for (p, pb, file_name) in queued {
+        // Take the permit before spawning so at most `concurrent` blocking threads
+        // exist at a time, instead of one parked thread per queued task
+        let permit = sem
+            .clone()
+            .acquire_owned()
+            .await
+            .map_err(|e| anyhow!("Failed to acquire semaphore: {}", e))?;
         let pb_clone = pb.clone();
         let overall_clone = overall.clone();
         let max_retries = cfg.max_retry_attempts.max(1);
 
         let handle = tokio::task::spawn_blocking(move || {
+            let _permit = permit;
             // 使用 block_on 来执行 async 代码
             tokio::runtime::Handle::current().block_on(async {
-                let _permit = permit
-                    .acquire_owned()
-                    .await
-                    .map_err(|e| anyhow!("Failed to acquire semaphore: {}", e))?;
-
                 let mut attempt = 0;
                 loop {
                     attempt += 1;
@@ -337,13 +347,17 @@ pub async fn process_with_dependency_graph(
 
     // We only treat each subdirectory under src_cache/individual_files and paired_files as a "project node"
     // Map file dependencies to directory dependencies: if A.c depends on B.h/B.c, then A's directory depends on B's directory.
-    let mut dir_of: HashMap<PathBuf, PathBuf> = HashMap::new(); // file(relative) -> directory(absolute)
-    let mut projects: HashSet<PathBuf> = HashSet::new();
+    // Project directories are interned into integer ids so the graph is stored as flat index vectors
+    // instead of maps of cloned paths.
+    let mut projects: Vec<PathBuf> = Vec::new(); // id -> directory(absolute)
+    let mut project_ids: HashMap<PathBuf, usize> = HashMap::new(); // directory(absolute) -> id
+    let mut dir_of: HashMap<&Path, usize> = HashMap::new(); // file(relative) -> directory id
+
     // Two roots
     let indiv = cache_root.join("individual_files");
     let paired = cache_root.join("paired_files");
 
-    for (_key, node) in &rel.files {
+    for node in rel.files.values() {
         // Map relative paths in relation to actual paths under cache_root
         let abs = if node.path.is_absolute() {
             node.path.clone()
@@ -367,54 +381,47 @@ pub async fn process_with_dependency_graph(
             }
         }
         if let Some(project_dir) = project_dir_opt {
-            projects.insert(project_dir.clone());
-            dir_of.insert(node.path.clone(), project_dir);
+            let id = *project_ids.entry(project_dir).or_insert_with_key(|dir| {
+                projects.push(dir.clone());
+                projects.len() - 1
+            });
+            dir_of.insert(node.path.as_path(), id);
         }
     }
 
-    // Directory-level dependency graph: dir -> its dependent dirs
-    let mut deps: HashMap<PathBuf, HashSet<PathBuf>> = HashMap::new();
-    let mut rdeps: HashMap<PathBuf, HashSet<PathBuf>> = HashMap::new(); // Reverse: which directories depend on it
-    for (_key, node) in &rel.files {
+    // Directory-level dependency graph, as deduplicated (dependent, dependency) id pairs
+    let mut edges: HashSet<(usize, usize)> = HashSet::new();
+    for node in rel.files.values() {
         // Target directory (directory that owns this file)
-        let Some(dir_a) = dir_of.get(&node.path).cloned() else {
+        let Some(&dir_a) = dir_of.get(node.path.as_path()) else {
             continue;
         };
 
         // Local includes (only within this project)
         for inc in &node.local_includes {
-            if let Some(dir_b) = dir_of.get(inc).cloned() {
+            if let Some(&dir_b) = dir_of.get(inc.as_path()) {
                 if dir_a != dir_b {
-                    deps.entry(dir_a.clone()).or_default().insert(dir_b.clone());
-                    rdeps
-                        .entry(dir_b.clone())
-                        .or_default()
-                        .insert(dir_a.clone());
-                    projects.insert(dir_a.clone());
-                    projects.insert(dir_b.clone());
+                    edges.insert((dir_a, dir_b));
                 }
             }
         }
     }
 
-    // Ensure all project nodes have entries in the graph
-    for p in &projects {
-        deps.entry(p.clone()).or_default();
-        rdeps.entry(p.clone()).or_default();
-    }
-
-    // Calculate in-degree (dependency count): a directory must wait for all its dependent directories to complete before processing
-    let mut indeg: HashMap<PathBuf, usize> = HashMap::new();
-    for p in &projects {
-        let d = deps.get(p).map(|s| s.len()).unwrap_or(0);
-        indeg.insert(p.clone(), d);
+    // In-degree (dependency count): a directory must wait for all its dependent directories to complete before processing
+    // Reverse adjacency: which directories depend on it
+    let mut indeg: Vec<usize> = vec![0; projects.len()];
+    let mut rdeps: Vec<Vec<usize>> = vec![Vec::new(); projects.len()];
+    for &(dir_a, dir_b) in &edges {
+        indeg[dir_a] += 1;
+        rdeps[dir_b].push(dir_a);
     }
 
     // Ready queue: all nodes with indeg==0 (leaf layer), these are the "endpoints"
-    let mut ready: VecDeque<PathBuf> = indeg
+    let mut ready: VecDeque<usize> = indeg
         .iter()
+        .enumerate()
         .filter(|(_, &v)| v == 0)
-        .map(|(k, _)| k.clone())
+        .map(|(id, _)| id)
         .collect();
 
     let total_tasks = projects.len();
@@ -435,15 +442,15 @@ pub async fn process_with_dependency_graph(
 
     // We use a semaphore to limit concurrency, but won't force fill it, wait if no ready tasks
     let sem = Arc::new(Semaphore::new(concurrent));
-    let mut join_set: tokio::task::JoinSet<(PathBuf, Result<()>)> = tokio::task::JoinSet::new();
-    let mut running_dirs: HashSet<PathBuf> = HashSet::new();
-    let mut completed_ok: HashSet<PathBuf> = HashSet::new();
-    let mut completed_err: HashSet<PathBuf> = HashSet::new();
+    let mut join_set: tokio::task::JoinSet<(usize, Result<()>)> = tokio::task::JoinSet::new();
+    let mut running = 0usize;
+    let mut completed_ok = 0usize;
+    let mut completed_err = 0usize;
 
     // Utility: create a task for directory (avoid closure capturing mutable borrow, use function parameters)
     fn spawn_task_in(
-        join_set: &mut tokio::task::JoinSet<(PathBuf, Result<()>)>,
-        running_dirs: &mut HashSet<PathBuf>,
+        join_set: &mut tokio::task::JoinSet<(usize, Result<()>)>,
+        id: usize,
         dir: PathBuf,
         cfg: &MainProcessorConfig,
         m: &MultiProgress,
@@ -459,7 +466,6 @@ pub async fn process_with_dependency_graph(
         pb.set_prefix(format!("{}", name));
         pb.set_message("Queuing...");
 
-        let dir_clone = dir.clone();
         let max_retries = cfg.max_retry_attempts.max(1);
         join_set.spawn(async move {
             let _permit = sem.acquire_owned().await.unwrap();
@@ -474,11 +480,11 @@ pub async fn process_with_dependency_graph(
                         name2, stage, attempt, max_retries
                     ));
                 });
-                match singlefile_processor(&dir_clone, Some(callback)).await {
+                match singlefile_processor(&dir, Some(callback)).await {
                     Ok(()) => {
                         pb.set_style(progress_style_completed());
                         pb.finish_with_message(format!("✅ {}", name));
-                        break (dir_clone.clone(), Ok(()));
+                        break (id, Ok(()));
                     }
                     Err(e) => {
                         if attempt < max_retries {
@@ -487,23 +493,30 @@ pub async fn process_with_dependency_graph(
                         } else {
                             pb.set_style(progress_style_failed());
                             pb.finish_with_message(format!("❌ {}", name));
-                            break (dir_clone.clone(), Err(e));
+                            break (id, Err(e));
                         }
                     }
                 }
             }
         });
-        running_dirs.insert(dir);
     }
 
     // Main loop: submit tasks if ready; otherwise wait for any task to complete and advance the graph
-    while completed_ok.len() + completed_err.len() < total_tasks {
+    while completed_ok + completed_err < total_tasks {
         // Submit ready tasks as much as possible, until concurrency limit or no ready tasks
-        while running_dirs.len() < concurrent && !ready.is_empty() {
-            if let Some(dir) = ready.pop_front() {
+        while running < concurrent && !ready.is_empty() {
+            if let Some(id) = ready.pop_front() {
                 // Failed dependencies will block central nodes, but we still allow other branches to continue;
                 // Here we continue submitting leaf nodes.
-                spawn_task_in(&mut join_set, &mut running_dirs, dir, &cfg, &m, sem.clone());
+                spawn_task_in(
+                    &mut join_set,
+                    id,
+                    projects[id].clone(),
+                    &cfg,
+                    &m,
+                    sem.clone(),
+                );
+                running += 1;
             }
         }
 
@@ -517,52 +530,42 @@ pub async fn process_with_dependency_graph(
         let Some(res_join) = join_set.join_next().await else {
             break;
         };
-        let (dir_done, res) = res_join.unwrap();
-        running_dirs.remove(&dir_done);
-        match res {
-            Ok(()) => {
-                completed_ok.insert(dir_done.clone());
-            }
-            Err(_) => {
-                completed_err.insert(dir_done.clone());
-            }
-        }
+        let (id_done, res) = res_join.unwrap();
+        running -= 1;
         overall.inc(1);
 
-        // Decrease in-degree of nodes that depend on it by 1 (only successful completion unlocks dependencies, failure does not)
-        if completed_ok.contains(&dir_done) {
-            if let Some(users) = rdeps.get(&dir_done) {
-                for u in users {
-                    if let Some(v) = indeg.get_mut(u) {
-                        if *v > 0 {
-                            *v -= 1;
-                        }
-                        if *v == 0 {
-                            ready.push_back(u.clone());
-                        }
+        match res {
+            Ok(()) => {
+                completed_ok += 1;
+                // Decrease in-degree of nodes that depend on it by 1 (only successful completion unlocks dependencies, failure does not)
+                for &u in &rdeps[id_done] {
+                    if indeg[u] > 0 {
+                        indeg[u] -= 1;
+                    }
+                    if indeg[u] == 0 {
+                        ready.push_back(u);
                     }
                 }
             }
+            Err(_) => {
+                completed_err += 1;
+            }
         }
     }
 
-    if completed_err.is_empty() {
+    if completed_err == 0 {
         overall.set_style(progress_style_completed());
-        overall.finish_with_message(format!(
-            "🎉 All completed! {} successful",
-            completed_ok.len()
-        ));
+        overall.finish_with_message(format!("🎉 All completed! {} successful", completed_ok));
         Ok(())
     } else {
         overall.set_style(progress_style_failed());
         overall.finish_with_message(format!(
             "⚠️ Completed: {} successful, {} failed",
-            completed_ok.len(),
-            completed_err.len()
+            completed_ok, completed_err
         ));
         Err(anyhow!(
             "Dependency-aware processing completed, but {} tasks failed",
-            completed_err.len()
+            completed_err
         ))
     }
 }
@@ -8,6 +8,7 @@
 
 use anyhow::{Context, Result};
 use log::debug;
+use relation_analy::entry_is_dir;
 use serde::Deserialize;
 use std::collections::HashMap;
 use std::fs;
@@ -115,7 +116,7 @@ impl ProjectReorganizer {
             let entry = entry?;
             let project_dir = entry.path();
 
-            if !project_dir.is_dir() {
+            if !entry_is_dir(&project_dir, entry.file_type()?) {
                 continue;
             }
 
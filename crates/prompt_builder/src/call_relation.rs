@@ -10,10 +10,27 @@ use serde::{Deserialize, Serialize};
 use std::collections::HashMap;
 use std::fs;
 use std::path::{Path, PathBuf};
+use std::sync::LazyLock;
 
 use db_services::DatabaseManager;
 use lsp_services::lsp_services::{ClangdAnalyzer, Parameter};
 
+/// Regular expression for Rust function definitions, compiled once for all files
+static RUST_FN_DEF_RE: LazyLock<Regex> = LazyLock::new(|| {
+    Regex::new(
+        r"(?m)^[\s]*(?:pub\s+)?(?:async\s+)?fn\s+(\w+)\s*(<[^>]*>)?\s*\(([^)]*)\)\s*(?:->\s*([^{]+))?\s*\{",
+    )
+    .unwrap()
+});
+
+/// Simple C/C++ function definition regular expression, compiled once for all files
+static C_FN_DEF_RE: LazyLock<Regex> = LazyLock::new(|| {
+    Regex::new(
+        r"(?m)^[\s]*(?:static\s+|extern\s+|inline\s+)*([a-zA-Z_][a-zA-Z0-9_*\s]+)\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\([^)]*\)\s*(?:\{|;)",
+    )
+    .unwrap()
+});
+
 /// Function definition information
 #[derive(Debug, Clone, Serialize)]
 pub struct FunctionDefinition {
@@ -154,16 +171,11 @@ impl CallRelationAnalyzer {
             all_functions.extend(functions);
         }
 
-        // 4. Search database based on function names
-        let mut search_results = HashMap::new();
-        for function_def in &all_functions {
-            let db_results = self
-                .search_function_in_database(&function_def.name, project_name)
-                .await?;
-            if !db_results.is_empty() {
-                search_results.insert(function_def.name.clone(), db_results);
-            }
-        }
+        // 4. Search database based on function names, batched into IN queries
+        let names: Vec<&str> = all_functions.iter().map(|f| f.name.as_str()).collect();
+        let search_results = self
+            .search_functions_in_database(&names, project_name)
+            .await?;
 
         // 5. Save newly discovered functions to database
         self.save_functions_to_database(&all_functions, project_name)
@@ -225,12 +237,7 @@ impl CallRelationAnalyzer {
 
         let mut functions = Vec::new();
 
-        // Regular expression for Rust function definitions
-        let fn_regex = Regex::new(
-            r"(?m)^[\s]*(?:pub\s+)?(?:async\s+)?fn\s+(\w+)\s*(<[^>]*>)?\s*\(([^)]*)\)\s*(?:->\s*([^{]+))?\s*\{",
-        )?;
-
-        for captures in fn_regex.captures_iter(&content) {
+        for captures in RUST_FN_DEF_RE.captures_iter(&content) {
             let function_name = captures.get(1).unwrap().as_str();
             let generics = captures.get(2).map(|m| m.as_str()).unwrap_or("");
             let params_str = captures.get(3).unwrap().as_str();
@@ -345,13 +352,8 @@ impl CallRelationAnalyzer {
 
         let mut functions = Vec::new();
 
-        // Simple C/C++ function definition regular expression
-        let fn_regex = Regex::new(
-            r"(?m)^[\s]*(?:static\s+|extern\s+|inline\s+)*([a-zA-Z_][a-zA-Z0-9_*\s]+)\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\([^)]*\)\s*(?:\{|;)",
-        )?;
-
         for (line_num, line) in content.lines().enumerate() {
-            if let Some(captures) = fn_regex.captures(line) {
+            if let Some(captures) = C_FN_DEF_RE.captures(line) {
                 let return_type = captures.get(1).unwrap().as_str().trim();
                 let function_name = captures.get(2).unwrap().as_str();
 
@@ -407,73 +409,84 @@ impl CallRelationAnalyzer {
         parameters
     }
 
-    /// 在数据库中搜索函数
-    async fn search_function_in_database(
+    /// 在数据库中批量搜索函数，按函数名分组返回
+    async fn search_functions_in_database(
         &self,
-        function_name: &str,
+        function_names: &[&str],
         project_name: &str,
-    ) -> Result<Vec<FunctionDefinition>> {
-        debug!("在数据库中搜索函数: {}", function_name);
+    ) -> Result<HashMap<String, Vec<FunctionDefinition>>> {
+        debug!("在数据库中搜索 {} 个函数", function_names.len());
 
-        // 使用 DatabaseManager 的 search_interfaces_by_name 方法
-        match self
+        let mut unique_names: Vec<&str> = function_names.to_vec();
+        unique_names.sort_unstable();
+        unique_names.dedup();
+
+        // 使用 DatabaseManager 的 search_interfaces_by_names 方法
+        let results = match self
             .db_manager
-            .search_interfaces_by_name(function_name, Some(project_name))
+            .search_interfaces_by_names(&unique_names, Some(project_name))
             .await
         {
-            Ok(results) => {
-                let mut function_defs = Vec::new();
-                for interface in results {
-                    if interface.project_name == Some(project_name.to_string()) {
-                        // 将 InterfaceInfo 转换为 FunctionDefinition
-                        let parameters: Vec<Parameter> = interface
-                            .inputs
-                            .iter()
-                            .filter_map(|input| {
-                                if let (Some(name), Some(type_val)) =
-                                    (input.get("name"), input.get("type"))
-                                {
-                                    Some(Parameter {
-                                        name: name.as_str().unwrap_or("").to_string(),
-                                        r#type: type_val.as_str().unwrap_or("").to_string(),
-                                    })
-                                } else {
-                                    None
-                                }
-                            })
-                            .collect();
-
-                        let return_type = interface
-                            .outputs
-                            .first()
-                            .and_then(|output| output.get("type"))
-                            .and_then(|v| v.as_str())
-                            .unwrap_or("void")
-                            .to_string();
-
-                        let function_def = FunctionDefinition {
-                            name: interface.name.clone(),
-                            file_path: interface.file_path.clone(),
-                            line_number: 0, // InterfaceInfo doesn't have line number
-                            return_type: return_type.clone(),
-                            parameters,
-                            signature: format!("{} {}(...)", &return_type, interface.name),
-                            language: interface.language.clone(),
-                        };
-
-                        function_defs.push(function_def);
-                    }
-                }
-                Ok(function_defs)
-            }
+            Ok(results) => results,
             Err(e) => {
                 warn!("Database query failed: {}", e);
-                Ok(Vec::new())
+                return Ok(HashMap::new());
+            }
+        };
+
+        let mut function_defs: HashMap<String, Vec<FunctionDefinition>> = HashMap::new();
+        for interface in results {
+            if interface.project_name.as_deref() != Some(project_name) {
+                continue;
             }
+
+            // 将 InterfaceInfo 转换为 FunctionDefinition
+            let parameters: Vec<Parameter> = interface
+                .inputs
+                .iter()
+                .filter_map(|input| {
+                    if let (Some(name), Some(type_val)) = (input.get("name"), input.get("type")) {
+                        Some(Parameter {
+                            name: name.as_str().unwrap_or("").to_string(),
+                            r#type: type_val.as_str().unwrap_or("").to_string(),
+                        })
+                    } else {
+                        None
+                    }
+                })
+                .collect();
+
+            let return_type = interface
+                .outputs
+                .first()
+                .and_then(|output| output.get("type"))
+                .and_then(|v| v.as_str())
+                .unwrap_or("void")
+                .to_string();
+
+            let function_def = FunctionDefinition {
+                name: interface.name.clone(),
+                file_path: interface.file_path.clone(),
+                line_number: 0, // InterfaceInfo doesn't have line number
+                return_type: return_type.clone(),
+                parameters,
+                signature: format!("{} {}(...)", &return_type, interface.name),
+                language: interface.language.clone(),
+            };
+
+            function_defs
+                .entry(interface.name)
+                .or_default()
+                .push(function_def);
         }
+        Ok(function_defs)
     }
 
     /// Save functions to database
+    ///
+    /// All functions are flattened into one batch and written through
+    /// `batch_store_interfaces`, so vectors go to Qdrant in batched upserts
+    /// instead of one round trip per function.
     async fn save_functions_to_database(
         &self,
         functions: &[FunctionDefinition],
@@ -481,65 +494,49 @@ impl CallRelationAnalyzer {
     ) -> Result<()> {
         info!("Saving {} functions to database", functions.len());
 
-        for function in functions {
-            // Construct input parameters
-            let inputs: Vec<std::collections::HashMap<String, serde_json::Value>> = function
-                .parameters
-                .iter()
-                .map(|param| {
-                    let mut input_map = std::collections::HashMap::new();
-                    input_map.insert(
-                        "name".to_string(),
-                        serde_json::Value::String(param.name.clone()),
-                    );
-                    input_map.insert(
-                        "type".to_string(),
-                        serde_json::Value::String(param.r#type.clone()),
-                    );
-                    input_map
-                })
-                .collect();
+        if functions.is_empty() {
+            return Ok(());
+        }
 
-            // Construct output parameters
-            let outputs: Vec<std::collections::HashMap<String, serde_json::Value>> = vec![{
-                let mut output_map = std::collections::HashMap::new();
-                output_map.insert(
-                    "type".to_string(),
-                    serde_json::Value::String(function.return_type.clone()),
-                );
-                output_map
-            }];
-
-            // Use DatabaseManager's store_interface_with_vector method
-            // Since there's no vector data, we create an empty vector
-            let empty_vector = vec![0.0; 384]; // Assume vector dimension is 384
-
-            debug!("Saving function definition: {}", function.name);
-
-            match self
-                .db_manager
-                .store_interface_with_vector(
-                    &function.name,
-                    inputs,
-                    outputs,
-                    &function.file_path,
-                    &function.signature,
-                    empty_vector,
-                    Some(&function.language),
-                    Some(project_name),
-                    None,
-                )
-                .await
-            {
-                Ok((interface_id, vector_id)) => {
-                    debug!(
-                        "Function {} saved successfully, interface ID: {}, vector ID: {}",
-                        function.name, interface_id, vector_id
-                    );
-                }
-                Err(e) => {
-                    warn!("Failed to save function {}: {}", function.name, e);
-                }
+        // Since there's no vector data, every function shares the same empty vector
+        let empty_vector = serde_json::Value::from(vec![0.0f32; 384]); // Assume vector dimension is 384
+        let project = serde_json::Value::String(project_name.to_string());
+
+        let interfaces_data: Vec<HashMap<String, serde_json::Value>> = functions
+            .iter()
+            .map(|function| {
+                let inputs: Vec<serde_json::Value> = function
+                    .parameters
+                    .iter()
+                    .map(|param| serde_json::json!({ "name": param.name, "type": param.r#type }))
+                    .collect();
+
+                HashMap::from([
+                    ("name".to_string(), function.name.clone().into()),
+                    ("code".to_string(), function.signature.clone().into()),
+                    ("file_path".to_string(), function.file_path.clone().into()),
+                    ("language".to_string(), function.language.clone().into()),
+                    ("project_name".to_string(), project.clone()),
+                    ("vector".to_string(), empty_vector.clone()),
+                    ("inputs".to_string(), inputs.into()),
+                    (
+                        "outputs".to_string(),
+                        serde_json::json!([{ "type": function.return_type }]),
+                    ),
+                ])
+            })
+            .collect();
+
+        match self
+            .db_manager
+            .batch_store_interfaces(interfaces_data)
+            .await
+        {
+            Ok(stored) => {
+                debug!("Batch saved {} function definitions", stored.len());
+            }
+            Err(e) => {
+                warn!("Failed to batch save functions: {}", e);
             }
         }
 
@@ -555,14 +552,9 @@ impl CallRelationAnalyzer {
     ) -> String {
         let found_count = search_results.len();
         let total_count = all_functions.len();
-        let rust_count = all_functions
-            .iter()
-            .filter(|f| f.language == "rust")
-            .count();
-        let c_cpp_count = all_functions
-            .iter()
-            .filter(|f| f.language == "c_cpp")
-            .count();
+        let lang_counts = count_by_language(all_functions);
+        let rust_count = lang_counts.get("rust").copied().unwrap_or(0);
+        let c_cpp_count = lang_counts.get("c_cpp").copied().unwrap_or(0);
 
         format!(
             "Function search completed:\n- Total analyzed functions: {}\n- Database matched functions: {}\n- Rust functions: {}\n- C/C++ functions: {}\n- Match rate: {:.2}%",
@@ -758,13 +750,10 @@ impl CallRelationAnalyzer {
 
     /// Get function statistics by language in project
     pub fn get_function_statistics_by_language(&self) -> HashMap<String, usize> {
-        let mut stats = HashMap::new();
-
-        for function in self.function_definitions.values() {
-            *stats.entry(function.language.clone()).or_insert(0) += 1;
-        }
-
-        stats
+        count_by_language(self.function_definitions.values())
+            .into_iter()
+            .map(|(lang, count)| (lang.to_string(), count))
+            .collect()
     }
 
     /// Get function list by file path
@@ -798,7 +787,6 @@ impl CallRelationAnalyzer {
     /// Get project analysis report
     pub fn generate_analysis_report(&self, project_name: &str) -> String {
         let stats = self.get_statistics();
-        let lang_stats = self.get_function_statistics_by_language();
 
         let mut report = format!("# {} Project Analysis Report\n\n", project_name);
         report.push_str("## Function Statistics\n");
@@ -806,6 +794,13 @@ impl CallRelationAnalyzer {
         report.push_str(&format!("- Rust functions: {}\n", stats.rust_functions));
         report.push_str(&format!("- C/C++ functions: {}\n", stats.c_cpp_functions));
 
+        // Nothing was analyzed: the remaining sections would all be empty
+        if self.function_definitions.is_empty() && self.function_calls.is_empty() {
+            return report;
+        }
+
+        let lang_stats = self.get_function_statistics_by_language();
+
         report.push_str("\n## Distribution by Language\n");
         for (lang, count) in &lang_stats {
             report.push_str(&format!("- {}: {} functions\n", lang, count));
@@ -835,24 +830,31 @@ impl CallRelationAnalyzer {
 
     /// Get call relationship statistics
     pub fn get_statistics(&self) -> CallRelationStatistics {
+        let lang_counts = count_by_language(self.function_definitions.values());
+
         CallRelationStatistics {
             total_functions: self.function_definitions.len(),
             total_calls: self.function_calls.values().map(|calls| calls.len()).sum(),
             total_files: self.function_calls.len(),
-            rust_functions: self
-                .function_definitions
-                .values()
-                .filter(|func| func.language == "rust")
-                .count(),
-            c_cpp_functions: self
-                .function_definitions
-                .values()
-                .filter(|func| func.language == "c_cpp")
-                .count(),
+            rust_functions: lang_counts.get("rust").copied().unwrap_or(0),
+            c_cpp_functions: lang_counts.get("c_cpp").copied().unwrap_or(0),
         }
     }
 }
 
+/// Count function definitions per language in a single pass
+///
+/// Keys borrow from the definitions, so no string is cloned per function.
+fn count_by_language<'a>(
+    functions: impl IntoIterator<Item = &'a FunctionDefinition>,
+) -> HashMap<&'a str, usize> {
+    let mut counts = HashMap::new();
+    for function in functions {
+        *counts.entry(function.language.as_str()).or_insert(0) += 1;
+    }
+    counts
+}
+
 /// Call relationship statistics information
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct CallRelationStatistics {
@@ -977,16 +979,10 @@ fn private_function() {
         );
 
         // 测试统计功能
-        let rust_count = function_defs
-            .values()
-            .filter(|f| f.language == "rust")
-            .count();
-        let c_count = function_defs
-            .values()
-            .filter(|f| f.language == "c_cpp")
-            .count();
+        let counts = count_by_language(function_defs.values());
 
-        assert_eq!(rust_count, 1);
-        assert_eq!(c_count, 1);
+        assert_eq!(counts.get("rust"), Some(&1));
+        assert_eq!(counts.get("c_cpp"), Some(&1));
+        assert_eq!(counts.len(), 2);
     }
 }
@@ -4,7 +4,24 @@
 //! Each function does ONE thing: format data into readable text.
 
 use crate::types::{CallRelationship, FileDependency, FunctionInfo, InterfaceContext};
+use std::borrow::Cow;
 use std::collections::HashMap;
+use std::fmt::Write;
+use std::path::{Path, PathBuf};
+
+/// File name of a path, or the whole path when it has none
+fn base_name(path: &Path) -> Cow<'_, str> {
+    path.file_name()
+        .unwrap_or(path.as_os_str())
+        .to_string_lossy()
+}
+
+/// File name of an optional path, "unknown" when missing or not UTF-8
+fn optional_base_name(path: Option<&PathBuf>) -> &str {
+    path.and_then(|p| p.file_name())
+        .and_then(|n| n.to_str())
+        .unwrap_or("unknown")
+}
 
 /// Format file basic information
 pub fn format_file_info(file_info: &serde_json::Value) -> String {
@@ -37,14 +54,15 @@ pub fn format_defined_functions(functions: &[FunctionInfo]) -> String {
 
     let mut section = "## Functions defined in file\n".to_string();
     for func in functions {
-        section.push_str(&format!(
+        let _ = write!(
+            section,
             "\n### {} (line {})\n- Return type: {}\n- Function signature: `{}`\n- Parameters: {}\n",
             func.name,
             func.line_number.unwrap_or(0),
             func.return_type.as_deref().unwrap_or("unknown"),
             func.signature.as_deref().unwrap_or(&func.name),
             func.parameters.as_deref().unwrap_or("void")
-        ));
+        );
     }
     section
 }
@@ -61,12 +79,13 @@ pub fn format_call_relationships(relationships: &HashMap<String, Vec<CallRelatio
         if !internal_calls.is_empty() {
             section.push_str("### Internal file calls\n");
             for call in internal_calls {
-                section.push_str(&format!(
+                let _ = write!(
+                    section,
                     "- `{}` calls `{}` (line {})\n",
                     call.caller,
                     call.called,
                     call.line.unwrap_or(0)
-                ));
+                );
             }
         }
     }
@@ -75,19 +94,14 @@ pub fn format_call_relationships(relationships: &HashMap<String, Vec<CallRelatio
         if !external_calls.is_empty() {
             section.push_str("\n### External file calls\n");
             for call in external_calls {
-                let caller_file = call
-                    .caller_file
-                    .as_ref()
-                    .and_then(|p| p.file_name())
-                    .and_then(|n| n.to_str())
-                    .unwrap_or("unknown");
-                section.push_str(&format!(
+                let _ = write!(
+                    section,
                     "- `{}:{}` calls `{}` (line {})\n",
-                    caller_file,
+                    optional_base_name(call.caller_file.as_ref()),
                     call.caller,
                     call.called,
                     call.line.unwrap_or(0)
-                ));
+                );
             }
         }
     }
@@ -103,23 +117,13 @@ pub fn format_file_dependencies(dependencies: &[FileDependency]) -> String {
 
     let mut section = "## File dependencies\n".to_string();
     for dep in dependencies.iter().take(10) {
-        let source_file = dep
-            .from
-            .file_name()
-            .and_then(|n| n.to_str())
-            .map(|s| s.to_string())
-            .unwrap_or_else(|| dep.from.to_string_lossy().into_owned());
-        let target_file = dep
-            .to
-            .file_name()
-            .and_then(|n| n.to_str())
-            .map(|s| s.to_string())
-            .unwrap_or_else(|| dep.to.to_string_lossy().into_owned());
-
-        section.push_str(&format!(
+        let _ = write!(
+            section,
             "- `{}` → `{}` ({})\n",
-            source_file, target_file, dep.dependency_type
-        ));
+            base_name(&dep.from),
+            base_name(&dep.to),
+            dep.dependency_type
+        );
     }
     section
 }
@@ -132,34 +136,23 @@ pub fn format_interface_context(interfaces: &[InterfaceContext]) -> String {
 
     let mut section = "## Related interface information\n".to_string();
     for interface in interfaces.iter().take(5) {
-        let file_name = interface
-            .file_path
-            .file_name()
-            .and_then(|n| n.to_str())
-            .map(|s| s.to_string())
-            .unwrap_or_else(|| interface.file_path.to_string_lossy().into_owned());
-
-        section.push_str(&format!(
+        let _ = write!(
+            section,
             "\n### {}\n- File: {}\n- Language: {}\n",
-            interface.name, file_name, interface.language
-        ));
+            interface.name,
+            base_name(&interface.file_path),
+            interface.language
+        );
     }
     section
 }
 
 /// Format function definition
 pub fn format_function_definition(func_def: &FunctionInfo) -> String {
-    let file_name = func_def
-        .file_path
-        .file_name()
-        .and_then(|n| n.to_str())
-        .map(|s| s.to_string())
-        .unwrap_or_else(|| func_def.file_path.to_string_lossy().into_owned());
-
     format!(
         "## Function definition\n- Function name: {}\n- File: {}\n- Line number: {}\n- Return type: {}\n- Function signature: `{}`\n- Parameters: {}\n",
         func_def.name,
-        file_name,
+        base_name(&func_def.file_path),
         func_def.line_number.unwrap_or(0),
         func_def.return_type.as_deref().unwrap_or("unknown"),
         func_def.signature.as_deref().unwrap_or(&func_def.name),
@@ -175,19 +168,13 @@ pub fn format_function_callers(callers: &[CallRelationship]) -> String {
 
     let mut section = "## Locations calling this function\n".to_string();
     for caller in callers {
-        let caller_file = caller
-            .caller_file
-            .as_ref()
-            .and_then(|p| p.file_name())
-            .and_then(|n| n.to_str())
-            .unwrap_or("unknown");
-
-        section.push_str(&format!(
+        let _ = write!(
+            section,
             "- `{}:{}` (line {})\n",
-            caller_file,
+            optional_base_name(caller.caller_file.as_ref()),
             caller.caller,
             caller.line.unwrap_or(0)
-        ));
+        );
     }
     section
 }
@@ -200,19 +187,13 @@ pub fn format_function_callees(callees: &[CallRelationship]) -> String {
 
     let mut section = "## Other functions called by this function\n".to_string();
     for callee in callees {
-        let called_file = callee
-            .called_file
-            .as_ref()
-            .and_then(|p| p.file_name())
-            .and_then(|n| n.to_str())
-            .unwrap_or("unknown");
-
-        section.push_str(&format!(
+        let _ = write!(
+            section,
             "- `{}` in `{}` (line {})\n",
             callee.called,
-            called_file,
+            optional_base_name(callee.called_file.as_ref()),
             callee.line.unwrap_or(0)
-        ));
+        );
     }
     section
 }
@@ -232,9 +213,7 @@ pub fn build_file_prompt(file_path: &str, sections: &[String], conversion_guide:
         file_path
     );
 
-    let content = sections.join("\n");
-
-    format!("{}{}\n\n{}", header, content, conversion_guide)
+    assemble_prompt(header, sections, conversion_guide)
 }
 
 /// Build function conversion prompt
@@ -248,9 +227,23 @@ pub fn build_function_prompt(
         function_name
     );
 
-    let content = sections.join("\n");
+    assemble_prompt(header, sections, conversion_guide)
+}
+
+/// Append newline-joined sections and the conversion guide to the header in one buffer
+fn assemble_prompt(mut prompt: String, sections: &[String], conversion_guide: &str) -> String {
+    let sections_len: usize = sections.iter().map(|s| s.len() + 1).sum();
+    prompt.reserve(sections_len + 2 + conversion_guide.len());
 
-    format!("{}{}\n\n{}", header, content, conversion_guide)
+    for (i, section) in sections.iter().enumerate() {
+        if i > 0 {
+            prompt.push('\n');
+        }
+        prompt.push_str(section);
+    }
+    prompt.push_str("\n\n");
+    prompt.push_str(conversion_guide);
+    prompt
 }
 
 #[cfg(test)]
@@ -274,6 +267,14 @@ mod tests {
         assert!(result.contains("line 10"));
     }
 
+    #[test]
+    fn test_build_file_prompt_joins_sections() {
+        let sections = vec!["## A\n".to_string(), "## B\n".to_string()];
+        let prompt = build_file_prompt("demo.c", &sections, "guide");
+        assert!(prompt.contains("Converting file: **demo.c**"));
+        assert!(prompt.ends_with("## A\n\n## B\n\n\nguide"));
+    }
+
     #[test]
     fn test_format_empty_functions() {
         let result = format_defined_functions(&[]);
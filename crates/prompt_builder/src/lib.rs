@@ -14,14 +14,18 @@ pub mod query;
 pub mod types;
 
 // Re-export commonly used types
-pub use types::{CallRelationship, FileDependency, FileMapping, FunctionInfo, InterfaceContext};
+pub use types::{
+    CallRelationship, FileDependency, FileMapping, FileOverview, FunctionInfo, InterfaceContext,
+};
 
 use anyhow::Result;
 use db_services::DatabaseManager;
 use log::{debug, info, warn};
 use std::collections::HashMap;
 use std::path::{Path, PathBuf};
+use std::sync::Mutex;
 use tokio::fs;
+use tokio::sync::OnceCell;
 
 /// Prompt builder for generating context-aware prompts based on relational data
 pub struct PromptBuilder<'a> {
@@ -29,8 +33,13 @@ pub struct PromptBuilder<'a> {
     project_name: String,
     file_mappings: HashMap<PathBuf, PathBuf>, // cached_path -> original_path
     reverse_mappings: HashMap<PathBuf, PathBuf>, // original_path -> cached_path
+    name_index: HashMap<String, PathBuf>,     // cached or original file name -> original_path
     error_context: Vec<String>,
     prompt_loader: prompt_loader::PromptLoader,
+    function_definitions: Mutex<HashMap<String, Option<FunctionInfo>>>, // memoized lookups
+    file_overviews: Mutex<HashMap<PathBuf, FileOverview>>,              // memoized lookups
+    file_guide: OnceCell<String>,     // file conversion guide, read once
+    function_guide: OnceCell<String>, // function conversion guide, read once
 }
 
 impl<'a> PromptBuilder<'a> {
@@ -45,8 +54,13 @@ impl<'a> PromptBuilder<'a> {
             project_name,
             file_mappings: HashMap::new(),
             reverse_mappings: HashMap::new(),
+            name_index: HashMap::new(),
             error_context: Vec::new(),
             prompt_loader: prompt_loader::PromptLoader::default()?,
+            function_definitions: Mutex::new(HashMap::new()),
+            file_overviews: Mutex::new(HashMap::new()),
+            file_guide: OnceCell::new(),
+            function_guide: OnceCell::new(),
         };
 
         if let Some(dir) = indices_dir.as_ref() {
@@ -72,6 +86,51 @@ impl<'a> PromptBuilder<'a> {
         file_path: &Path,
         target_functions: Option<Vec<String>>,
     ) -> Result<String> {
+        let sections = self
+            .file_context_sections(file_path, target_functions)
+            .await;
+        let conversion_guide = self.file_conversion_guide().await;
+        let full_prompt = formatter::build_file_prompt(
+            Self::display_name(file_path),
+            &sections,
+            conversion_guide,
+        );
+
+        info!(
+            "Successfully built prompt with {} context sections",
+            sections.len()
+        );
+        Ok(full_prompt)
+    }
+
+    /// Build context prompt for a specific file without the conversion guide
+    ///
+    /// For callers that already send the guide as their system prompt: the guide is
+    /// not paid for twice, and the static system prompt stays the shared prefix that
+    /// providers can cache across requests.
+    pub async fn build_file_context(
+        &self,
+        file_path: &Path,
+        target_functions: Option<Vec<String>>,
+    ) -> Result<String> {
+        let sections = self
+            .file_context_sections(file_path, target_functions)
+            .await;
+        let context = formatter::build_file_prompt(Self::display_name(file_path), &sections, "");
+
+        info!(
+            "Successfully built context with {} sections",
+            sections.len()
+        );
+        Ok(context)
+    }
+
+    /// Gather the per-file context sections from the database
+    async fn file_context_sections(
+        &self,
+        file_path: &Path,
+        target_functions: Option<Vec<String>>,
+    ) -> Vec<String> {
         let original_path = self.resolve_path_for_query(file_path);
         info!(
             "Building context prompt for file {} (original: {})",
@@ -81,17 +140,12 @@ impl<'a> PromptBuilder<'a> {
 
         let mut sections = Vec::new();
 
-        // 1. File basic info
-        if let Ok(file_info) =
-            query::get_file_basic_info(self.db_manager, &original_path, &self.project_name).await
-        {
-            sections.push(formatter::format_file_info(&file_info));
-        }
-
-        // 2. Defined functions
-        if let Ok(functions) = query::get_defined_functions(self.db_manager, &original_path).await {
-            if !functions.is_empty() {
-                sections.push(formatter::format_defined_functions(&functions));
+        // 1. File basic info and 2. defined functions, fetched in one query
+        let overview = self.file_overview(&original_path).await.ok();
+        if let Some(overview) = &overview {
+            sections.push(formatter::format_file_info(&overview.file_info));
+            if !overview.functions.is_empty() {
+                sections.push(formatter::format_defined_functions(&overview.functions));
             }
         }
 
@@ -133,12 +187,10 @@ impl<'a> PromptBuilder<'a> {
             }
         }
 
-        // 5. Interface context
-        if let Ok(interfaces) =
-            query::get_interface_context(self.db_manager, &original_path, &self.project_name).await
-        {
-            if !interfaces.is_empty() {
-                sections.push(formatter::format_interface_context(&interfaces));
+        // 5. Interface context, read along with the file overview
+        if let Some(overview) = &overview {
+            if !overview.interfaces.is_empty() {
+                sections.push(formatter::format_interface_context(&overview.interfaces));
             }
         }
 
@@ -149,29 +201,31 @@ impl<'a> PromptBuilder<'a> {
             }
         }
 
-        // 7. Load conversion guide and build final prompt
-        let conversion_guide = self
-            .prompt_loader
-            .load_file_conversion_prompt()
-            .await
-            .unwrap_or_else(|_| {
-                String::from(
-                    "# Conversion Guide Rules\nPlease follow standard C to Rust conversion rules.",
-                )
-            });
+        sections
+    }
 
-        let display_name = file_path
+    /// File name shown in the prompt header
+    fn display_name(file_path: &Path) -> &str {
+        file_path
             .file_name()
             .and_then(|n| n.to_str())
-            .unwrap_or_else(|| file_path.to_str().unwrap_or(""));
-
-        let full_prompt = formatter::build_file_prompt(display_name, &sections, &conversion_guide);
+            .unwrap_or_else(|| file_path.to_str().unwrap_or(""))
+    }
 
-        info!(
-            "Successfully built prompt with {} context sections",
-            sections.len()
-        );
-        Ok(full_prompt)
+    /// File conversion guide, read from disk on first use only
+    async fn file_conversion_guide(&self) -> &str {
+        self.file_guide
+            .get_or_init(|| async {
+                self.prompt_loader
+                    .load_file_conversion_prompt()
+                    .await
+                    .unwrap_or_else(|_| {
+                        String::from(
+                            "# Conversion Guide Rules\nPlease follow standard C to Rust conversion rules.",
+                        )
+                    })
+            })
+            .await
     }
 
     /// Build context prompt for a specific function
@@ -186,9 +240,7 @@ impl<'a> PromptBuilder<'a> {
         let mut sections = Vec::new();
 
         // 1. Function definition
-        if let Ok(Some(func_def)) =
-            query::get_function_definition(self.db_manager, function_name).await
-        {
+        if let Ok(Some(func_def)) = self.function_definition(function_name).await {
             sections.push(formatter::format_function_definition(&func_def));
         }
 
@@ -231,19 +283,23 @@ impl<'a> PromptBuilder<'a> {
             }
         }
 
-        // 5. Load function conversion guide
+        // 5. Function conversion guide, read from disk on first use only
         let conversion_guide = self
-            .prompt_loader
-            .load_function_conversion_prompt()
-            .await
-            .unwrap_or_else(|_| {
-                String::from(
-                    "# Function Conversion Guide\nPlease follow standard conversion rules.",
-                )
-            });
+            .function_guide
+            .get_or_init(|| async {
+                self.prompt_loader
+                    .load_function_conversion_prompt()
+                    .await
+                    .unwrap_or_else(|_| {
+                        String::from(
+                            "# Function Conversion Guide\nPlease follow standard conversion rules.",
+                        )
+                    })
+            })
+            .await;
 
         let full_prompt =
-            formatter::build_function_prompt(function_name, &sections, &conversion_guide);
+            formatter::build_function_prompt(function_name, &sections, conversion_guide);
 
         info!(
             "Successfully built function prompt with {} sections",
@@ -252,8 +308,90 @@ impl<'a> PromptBuilder<'a> {
         Ok(full_prompt)
     }
 
+    /// Build context prompts for several functions, keyed by function name
+    ///
+    /// Looks up all function definitions not fetched before in one batched query,
+    /// then builds each prompt as [`Self::build_function_context_prompt`] does.
+    pub async fn build_function_context_prompts(
+        &self,
+        function_names: &[&str],
+        include_callers: bool,
+        include_callees: bool,
+    ) -> Result<HashMap<String, String>> {
+        self.prefetch_function_definitions(function_names).await?;
+
+        let mut prompts = HashMap::with_capacity(function_names.len());
+        for &function_name in function_names {
+            let prompt = self
+                .build_function_context_prompt(function_name, include_callers, include_callees)
+                .await?;
+            prompts.insert(function_name.to_string(), prompt);
+        }
+        Ok(prompts)
+    }
+
     // ===== Internal helper methods =====
 
+    /// Look up a file's basic info and defined functions, reusing earlier results
+    ///
+    /// Every retry of a file rebuilds its context prompt, so the overview query
+    /// only needs to hit the database once per file. A failed query is not
+    /// memoized, so the next retry asks again.
+    async fn file_overview(&self, original_path: &Path) -> Result<FileOverview> {
+        if let Some(cached) = self.file_overviews.lock().unwrap().get(original_path) {
+            return Ok(cached.clone());
+        }
+
+        let overview =
+            query::get_file_overview(self.db_manager, original_path, &self.project_name).await?;
+        self.file_overviews
+            .lock()
+            .unwrap()
+            .insert(original_path.to_path_buf(), overview.clone());
+        Ok(overview)
+    }
+
+    /// Look up a function definition, reusing earlier results for this builder
+    ///
+    /// Retry loops rebuild the same function prompt with extra error context,
+    /// so the definition query only needs to hit the database once. Found and
+    /// missing definitions are memoized; a failed query is not.
+    async fn function_definition(&self, function_name: &str) -> Result<Option<FunctionInfo>> {
+        if let Some(cached) = self.function_definitions.lock().unwrap().get(function_name) {
+            return Ok(cached.clone());
+        }
+
+        let func_def = query::get_function_definition(self.db_manager, function_name).await?;
+        self.function_definitions
+            .lock()
+            .unwrap()
+            .insert(function_name.to_string(), func_def.clone());
+        Ok(func_def)
+    }
+
+    /// Fill the function definition memo for all names not looked up yet
+    async fn prefetch_function_definitions(&self, function_names: &[&str]) -> Result<()> {
+        let missing: Vec<&str> = {
+            let cached = self.function_definitions.lock().unwrap();
+            let mut missing: Vec<&str> = function_names
+                .iter()
+                .copied()
+                .filter(|name| !cached.contains_key(*name))
+                .collect();
+            missing.sort_unstable();
+            missing.dedup();
+            missing
+        };
+        if missing.is_empty() {
+            return Ok(());
+        }
+
+        // Names from a failed batch are left out and looked up again one by one
+        let found = query::get_function_definitions(self.db_manager, &missing).await?;
+        self.function_definitions.lock().unwrap().extend(found);
+        Ok(())
+    }
+
     /// Load file mappings from indices directory
     async fn load_file_mappings(&mut self, indices_dir: &Path) -> Result<()> {
         // Build a robust candidate list:
@@ -320,6 +458,15 @@ impl<'a> PromptBuilder<'a> {
                     }
                 }
             }
+
+            // Index file names once so filename lookups don't re-parse every mapping per query
+            for (cached, orig) in &self.file_mappings {
+                for name in [cached.file_name(), orig.file_name()].into_iter().flatten() {
+                    self.name_index
+                        .entry(name.to_string_lossy().into_owned())
+                        .or_insert_with(|| orig.clone());
+                }
+            }
             info!("Loaded {} file mappings", self.file_mappings.len());
         } else {
             warn!(
@@ -359,12 +506,8 @@ impl<'a> PromptBuilder<'a> {
 
         // 1) Filename-based exact match as a quick fallback
         let input_name = file_path.file_name().and_then(|n| n.to_str()).unwrap_or("");
-        for (cached, orig) in &self.file_mappings {
-            let cached_name = cached.file_name().and_then(|n| n.to_str()).unwrap_or("");
-            let orig_name = orig.file_name().and_then(|n| n.to_str()).unwrap_or("");
-            if cached_name == input_name || orig_name == input_name {
-                return orig.clone();
-            }
+        if let Some(orig) = self.name_index.get(input_name) {
+            return orig.clone();
         }
 
         // 2) Stem-based robust matching to bridge individual_files/paired_files and .c/.h variants
@@ -423,7 +566,7 @@ impl<'a> PromptBuilder<'a> {
             "Could not resolve path mapping for: {}",
             file_path.display()
         );
-        // Fall back to using the input file name only; DB queries use LIKE on filename so this still helps
+        // Fall back to using the input file name only; DB queries also match on file name so this still helps
         if !input_name.is_empty() {
             return PathBuf::from(input_name);
         }
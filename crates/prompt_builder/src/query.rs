@@ -3,14 +3,35 @@
 //! All the get_* database query methods extracted from PromptBuilder.
 //! Pure data access layer - no formatting, no business logic.
 
-use crate::types::{CallRelationship, FileDependency, FunctionInfo, InterfaceContext};
+use crate::types::{
+    CallRelationship, FileDependency, FileOverview, FunctionInfo, InterfaceContext,
+};
 use anyhow::Result;
 use db_services::DatabaseManager;
 use log::{debug, warn};
 use serde_json::json;
-use std::collections::HashMap;
+use std::collections::{HashMap, HashSet};
 use std::path::{Path, PathBuf};
 
+/// Function names bound per `IN (...)` query, well under SQLite's 999-parameter limit
+const MAX_NAMES_PER_QUERY: usize = 500;
+
+/// Interfaces listed in a file's prompt context
+const MAX_PROMPT_INTERFACES: usize = 10;
+
+/// File name used to match code entries, empty when it is not valid UTF-8
+fn base_name(file_path: &Path) -> &str {
+    file_path.file_name().and_then(|n| n.to_str()).unwrap_or("")
+}
+
+/// Parameters for the `(file_path = ? OR file_name = ?)` filter shared by the file queries
+fn file_match_params(file_path: &Path) -> Vec<serde_json::Value> {
+    vec![
+        serde_json::Value::String(file_path.to_string_lossy().into_owned()),
+        serde_json::Value::String(base_name(file_path).to_owned()),
+    ]
+}
+
 /// Get file basic information from database
 pub async fn get_file_basic_info(
     db_manager: &DatabaseManager,
@@ -19,21 +40,16 @@ pub async fn get_file_basic_info(
 ) -> Result<serde_json::Value> {
     debug!("Getting file basic info for: {}", file_path.display());
 
-    let file_name = file_path.file_name().and_then(|n| n.to_str()).unwrap_or("");
-
     let query = r#"
         SELECT file_path, language, project, COUNT(*) AS entry_count
         FROM code_entries
-        WHERE (file_path = ? OR file_path LIKE ?)
+        WHERE (file_path = ? OR file_name = ?)
         GROUP BY file_path, language, project
         ORDER BY entry_count DESC
         LIMIT 1
     "#;
 
-    let params = vec![
-        json!(file_path.to_string_lossy().to_string()),
-        json!(format!("%{}", file_name)),
-    ];
+    let params = file_match_params(file_path);
 
     match db_manager.execute_raw_query(query, params).await {
         Ok(results) => {
@@ -45,22 +61,12 @@ pub async fn get_file_basic_info(
                     "interface_count": row.get("entry_count").unwrap_or(&json!(0))
                 }))
             } else {
-                Ok(json!({
-                    "file_path": file_path.to_string_lossy().to_string(),
-                    "language": "c",
-                    "project_name": project_name,
-                    "interface_count": 0
-                }))
+                Ok(default_file_info(file_path, project_name))
             }
         }
         Err(e) => {
             warn!("Failed to get file basic info: {}", e);
-            Ok(json!({
-                "file_path": file_path.to_string_lossy().to_string(),
-                "language": "c",
-                "project_name": project_name,
-                "interface_count": 0
-            }))
+            Ok(default_file_info(file_path, project_name))
         }
     }
 }
@@ -72,90 +78,23 @@ pub async fn get_defined_functions(
 ) -> Result<Vec<FunctionInfo>> {
     debug!("Getting defined functions for: {}", file_path.display());
 
-    let file_name = file_path.file_name().and_then(|n| n.to_str()).unwrap_or("");
-
     let query = r#"
         SELECT ce.file_path AS file_path, ce.function_name AS function_name, ar.result AS result_json
         FROM analysis_results ar
         JOIN code_entries ce ON ce.id = ar.code_id
         WHERE ar.analysis_type = 'function_definition'
-          AND (ce.file_path = ? OR ce.file_path LIKE ?)
+          AND (ce.file_path = ? OR ce.file_name = ?)
         ORDER BY ce.updated_at DESC
     "#;
 
-    let params = vec![
-        json!(file_path.to_string_lossy().to_string()),
-        json!(format!("%{}", file_name)),
-    ];
+    let params = file_match_params(file_path);
 
     match db_manager.execute_raw_query(query, params).await {
         Ok(results) => {
-            let mut functions: Vec<FunctionInfo> = Vec::new();
-            for row in results {
-                let file_path_val = row
-                    .get("file_path")
-                    .and_then(|v| v.as_str())
-                    .unwrap_or("")
-                    .to_string();
-
-                let result_json = row
-                    .get("result_json")
-                    .and_then(|v| v.as_str())
-                    .unwrap_or("{}");
-
-                let parsed: serde_json::Value =
-                    serde_json::from_str(result_json).unwrap_or(json!({}));
-                let name = parsed.get("name").and_then(|v| v.as_str()).unwrap_or(
-                    row.get("function_name")
-                        .and_then(|v| v.as_str())
-                        .unwrap_or("unknown"),
-                );
-                let line = parsed
-                    .get("line")
-                    .and_then(|v| v.as_i64())
-                    .map(|v| v as i32);
-                let return_type = parsed
-                    .get("return_type")
-                    .and_then(|v| v.as_str())
-                    .map(|s| s.to_string());
-
-                let parameters_str =
-                    parsed
-                        .get("parameters")
-                        .and_then(|v| v.as_array())
-                        .map(|arr| {
-                            let parts: Vec<String> = arr
-                                .iter()
-                                .map(|p| {
-                                    let t = p
-                                        .get("type")
-                                        .or_else(|| p.get("r#type"))
-                                        .and_then(|v| v.as_str())
-                                        .unwrap_or("?");
-                                    let n =
-                                        p.get("name").and_then(|v| v.as_str()).unwrap_or("param");
-                                    format!("{} {}", t, n)
-                                })
-                                .collect();
-                            parts.join(", ")
-                        });
-
-                let signature = Some(format!(
-                    "{} {}({})",
-                    return_type.as_deref().unwrap_or("void"),
-                    name,
-                    parameters_str.as_deref().unwrap_or("")
-                ));
-
-                functions.push(FunctionInfo {
-                    name: name.to_string(),
-                    file_path: PathBuf::from(file_path_val),
-                    line_number: line,
-                    return_type,
-                    parameters: parameters_str,
-                    signature,
-                });
-            }
+            let functions: Vec<FunctionInfo> = results
+                .iter()
+                .map(|row| function_info_from_row(row, "unknown"))
+                .collect();
 
             debug!("Found {} defined functions", functions.len());
             Ok(functions)
@@ -167,6 +106,174 @@ pub async fn get_defined_functions(
     }
 }
 
+/// Get file basic information, defined functions and interfaces with a single query
+///
+/// Covers what [`get_file_basic_info`], [`get_defined_functions`] and
+/// [`get_interface_context`] each fetch, but reads the file's code entries and
+/// their function definitions in one database round trip. A failed query is
+/// returned as an error rather than a default overview, so it is not memoized.
+pub async fn get_file_overview(
+    db_manager: &DatabaseManager,
+    file_path: &Path,
+    project_name: &str,
+) -> Result<FileOverview> {
+    debug!("Getting file overview for: {}", file_path.display());
+
+    let query = r#"
+        SELECT ce.id AS id, ce.file_path AS file_path, ce.language AS language,
+               ce.project AS project, ce.function_name AS function_name, ar.result AS result_json
+        FROM code_entries ce
+        LEFT JOIN analysis_results ar
+          ON ar.code_id = ce.id AND ar.analysis_type = 'function_definition'
+        WHERE (ce.file_path = ? OR ce.file_name = ?)
+        ORDER BY ce.updated_at DESC
+    "#;
+
+    let params = file_match_params(file_path);
+
+    let results = match db_manager.execute_raw_query(query, params).await {
+        Ok(results) => results,
+        Err(e) => {
+            warn!("Failed to get file overview: {}", e);
+            return Err(e);
+        }
+    };
+
+    // Count distinct entries per (file_path, language, project), as GROUP BY would
+    let mut groups: HashMap<(&str, &str, &str), HashSet<&str>> = HashMap::new();
+    let mut functions = Vec::new();
+    let mut interface_ids = HashSet::new();
+    let mut interfaces = Vec::new();
+    for row in &results {
+        let column = |name: &str| row.get(name).and_then(|v| v.as_str()).unwrap_or("");
+        groups
+            .entry((column("file_path"), column("language"), column("project")))
+            .or_default()
+            .insert(column("id"));
+
+        if row.get("result_json").is_some_and(|v| v.is_string()) {
+            functions.push(function_info_from_row(row, "unknown"));
+        }
+
+        // Interfaces are this project's unnamed entries (structs and the like),
+        // as the `function_name = ''` search in get_interface_context finds them;
+        // the join can repeat an entry
+        let unnamed = row.get("function_name").and_then(|v| v.as_str()) == Some("");
+        if unnamed
+            && column("project") == project_name
+            && interface_ids.insert(column("id"))
+            && interfaces.len() < MAX_PROMPT_INTERFACES
+        {
+            interfaces.push(InterfaceContext {
+                name: column("function_name").to_string(),
+                file_path: PathBuf::from(column("file_path")),
+                language: column("language").to_string(),
+                inputs: Vec::new(),
+                outputs: Vec::new(),
+            });
+        }
+    }
+
+    let file_info = groups
+        .into_iter()
+        .max_by_key(|(_, ids)| ids.len())
+        .map(|((path, language, project), ids)| {
+            json!({
+                "file_path": path,
+                "language": language,
+                "project_name": project,
+                "interface_count": ids.len()
+            })
+        })
+        .unwrap_or_else(|| default_file_info(file_path, project_name));
+
+    debug!(
+        "Found {} defined functions and {} interfaces",
+        functions.len(),
+        interfaces.len()
+    );
+    Ok(FileOverview {
+        file_info,
+        functions,
+        interfaces,
+    })
+}
+
+/// File information used when the database has no entries for the file
+fn default_file_info(file_path: &Path, project_name: &str) -> serde_json::Value {
+    json!({
+        "file_path": file_path.to_string_lossy().to_string(),
+        "language": "c",
+        "project_name": project_name,
+        "interface_count": 0
+    })
+}
+
+/// Build a FunctionInfo from a row with file_path, function_name and result_json columns
+fn function_info_from_row(
+    row: &HashMap<String, serde_json::Value>,
+    default_name: &str,
+) -> FunctionInfo {
+    let file_path_val = row
+        .get("file_path")
+        .and_then(|v| v.as_str())
+        .unwrap_or("")
+        .to_string();
+    let result_json = row
+        .get("result_json")
+        .and_then(|v| v.as_str())
+        .unwrap_or("{}");
+    let parsed: serde_json::Value = serde_json::from_str(result_json).unwrap_or(json!({}));
+    let name = parsed.get("name").and_then(|v| v.as_str()).unwrap_or(
+        row.get("function_name")
+            .and_then(|v| v.as_str())
+            .unwrap_or(default_name),
+    );
+    let line = parsed
+        .get("line")
+        .and_then(|v| v.as_i64())
+        .map(|v| v as i32);
+    let return_type = parsed
+        .get("return_type")
+        .and_then(|v| v.as_str())
+        .map(|s| s.to_string());
+
+    let parameters_str = parsed
+        .get("parameters")
+        .and_then(|v| v.as_array())
+        .map(|arr| {
+            let parts: Vec<String> = arr
+                .iter()
+                .map(|p| {
+                    let t = p
+                        .get("type")
+                        .or_else(|| p.get("r#type"))
+                        .and_then(|v| v.as_str())
+                        .unwrap_or("?");
+                    let n = p.get("name").and_then(|v| v.as_str()).unwrap_or("param");
+                    format!("{} {}", t, n)
+                })
+                .collect();
+            parts.join(", ")
+        });
+
+    let signature = Some(format!(
+        "{} {}({})",
+        return_type.as_deref().unwrap_or("void"),
+        name,
+        parameters_str.as_deref().unwrap_or("")
+    ));
+
+    FunctionInfo {
+        name: name.to_string(),
+        file_path: PathBuf::from(file_path_val),
+        line_number: line,
+        return_type,
+        parameters: parameters_str,
+        signature,
+    }
+}
+
 /// Get call relationships for the file
 pub async fn get_call_relationships(
     _db_manager: &DatabaseManager,
@@ -191,6 +298,8 @@ pub async fn get_file_dependencies(
 }
 
 /// Get function definition
+///
+/// `Ok(None)` means the function has no code entry; a failed query is an error.
 pub async fn get_function_definition(
     db_manager: &DatabaseManager,
     function_name: &str,
@@ -211,77 +320,78 @@ pub async fn get_function_definition(
     match db_manager.execute_raw_query(query, params).await {
         Ok(results) => {
             if let Some(row) = results.first() {
-                let file_path_val = row
-                    .get("file_path")
-                    .and_then(|v| v.as_str())
-                    .unwrap_or("")
-                    .to_string();
-                let result_json = row
-                    .get("result_json")
-                    .and_then(|v| v.as_str())
-                    .unwrap_or("{}");
-                let parsed: serde_json::Value =
-                    serde_json::from_str(result_json).unwrap_or(json!({}));
-                let name = parsed
-                    .get("name")
-                    .and_then(|v| v.as_str())
-                    .unwrap_or(function_name);
-                let line = parsed
-                    .get("line")
-                    .and_then(|v| v.as_i64())
-                    .map(|v| v as i32);
-                let return_type = parsed
-                    .get("return_type")
-                    .and_then(|v| v.as_str())
-                    .map(|s| s.to_string());
-
-                let parameters_str =
-                    parsed
-                        .get("parameters")
-                        .and_then(|v| v.as_array())
-                        .map(|arr| {
-                            let parts: Vec<String> = arr
-                                .iter()
-                                .map(|p| {
-                                    let t = p
-                                        .get("type")
-                                        .or_else(|| p.get("r#type"))
-                                        .and_then(|v| v.as_str())
-                                        .unwrap_or("?");
-                                    let n =
-                                        p.get("name").and_then(|v| v.as_str()).unwrap_or("param");
-                                    format!("{} {}", t, n)
-                                })
-                                .collect();
-                            parts.join(", ")
-                        });
-
-                let signature = Some(format!(
-                    "{} {}({})",
-                    return_type.as_deref().unwrap_or("void"),
-                    name,
-                    parameters_str.as_deref().unwrap_or("")
-                ));
-
-                Ok(Some(FunctionInfo {
-                    name: name.to_string(),
-                    file_path: PathBuf::from(file_path_val),
-                    line_number: line,
-                    return_type,
-                    parameters: parameters_str,
-                    signature,
-                }))
+                Ok(Some(function_info_from_row(row, function_name)))
             } else {
                 Ok(None)
             }
         }
         Err(e) => {
             warn!("Failed to get function definition: {}", e);
-            Ok(None)
+            Err(e)
         }
     }
 }
 
+/// Get the definitions of several functions with batched queries
+///
+/// Same lookup as [`get_function_definition`], but for many names at once:
+/// one `IN (...)` query per batch instead of one query per function. Names
+/// without a code entry map to `None`; names from a batch whose query failed
+/// are absent, so a failed lookup is not mistaken for a missing definition.
+pub async fn get_function_definitions(
+    db_manager: &DatabaseManager,
+    function_names: &[&str],
+) -> Result<HashMap<String, Option<FunctionInfo>>> {
+    debug!(
+        "Getting function definitions for {} names",
+        function_names.len()
+    );
+
+    let mut definitions = HashMap::new();
+    for names in function_names.chunks(MAX_NAMES_PER_QUERY) {
+        let query = format!(
+            r#"
+        SELECT ce.file_path AS file_path, ce.function_name AS function_name, ar.result AS result_json
+        FROM code_entries ce
+        LEFT JOIN analysis_results ar ON ar.code_id = ce.id AND ar.analysis_type = 'function_definition'
+        WHERE ce.function_name IN ({})
+        ORDER BY ce.updated_at DESC
+    "#,
+            vec!["?"; names.len()].join(", ")
+        );
+        let params = names.iter().map(|name| json!(name)).collect();
+
+        let results = match db_manager.execute_raw_query(&query, params).await {
+            Ok(results) => results,
+            Err(e) => {
+                warn!("Failed to get function definitions: {}", e);
+                continue;
+            }
+        };
+
+        for &name in names {
+            definitions.insert(name.to_string(), None);
+        }
+        // Rows are newest first; keep the first one per name, as LIMIT 1 would
+        for row in &results {
+            let Some(name) = row.get("function_name").and_then(|v| v.as_str()) else {
+                continue;
+            };
+            if let Some(slot) = definitions.get_mut(name) {
+                if slot.is_none() {
+                    *slot = Some(function_info_from_row(row, name));
+                }
+            }
+        }
+    }
+
+    debug!(
+        "Found {} function definitions",
+        definitions.values().filter(|d| d.is_some()).count()
+    );
+    Ok(definitions)
+}
+
 /// Get function callers
 pub async fn get_function_callers(
     _db_manager: &DatabaseManager,
@@ -312,20 +422,22 @@ pub async fn get_interface_context(
 ) -> Result<Vec<InterfaceContext>> {
     debug!("Getting interface context for: {}", file_path.display());
 
-    let file_name = file_path.file_name().and_then(|n| n.to_str()).unwrap_or("");
+    let file_name = base_name(file_path);
 
     let interfaces = db_manager
         .search_interfaces_by_name("", Some(project_name))
         .await?;
 
+    let full_path = file_path.to_string_lossy();
     let mut relevant_interfaces = Vec::new();
     for interface in interfaces {
-        let interface_file = Path::new(&interface.file_path)
-            .file_name()
-            .and_then(|n| n.to_str())
-            .unwrap_or("");
+        // Limit to avoid overwhelming prompts; stop before converting entries we would drop
+        if relevant_interfaces.len() == MAX_PROMPT_INTERFACES {
+            break;
+        }
+        let interface_file = base_name(Path::new(&interface.file_path));
 
-        if file_path.to_string_lossy() == interface.file_path || file_name == interface_file {
+        if full_path == interface.file_path || file_name == interface_file {
             relevant_interfaces.push(InterfaceContext {
                 name: interface.name,
                 file_path: PathBuf::from(interface.file_path),
@@ -344,9 +456,6 @@ pub async fn get_interface_context(
         }
     }
 
-    // Limit to avoid overwhelming prompts
-    relevant_interfaces.truncate(10);
-
     debug!("Found {} relevant interfaces", relevant_interfaces.len());
     Ok(relevant_interfaces)
 }
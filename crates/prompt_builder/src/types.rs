@@ -50,3 +50,11 @@ pub struct InterfaceContext {
     pub inputs: Vec<String>,
     pub outputs: Vec<String>,
 }
+
+/// File-level context read from the database in one query
+#[derive(Debug, Clone, Serialize, Deserialize)]
+pub struct FileOverview {
+    pub file_info: serde_json::Value,
+    pub functions: Vec<FunctionInfo>,
+    pub interfaces: Vec<InterfaceContext>,
+}
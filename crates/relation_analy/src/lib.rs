@@ -1,10 +1,12 @@
 use anyhow::{Context, Result};
 use regex::Regex;
 use serde::{Deserialize, Serialize};
+use sha2::{Digest, Sha256};
 use std::collections::{BTreeMap, BTreeSet};
-use std::fs;
+use std::fs::{self, File};
+use std::io::{BufWriter, Write};
 use std::path::{Path, PathBuf};
-use walkdir::WalkDir;
+use walkdir::{DirEntry, WalkDir};
 
 /// Dependency graph node: a C/C++ source file or header file
 #[derive(Debug, Clone, Serialize, Deserialize, PartialEq, Eq)]
@@ -14,6 +16,12 @@ pub struct FileNode {
     pub local_includes: BTreeSet<PathBuf>,
     /// Directly dependent system/third-party headers (through angle bracket includes or unresolvable quoted includes)
     pub system_includes: BTreeSet<String>,
+    /// Hex SHA-256 of the file content the node was built from, used to skip unchanged files on re-runs
+    #[serde(default, skip_serializing_if = "Option::is_none")]
+    pub content_hash: Option<String>,
+    /// Quoted include targets as written, re-resolved before a node is reused
+    #[serde(default, skip_serializing_if = "BTreeSet::is_empty")]
+    pub quoted_includes: BTreeSet<String>,
 }
 
 /// Project-level dependency information (from compile_commands.json)
@@ -36,6 +44,30 @@ pub struct RelationFile {
     pub generated_at: String,
 }
 
+/// Whether a directory below the workspace root is pruned from the source scan:
+/// hidden directories (VCS metadata, tool caches) and cargo `target` output
+fn is_skipped_dir(entry: &DirEntry) -> bool {
+    entry.depth() > 0
+        && entry.file_type().is_dir()
+        && entry
+            .file_name()
+            .to_str()
+            .is_some_and(|name| name.starts_with('.') || name == "target")
+}
+
+/// Whether a directory entry is a directory, following symlinks.
+///
+/// `file_type` is the entry's own type from the readdir result, so only
+/// symlinks cost an extra stat.
+pub fn entry_is_dir(path: &Path, file_type: fs::FileType) -> bool {
+    file_type.is_dir() || (file_type.is_symlink() && path.is_dir())
+}
+
+/// Whether a directory entry is a regular file, following symlinks; see [`entry_is_dir`]
+pub fn entry_is_file(path: &Path, file_type: fs::FileType) -> bool {
+    file_type.is_file() || (file_type.is_symlink() && path.is_file())
+}
+
 /// Contract description
 /// Input: workspace root path
 /// Output: write relation_graph.json in workspace root directory, return RelationFile memory object
@@ -49,6 +81,7 @@ pub fn generate_c_dependency_graph(workspace_root: &Path) -> Result<RelationFile
     let exts = ["c", "cc", "cpp", "cxx", "h", "hpp", "hxx"];
     for entry in WalkDir::new(&workspace_root)
         .into_iter()
+        .filter_entry(|e| !is_skipped_dir(e))
         .filter_map(Result::ok)
     {
         if entry.file_type().is_file() {
@@ -78,11 +111,25 @@ pub fn generate_c_dependency_graph(workspace_root: &Path) -> Result<RelationFile
 
     let _files_set: BTreeSet<PathBuf> = all_files.iter().cloned().collect();
 
+    // Nodes from the previous run can be reused for files whose content is unchanged
+    let mut previous_nodes = load_reusable_nodes(&workspace_root);
+
     for file in &all_files {
         let content = fs::read_to_string(file)
             .with_context(|| format!("Failed to read file: {}", file.display()))?;
+        let content_hash = hash_content(&content);
+        if let Some(node) = previous_nodes.remove(file) {
+            if node.content_hash.as_ref() == Some(&content_hash)
+                && includes_resolve_unchanged(&node, file, &local_search_roots, &workspace_root)
+            {
+                nodes.insert(file.clone(), node);
+                continue;
+            }
+        }
+
         let mut local_includes: BTreeSet<PathBuf> = BTreeSet::new();
         let mut system_includes: BTreeSet<String> = BTreeSet::new();
+        let mut quoted_includes: BTreeSet<String> = BTreeSet::new();
 
         for cap in re.captures_iter(&content) {
             let delimiter = cap.get(1).unwrap().as_str();
@@ -90,6 +137,7 @@ pub fn generate_c_dependency_graph(workspace_root: &Path) -> Result<RelationFile
 
             match delimiter {
                 "\"" => {
+                    quoted_includes.insert(target.to_string());
                     // First resolve as relative path nearby
                     let resolved = resolve_local_include(file, target, &local_search_roots);
                     if let Some(p) = resolved {
@@ -118,6 +166,8 @@ pub fn generate_c_dependency_graph(workspace_root: &Path) -> Result<RelationFile
                     .map(|p| p.strip_prefix(&workspace_root).unwrap_or(&p).to_path_buf())
                     .collect(),
                 system_includes,
+                content_hash: Some(content_hash),
+                quoted_includes,
             },
         );
     }
@@ -171,13 +221,61 @@ pub fn generate_c_dependency_graph(workspace_root: &Path) -> Result<RelationFile
         generated_at: chrono::Utc::now().to_rfc3339(),
     };
 
+    // Stream straight into the file instead of building the whole string first; the graph is
+    // only read back by the scheduler, so it is written compact
     let out_path = workspace_root.join("relation_graph.json");
-    let json_text = serde_json::to_string_pretty(&relation)?;
-    fs::write(&out_path, json_text)?;
+    let mut writer = BufWriter::new(
+        File::create(&out_path)
+            .with_context(|| format!("Failed to create {}", out_path.display()))?,
+    );
+    serde_json::to_writer(&mut writer, &relation)?;
+    writer.flush()?;
 
     Ok(relation)
 }
 
+/// Load the nodes of an existing relation_graph.json for the same workspace
+///
+/// Each node is still checked with `includes_resolve_unchanged` before reuse.
+/// A graph that no longer parses, e.g. one written with an older hash format,
+/// yields no nodes and is rebuilt in full.
+fn load_reusable_nodes(workspace_root: &Path) -> BTreeMap<PathBuf, FileNode> {
+    let previous = fs::read_to_string(workspace_root.join("relation_graph.json"))
+        .ok()
+        .and_then(|text| serde_json::from_str::<RelationFile>(&text).ok());
+
+    match previous {
+        Some(rel) if rel.workspace == workspace_root => rel.files,
+        _ => BTreeMap::new(),
+    }
+}
+
+/// Whether every quoted include of a previous node still resolves as it did
+///
+/// Resolution depends on the search roots and on which files exist, including
+/// non-C targets outside the scanned set, so a target that appeared, vanished
+/// or is now found elsewhere makes the node stale.
+fn includes_resolve_unchanged(
+    node: &FileNode,
+    file: &Path,
+    search_roots: &[PathBuf],
+    workspace_root: &Path,
+) -> bool {
+    node.quoted_includes.iter().all(|target| {
+        match resolve_local_include(file, target, search_roots) {
+            Some(p) => node
+                .local_includes
+                .contains(p.strip_prefix(workspace_root).unwrap_or(&p)),
+            None => node.system_includes.contains(target),
+        }
+    })
+}
+
+/// Hex SHA-256 of the content; stable across toolchains, unlike `DefaultHasher`
+fn hash_content(content: &str) -> String {
+    format!("{:x}", Sha256::digest(content.as_bytes()))
+}
+
 fn resolve_local_include(
     current_file: &Path,
     target: &str,
@@ -370,4 +468,70 @@ mod tests {
                 || node.system_includes.contains("stdio.h")
         );
     }
+
+    #[test]
+    fn test_scan_skips_hidden_and_target_dirs() {
+        let td = TempDir::new().unwrap();
+        let root = td.path();
+
+        write(&root.join("src/main.c"), "int main(){return 0;}\n");
+        write(&root.join(".git/hooks/sample.c"), "int x;\n");
+        write(&root.join("target/debug/build/out.h"), "#pragma once\n");
+
+        let rel = generate_c_dependency_graph(root).unwrap();
+        let main_c = root.join("src/main.c").canonicalize().unwrap();
+        assert_eq!(rel.files.keys().collect::<Vec<_>>(), vec![&main_c]);
+    }
+
+    #[test]
+    fn test_regenerate_reuses_unchanged_nodes() {
+        let td = TempDir::new().unwrap();
+        let root = td.path();
+
+        let a_c = root.join("a.c");
+        let b_c = root.join("b.c");
+        write(&a_c, "#include <stdio.h>\n");
+        write(&b_c, "#include <stdlib.h>\n");
+        generate_c_dependency_graph(root).unwrap();
+
+        // Tag the stored node of the untouched file so reuse is observable
+        let graph_path = root.join("relation_graph.json");
+        let mut stored: RelationFile =
+            serde_json::from_str(&fs::read_to_string(&graph_path).unwrap()).unwrap();
+        let a_key = a_c.canonicalize().unwrap();
+        stored
+            .files
+            .get_mut(&a_key)
+            .unwrap()
+            .system_includes
+            .insert("reused.h".to_string());
+        fs::write(&graph_path, serde_json::to_string(&stored).unwrap()).unwrap();
+
+        write(&b_c, "#include <string.h>\n");
+        let rel = generate_c_dependency_graph(root).unwrap();
+
+        assert!(rel.files[&a_key].system_includes.contains("reused.h"));
+        let b_node = &rel.files[&b_c.canonicalize().unwrap()];
+        assert!(b_node.system_includes.contains("string.h"));
+        assert!(!b_node.system_includes.contains("stdlib.h"));
+    }
+
+    #[test]
+    fn test_regenerate_rechecks_non_c_include_targets() {
+        let td = TempDir::new().unwrap();
+        let root = td.path();
+
+        let a_c = root.join("a.c");
+        write(&a_c, "#include \"table.inc\"\n");
+        let rel = generate_c_dependency_graph(root).unwrap();
+        let a_key = a_c.canonicalize().unwrap();
+        assert!(rel.files[&a_key].system_includes.contains("table.inc"));
+
+        // The target is not a scanned C file, but it changes how a.c resolves
+        write(&root.join("table.inc"), "1, 2, 3\n");
+        let rel = generate_c_dependency_graph(root).unwrap();
+        let a_node = &rel.files[&a_key];
+        assert!(a_node.local_includes.contains(Path::new("table.inc")));
+        assert!(a_node.system_includes.is_empty());
+    }
 }
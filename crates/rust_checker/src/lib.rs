@@ -1,16 +1,22 @@
-use log::{error, info, warn};
+use log::{debug, error, info, warn};
 use std::fs;
+use std::io::{BufRead, BufReader, Read};
 use std::path::{Path, PathBuf};
-use std::process::Command;
+use std::process::{Command, Stdio};
+use std::thread;
 use thiserror::Error;
 
+/// Lines of cargo stderr kept for the error message. The first errors are the ones
+/// worth fixing; later output from a badly broken project is mostly follow-on noise.
+const MAX_CAPTURED_LINES: usize = 2000;
+
 #[derive(Debug, Error)]
 pub enum RustCheckError {
     #[error("Project directory does not exist")]
     InvalidProjectDir,
     #[error("No Cargo.toml found in project directory")]
     NotCargoProject,
-    #[error("Build failed with status {0}: {1}")]
+    #[error("Check failed with status {0}: {1}")]
     BuildFailed(i32, String),
     #[error("Command execution error: {0}")]
     CommandError(String),
@@ -45,49 +51,114 @@ impl RustCodeCheck {
         }
 
         // 尝试编译项目
-        self.run_cargo_build()
+        self.run_cargo_check()
     }
 
-    /// Execute cargo build command
-    fn run_cargo_build(&self) -> Result<(), RustCheckError> {
-        info!("Attempting to build project with cargo...");
+    /// Execute cargo check command
+    ///
+    /// `cargo check` reports the same compile errors as `cargo build` but skips
+    /// code generation and linking, and keeps its incremental state in the
+    /// project's `target/`, so re-checking after each fix stays fast.
+    fn run_cargo_check(&self) -> Result<(), RustCheckError> {
+        info!("Attempting to check project with cargo...");
+
+        match self.run_cargo(&["check", "--color=never"], "command")? {
+            None => {
+                info!("Check succeeded");
+                Ok(())
+            }
+            Some((status, error_msg)) => {
+                error!("Check failed with status {}:\n{}", status, error_msg);
+                Err(RustCheckError::BuildFailed(status, error_msg))
+            }
+        }
+    }
 
-        let output = Command::new("cargo")
-            .arg("build")
-            .arg("--color=never")
+    /// Run cargo with the given arguments in the project directory.
+    ///
+    /// stderr is forwarded to the debug log line by line while cargo runs, so long
+    /// builds show progress instead of staying silent until they finish. Only the
+    /// first `MAX_CAPTURED_LINES` lines are kept. Returns `None` on success, or the
+    /// exit status with the merged stdout/stderr on failure.
+    fn run_cargo(
+        &self,
+        args: &[&str],
+        what: &str,
+    ) -> Result<Option<(i32, String)>, RustCheckError> {
+        let command_error = |e: std::io::Error| {
+            let msg = format!("Failed to execute {}: {}", what, e);
+            error!("{}", msg);
+            RustCheckError::CommandError(msg)
+        };
+
+        let mut child = Command::new("cargo")
+            .args(args)
             .current_dir(&self.project_dir)
-            .output()
-            .map_err(|e| {
-                let msg = format!("Failed to execute command: {}", e);
-                error!("{}", msg);
-                RustCheckError::CommandError(msg)
-            })?;
-
-        if output.status.success() {
-            info!("Build succeeded");
-            Ok(())
-        } else {
-            let status = output.status.code().unwrap_or(-1);
-            let stderr = String::from_utf8_lossy(&output.stderr);
-            let stdout = String::from_utf8_lossy(&output.stdout);
-
-            // Merge stdout and stderr (cargo may output to both)
-            let mut error_msg = String::new();
-            if !stdout.is_empty() {
-                error_msg.push_str(&stdout);
-            }
-            if !stderr.is_empty() {
-                if !error_msg.is_empty() {
-                    error_msg.push('\n');
+            .stdout(Stdio::piped())
+            .stderr(Stdio::piped())
+            .spawn()
+            .map_err(command_error)?;
+
+        // Drain stdout on its own thread so a full pipe cannot stall cargo
+        let mut stdout_pipe = child.stdout.take().expect("stdout is piped");
+        let stdout_reader = thread::spawn(move || {
+            let mut buf = Vec::new();
+            let _ = stdout_pipe.read_to_end(&mut buf);
+            buf
+        });
+
+        let mut stderr = Vec::new();
+        let mut captured_lines = 0;
+        let mut omitted_lines = 0;
+        let mut reader = BufReader::new(child.stderr.take().expect("stderr is piped"));
+        let mut line = Vec::new();
+        loop {
+            line.clear();
+            match reader.read_until(b'\n', &mut line) {
+                Ok(0) | Err(_) => break,
+                Ok(_) => {
+                    debug!("cargo: {}", String::from_utf8_lossy(&line).trim_end());
+                    if captured_lines < MAX_CAPTURED_LINES {
+                        stderr.extend_from_slice(&line);
+                        captured_lines += 1;
+                    } else {
+                        omitted_lines += 1;
+                    }
                 }
-                error_msg.push_str(&stderr);
             }
+        }
+        if omitted_lines > 0 {
+            stderr.extend_from_slice(
+                format!("... {} more lines omitted\n", omitted_lines).as_bytes(),
+            );
+        }
+
+        let status = child.wait().map_err(command_error)?;
+        let stdout = stdout_reader.join().unwrap_or_default();
 
-            let error_msg = error_msg.trim().to_string();
-            error!("Build failed with status {}:\n{}", status, error_msg);
+        if status.success() {
+            return Ok(None);
+        }
+
+        let stdout = String::from_utf8_lossy(&stdout);
+        let stderr = String::from_utf8_lossy(&stderr);
 
-            Err(RustCheckError::BuildFailed(status, error_msg))
+        // Merge stdout and stderr (cargo may output to both)
+        let mut error_msg = String::new();
+        if !stdout.is_empty() {
+            error_msg.push_str(&stdout);
+        }
+        if !stderr.is_empty() {
+            if !error_msg.is_empty() {
+                error_msg.push('\n');
+            }
+            error_msg.push_str(&stderr);
         }
+
+        Ok(Some((
+            status.code().unwrap_or(-1),
+            error_msg.trim().to_string(),
+        )))
     }
 
     /// Check if it's a workspace project
@@ -162,7 +233,7 @@ impl RustCodeCheck {
         Ok(members)
     }
 
-    /// Build all members for workspace project
+    /// Check all members for workspace project
     pub fn check_workspace(&self) -> Result<(), RustCheckError> {
         info!("Checking workspace at: {:?}", self.project_dir);
 
@@ -174,46 +245,23 @@ impl RustCodeCheck {
         let members = self.get_workspace_members()?;
         info!("Found {} workspace members: {:?}", members.len(), members);
 
-        // First build the entire workspace
-        info!("Building entire workspace...");
-        let output = Command::new("cargo")
-            .arg("build")
-            .arg("--workspace")
-            .arg("--color=always")
-            .current_dir(&self.project_dir)
-            .output()
-            .map_err(|e| {
-                let msg = format!("Failed to execute workspace build: {}", e);
-                error!("{}", msg);
-                RustCheckError::CommandError(msg)
-            })?;
-
-        if output.status.success() {
-            info!("✅ Workspace build succeeded");
-            Ok(())
-        } else {
-            let status = output.status.code().unwrap_or(-1);
-            let stderr = String::from_utf8_lossy(&output.stderr);
-            let stdout = String::from_utf8_lossy(&output.stdout);
-
-            let mut error_msg = String::new();
-            if !stdout.is_empty() {
-                error_msg.push_str(&stdout);
+        // Check the entire workspace; see run_cargo_check for why check, not build
+        info!("Checking entire workspace...");
+        match self.run_cargo(
+            &["check", "--workspace", "--color=always"],
+            "workspace check",
+        )? {
+            None => {
+                info!("✅ Workspace check succeeded");
+                Ok(())
             }
-            if !stderr.is_empty() {
-                if !error_msg.is_empty() {
-                    error_msg.push('\n');
-                }
-                error_msg.push_str(&stderr);
+            Some((status, error_msg)) => {
+                error!(
+                    "❌ Workspace check failed with status {}:\n{}",
+                    status, error_msg
+                );
+                Err(RustCheckError::BuildFailed(status, error_msg))
             }
-
-            let error_msg = error_msg.trim().to_string();
-            error!(
-                "❌ Workspace build failed with status {}:\n{}",
-                status, error_msg
-            );
-
-            Err(RustCheckError::BuildFailed(status, error_msg))
         }
     }
 }
@@ -25,8 +25,9 @@ pub enum RustFileType {
 }
 use anyhow::Result;
 use log::{debug, info};
-use std::fs::{self, File};
-use std::io::{Read, Write};
+use relation_analy::entry_is_file;
+use std::collections::HashSet;
+use std::fs;
 use std::path::{Path, PathBuf};
 use std::process::Command;
 
@@ -50,14 +51,20 @@ pub fn process_c_h_files(dir_path: &Path) -> Result<PathBuf> {
         let entry = entry?;
         let path = entry.path();
 
-        if path.is_file() {
-            if let Some(ext) = path.extension() {
-                match ext.to_str().unwrap() {
-                    "c" => c_files.push(path),
-                    "h" => h_files.push(path),
-                    _ => continue,
-                }
-            }
+        // Check the extension first so only .c/.h entries reach the file type check
+        let is_c = match path.extension().and_then(|ext| ext.to_str()) {
+            Some("c") => true,
+            Some("h") => false,
+            _ => continue,
+        };
+        if !entry_is_file(&path, entry.file_type()?) {
+            continue;
+        }
+
+        if is_c {
+            c_files.push(path);
+        } else {
+            h_files.push(path);
         }
     }
 
@@ -82,13 +89,8 @@ pub fn process_c_h_files(dir_path: &Path) -> Result<PathBuf> {
             c_file_path
         );
 
-        // Read .h file content
-        let mut h_content = String::new();
-        File::open(h_file)?.read_to_string(&mut h_content)?;
-
-        // Write to .c file
-        let mut c_file = File::create(&c_file_path)?;
-        c_file.write_all(h_content.as_bytes())?;
+        // Copy .h file content to .c file without buffering it in memory
+        fs::copy(h_file, &c_file_path)?;
 
         info!("Written .h file content to newly created .c file");
         return Ok(c_file_path);
@@ -101,19 +103,17 @@ pub fn process_c_h_files(dir_path: &Path) -> Result<PathBuf> {
 
         info!("Found one .c file and one .h file, writing .h content to beginning of .c file");
 
-        // Read .h file content
-        let mut h_content = String::new();
-        File::open(h_file)?.read_to_string(&mut h_content)?;
-        debug!("h_content: {}", h_content);
+        // Read raw bytes so sources that are not valid UTF-8 are merged as-is
+        let mut merged = fs::read(h_file)?;
+        debug!("h_content: {}", String::from_utf8_lossy(&merged));
 
         // Read existing .c file content
-        let mut c_content = String::new();
-        File::open(c_file)?.read_to_string(&mut c_content)?;
-        debug!("c_content: {}", c_content);
+        let c_content = fs::read(c_file)?;
+        debug!("c_content: {}", String::from_utf8_lossy(&c_content));
 
         // Write .h content to beginning of .c file
-        let mut file = File::create(c_file)?;
-        write!(file, "{}{}", h_content, c_content)?;
+        merged.extend_from_slice(&c_content);
+        fs::write(c_file, merged)?;
 
         info!("Written .h file content to beginning of .c file");
         return Ok(c_file.clone());
@@ -152,8 +152,7 @@ pub fn create_rust_project_structure_with_type(
     let rust_file_path = project_path.join("src").join(file_name);
 
     // 写入 Rust 代码
-    let mut rust_file = File::create(&rust_file_path)?;
-    rust_file.write_all(rust_code.as_bytes())?;
+    fs::write(&rust_file_path, rust_code)?;
 
     // 创建 Cargo.toml 文件
     let cargo_toml_content = r#"[package]
@@ -165,8 +164,7 @@ edition = "2021"
 libc = "0.2"
 "#;
 
-    let mut cargo_file = File::create(project_path.join("Cargo.toml"))?;
-    write!(cargo_file, "{}", cargo_toml_content)?;
+    fs::write(project_path.join("Cargo.toml"), cargo_toml_content)?;
 
     info!(
         "已创建 Rust 项目结构: {}，src文件: {}",
@@ -180,11 +178,11 @@ libc = "0.2"
 /// - Contains `main(` considered executable (Package/bin)
 /// - Otherwise considered library (Lib)
 pub fn detect_project_type_from_c(c_file: &Path) -> RustFileType {
-    if let Ok(mut s) = fs::read_to_string(c_file) {
+    if let Ok(mut s) = fs::read(c_file) {
         // Simple and effective: any form of main( is considered executable entry
-        // Avoid over-engineering, maintain robustness
+        // Avoid over-engineering, maintain robustness; bytes so non-UTF-8 sources still match
         s.make_ascii_lowercase();
-        if s.contains("main(") {
+        if s.windows(5).any(|w| w == b"main(") {
             return RustFileType::Package;
         }
     }
@@ -245,11 +243,64 @@ pub fn write_rust_code_to_project(
         RustFileType::Package => project_path.join("src").join("main.rs"),
         RustFileType::Lib => project_path.join("src").join("lib.rs"),
     };
-    let mut f = File::create(&target)?;
-    f.write_all(rust_code.as_bytes())?;
+    write_if_changed(&target, rust_code.as_bytes())?;
     Ok(target)
 }
 
+/// Write `contents` to `path` unless the file already holds exactly those bytes.
+///
+/// Retries often produce the same code; leaving the file untouched keeps its
+/// mtime so cargo does not rebuild an unchanged crate. The size is compared
+/// before reading, so differing files are rarely read at all.
+/// Returns whether the file was written.
+fn write_if_changed(path: &Path, contents: &[u8]) -> Result<bool> {
+    if let Ok(meta) = fs::metadata(path) {
+        if meta.len() == contents.len() as u64 && fs::read(path)? == contents {
+            debug!("Skipping unchanged write: {}", path.display());
+            return Ok(false);
+        }
+    }
+    fs::write(path, contents)?;
+    Ok(true)
+}
+
+/// Crates from `crates` that the project's Cargo.toml does not list under `[dependencies]` yet.
+///
+/// Retries usually ask for the same crates again; filtering them out saves a
+/// `cargo add` run and a Cargo.toml rewrite per crate per attempt. Entries may
+/// carry a version (`serde@1`); `-` and `_` are treated alike, as crates.io does.
+pub fn missing_dependencies<'a>(project_path: &Path, crates: &'a [String]) -> Vec<&'a str> {
+    let manifest = fs::read_to_string(project_path.join("Cargo.toml")).unwrap_or_default();
+    let normalize = |name: &str| name.trim().trim_matches('"').replace('-', "_");
+
+    let mut listed = HashSet::new();
+    let mut in_dependencies = false;
+    for line in manifest.lines() {
+        let line = line.trim();
+        if let Some(header) = line.strip_prefix('[') {
+            let header = header.trim_end_matches(']').trim();
+            in_dependencies = header == "dependencies";
+            if let Some(name) = header.strip_prefix("dependencies.") {
+                listed.insert(normalize(name));
+            }
+        } else if in_dependencies {
+            if let Some(key) = line.split(['=', '.']).next().filter(|k| !k.is_empty()) {
+                listed.insert(normalize(key));
+            }
+        }
+    }
+
+    crates
+        .iter()
+        .map(|krate| krate.trim())
+        .filter(|krate| !krate.is_empty())
+        .filter(|krate| {
+            let name = krate.split('@').next().unwrap_or(krate);
+            !listed.contains(&normalize(name))
+        })
+        .collect()
+}
+
 /// Convenience method: detect project type based on C file, initialize with cargo new, then write Rust code.
 pub fn create_cargo_project_with_code_from_c(
     project_path: &Path,
@@ -260,3 +311,54 @@ pub fn create_cargo_project_with_code_from_c(
     let _ = init_or_recreate_cargo_project(project_path, proj_type)?;
     write_rust_code_to_project(project_path, rust_code, proj_type)
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_write_if_changed_skips_identical_contents() {
+        let dir = tempfile::tempdir().unwrap();
+        let path = dir.path().join("main.rs");
+
+        assert!(write_if_changed(&path, b"fn main() {}\n").unwrap());
+        assert!(!write_if_changed(&path, b"fn main() {}\n").unwrap());
+        assert!(write_if_changed(&path, b"fn main() { }\n").unwrap());
+        assert_eq!(fs::read(&path).unwrap(), b"fn main() { }\n");
+    }
+
+    #[test]
+    fn test_missing_dependencies_skips_listed_crates() {
+        let dir = tempfile::tempdir().unwrap();
+        fs::write(
+            dir.path().join("Cargo.toml"),
+            "[package]\nname = \"demo\"\n\n[dependencies]\nlibc = \"0.2\"\nserde_json = \"1\"\n\n[dependencies.rand]\nversion = \"0.8\"\n",
+        )
+        .unwrap();
+
+        let crates: Vec<String> = ["libc", "serde-json", "rand@0.8", "regex", " "]
+            .iter()
+            .map(|s| s.to_string())
+            .collect();
+        assert_eq!(missing_dependencies(dir.path(), &crates), vec!["regex"]);
+    }
+
+    #[test]
+    fn test_process_c_h_files_merges_non_utf8_sources() {
+        let dir = tempfile::tempdir().unwrap();
+        fs::write(
+            dir.path().join("demo.h"),
+            b"/* \xff */\nint add(int a, int b);\n",
+        )
+        .unwrap();
+        fs::write(dir.path().join("demo.c"), b"int main(void) { return 0; }\n").unwrap();
+
+        let c_file = process_c_h_files(dir.path()).unwrap();
+        let merged = fs::read(&c_file).unwrap();
+        assert_eq!(
+            merged,
+            b"/* \xff */\nint add(int a, int b);\nint main(void) { return 0; }\n"
+        );
+        assert_eq!(detect_project_type_from_c(&c_file), RustFileType::Package);
+    }
+}
@@ -1,15 +1,37 @@
 use config::{Config, File};
 use serde::Deserialize;
 use std::path::{Path, PathBuf};
+use std::sync::{Mutex, OnceLock};
+use std::time::SystemTime;
 
 #[derive(Debug, Clone, Deserialize)]
 pub struct ProcessorConfig {
     pub max_retry_attempts: u32,
 }
 
+/// Last parsed config, keyed by file path and modification time.
+static CONFIG_CACHE: Mutex<Option<(PathBuf, Option<SystemTime>, ProcessorConfig)>> =
+    Mutex::new(None);
+
+/// Load the processor config, re-parsing the file only when it has changed on disk.
+///
+/// A `TranslationProcessor` is built for every file and every retry, so the
+/// parsed value is reused while the file's modification time stays the same.
 pub fn get_config() -> Result<ProcessorConfig, config::ConfigError> {
     let config_path = locate_config_file()?;
+    let modified = std::fs::metadata(&config_path)
+        .and_then(|m| m.modified())
+        .ok();
+
+    let mut cache = CONFIG_CACHE.lock().unwrap_or_else(|e| e.into_inner());
+    if let Some((cached_path, cached_modified, config)) = cache.as_ref() {
+        if *cached_path == config_path && modified.is_some() && *cached_modified == modified {
+            return Ok(config.clone());
+        }
+    }
+
     let config: ProcessorConfig = build_config(&config_path)?.try_deserialize()?;
+    *cache = Some((config_path, modified, config.clone()));
     Ok(config)
 }
 
@@ -21,13 +43,25 @@ const CONFIG_SEARCH_PATHS: &[&str] = &[
 ];
 
 /// Locate the first existing config file among the supported search locations.
+///
+/// The first successful lookup is remembered for the rest of the process, so
+/// later calls skip probing the search locations.
 fn locate_config_file() -> Result<PathBuf, config::ConfigError> {
+    static LOCATED: OnceLock<PathBuf> = OnceLock::new();
+    if let Some(path) = LOCATED.get() {
+        return Ok(path.clone());
+    }
+
     let mut attempted = Vec::new();
 
     for raw_path in CONFIG_SEARCH_PATHS {
         let candidate = Path::new(raw_path);
         if candidate.exists() {
-            return Ok(candidate.to_path_buf());
+            // Store an absolute path so a later working-directory change cannot invalidate it
+            let resolved = candidate
+                .canonicalize()
+                .unwrap_or_else(|_| candidate.to_path_buf());
+            return Ok(LOCATED.get_or_init(|| resolved).clone());
         }
         attempted.push(candidate.display().to_string());
     }
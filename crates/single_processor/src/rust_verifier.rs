@@ -1,5 +1,5 @@
 use anyhow::Result;
-use log::{error, info, warn};
+use log::{debug, error, info, warn};
 use rust_checker::RustCodeCheck;
 use std::path::Path;
 
@@ -27,10 +27,9 @@ pub fn verify_compilation(project_path: &Path) -> Result<()> {
             Ok(())
         }
         Err(e) => {
-            let error_msg = format!("Compilation failed: {}", e);
+            // rust_checker has already logged the full build output; only keep it in the error
             warn!("❌ Compilation verification failed");
-            error!("Error details: {}", error_msg);
-            Err(anyhow::anyhow!(error_msg))
+            Err(anyhow::anyhow!("Compilation failed: {}", e))
         }
     }
 }
@@ -64,7 +63,7 @@ pub fn verify_and_fix(project_path: &Path, max_retries: u32) -> Result<()> {
                         "Compilation failed (attempt {}/{}), preparing to retry",
                         attempt, max_retries
                     );
-                    warn!("Error details: {}", e);
+                    debug!("Error details: {}", e);
                 } else {
                     error!(
                         "Compilation failed, reached maximum retry attempts {}",
@@ -1,7 +1,8 @@
 use anyhow::Result;
-use log::{info, warn};
+use log::{debug, info, warn};
 use std::fs;
 use std::path::Path;
+use std::process::{Command, Output};
 use std::sync::Arc;
 
 #[allow(unused_imports)]
@@ -16,7 +17,8 @@ struct OptimizedResult {
 }
 use crate::file_processor::process_c_h_files;
 use crate::file_processor::{
-    create_cargo_project_with_code_from_c, detect_project_type_from_c, write_rust_code_to_project,
+    create_cargo_project_with_code_from_c, detect_project_type_from_c, missing_dependencies,
+    write_rust_code_to_project,
 };
 use crate::pkg_config::get_config;
 use crate::rust_verifier::{extract_key_errors, verify_compilation};
@@ -34,8 +36,12 @@ impl CompilationVerifier {
         Self { max_retries }
     }
 
-    async fn verify_with_retry(
+    /// 对第 `attempt` 次迭代生成的代码执行一次编译验证
+    ///
+    /// 重试由调用方的迭代循环负责；最后一次迭代失败时保存错误日志并生成诊断报告。
+    async fn verify_attempt(
         &self,
+        attempt: usize,
         project_path: &Path,
         processed_c_file: &Path,
         rust_output_path: &Path,
@@ -47,51 +53,50 @@ impl CompilationVerifier {
             }
         };
 
-        for attempt in 1..=self.max_retries {
-            notify(&format!(
-                "🔍 编译验证 (尝试 {}/{})",
-                attempt, self.max_retries
-            ));
-            info!("🔍 开始编译验证（尝试 {}/{}）", attempt, self.max_retries);
+        notify(&format!(
+            "🔍 编译验证 (尝试 {}/{})",
+            attempt, self.max_retries
+        ));
+        info!("🔍 开始编译验证（尝试 {}/{}）", attempt, self.max_retries);
+
+        // cargo 构建是阻塞调用，放到阻塞线程池中执行，以免占用异步运行时
+        let path = project_path.to_path_buf();
+        let verified = tokio::task::spawn_blocking(move || verify_compilation(&path))
+            .await
+            .map_err(|e| anyhow::anyhow!("编译验证任务失败: {}", e))?;
+        match verified {
+            Ok(_) => {
+                info!("🎉 编译验证通过！");
+                notify("🎉 编译通过！");
+                Ok(())
+            }
+            Err(e) if attempt < self.max_retries => {
+                warn!(
+                    "❌ 编译失败（尝试 {}/{}），准备重试",
+                    attempt, self.max_retries
+                );
+                notify(&format!(
+                    "❌ 编译失败，准备重试 ({}/{})",
+                    attempt, self.max_retries
+                ));
 
-            match verify_compilation(project_path) {
-                Ok(_) => {
-                    info!("🎉 编译验证通过！");
-                    notify("🎉 编译通过！");
-                    return Ok(());
-                }
-                Err(e) => {
-                    if attempt < self.max_retries {
-                        warn!(
-                            "❌ 编译失败（尝试 {}/{}），准备重试",
-                            attempt, self.max_retries
-                        );
-                        notify(&format!(
-                            "❌ 编译失败，准备重试 ({}/{})",
-                            attempt, self.max_retries
-                        ));
-
-                        let key_errors = extract_key_errors(&e.to_string());
-                        info!("关键错误信息：\n{}", key_errors);
-
-                        // 返回错误信息供调用者处理重试逻辑
-                        return Err(anyhow::anyhow!("编译失败: {}", key_errors));
-                    } else {
-                        return self
-                            .handle_final_failure(
-                                e,
-                                project_path,
-                                processed_c_file,
-                                rust_output_path,
-                                callback,
-                            )
-                            .await;
-                    }
-                }
+                let key_errors = extract_key_errors(&e.to_string());
+                info!("关键错误信息：\n{}", key_errors);
+
+                // 返回错误信息供调用者处理重试逻辑
+                Err(anyhow::anyhow!("编译失败: {}", key_errors))
+            }
+            Err(e) => {
+                self.handle_final_failure(
+                    e,
+                    project_path,
+                    processed_c_file,
+                    rust_output_path,
+                    callback,
+                )
+                .await
             }
         }
-
-        Err(anyhow::anyhow!("未知的编译验证状态"))
     }
 
     async fn handle_final_failure(
@@ -108,8 +113,10 @@ impl CompilationVerifier {
             }
         };
 
+        // 完整的编译输出只渲染一次，供日志文件与关键错误提取复用
+        let error_text = error.to_string();
         warn!("❌ 编译验证失败，已达最大重试次数 {}", self.max_retries);
-        warn!("最后的编译错误: {}", error);
+        debug!("最后的编译错误: {}", error_text);
         notify(&format!(
             "❌ 编译失败，已达重试上限 ({} 次)",
             self.max_retries
@@ -117,11 +124,11 @@ impl CompilationVerifier {
 
         notify("💾 正在保存错误日志...");
         let error_log_path = project_path.join("final_compile_errors.txt");
-        fs::write(&error_log_path, error.to_string())?;
+        fs::write(&error_log_path, &error_text)?;
         info!("编译错误已保存到: {:?}", error_log_path);
         notify(&format!("✓ 错误日志已保存: {}", error_log_path.display()));
 
-        let final_key_errors = extract_key_errors(&error.to_string());
+        let final_key_errors = extract_key_errors(&error_text);
         notify(&format!(
             "🔍 识别到 {} 个关键错误",
             final_key_errors.lines().count()
@@ -210,32 +217,48 @@ pub struct TranslationProcessor {
 impl TranslationProcessor {
     pub async fn new(callback: Option<StageCallback>) -> Result<Self> {
         let config = get_config()?;
-        let max_retries = config.max_retry_attempts;
-        let verifier = CompilationVerifier::new(max_retries.try_into().unwrap());
+        // 至少执行一次翻译与验证；配置为 0 时迭代循环不会运行
+        let max_retries = (config.max_retry_attempts as usize).max(1);
+        let verifier = CompilationVerifier::new(max_retries);
 
         Ok(Self { callback, verifier })
     }
 
     /// 在指定项目目录执行 `cargo add` 添加依赖，并在进度回调中展示
+    ///
+    /// 已在 Cargo.toml 中的依赖直接跳过；其余依赖先用一次 `cargo add` 批量添加，
+    /// 批量失败时再逐个添加，以便跳过无法解析的单个依赖。
     fn add_cargo_deps_with_progress(&self, project_dir: &Path, crates: &[String]) -> Result<()> {
-        if crates.is_empty() {
+        let missing = missing_dependencies(project_dir, crates);
+        if missing.is_empty() {
             return Ok(());
         }
         self.notify("📦 检测到需要添加的依赖，开始执行 cargo add …");
-        for (idx, krate) in crates.iter().enumerate() {
+
+        if missing.len() > 1 {
+            self.notify(&format!("📦 cargo add {}", missing.join(" ")));
+            match run_cargo_add(project_dir, &missing) {
+                Ok(out) if out.status.success() => {
+                    self.notify(&format!("✅ 已添加: {}", missing.join(", ")));
+                    return Ok(());
+                }
+                Ok(out) => {
+                    let stderr = String::from_utf8_lossy(&out.stderr);
+                    warn!("批量 cargo add 失败，改为逐个添加: {}", stderr);
+                }
+                Err(e) => warn!("执行批量 cargo add 出错，改为逐个添加: {}", e),
+            }
+        }
+
+        for (idx, krate) in missing.iter().enumerate() {
             self.notify(&format!(
                 "📦 ({}/{}) cargo add {}",
                 idx + 1,
-                crates.len(),
+                missing.len(),
                 krate
             ));
             // 在项目目录运行 cargo add <crate>
-            let output = std::process::Command::new("cargo")
-                .arg("add")
-                .arg(krate)
-                .current_dir(project_dir)
-                .output();
-            match output {
+            match run_cargo_add(project_dir, &[krate]) {
                 Ok(out) => {
                     if out.status.success() {
                         self.notify(&format!("✅ 已添加: {}", krate));
@@ -262,13 +285,8 @@ impl TranslationProcessor {
         }
     }
 
-    async fn try_agent_optimize(
-        &self,
-        project_dir: &Path,
-        source_c_file: &Path,
-        compile_errors: Option<&str>,
-    ) -> Result<OptimizedResult> {
-        // 优先使用统一的 Agent 流程进行 AI 翻译
+    /// 创建并初始化翻译用的 Agent，供同一文件的所有重试迭代复用
+    async fn create_agent(&self, project_dir: &Path, source_c_file: &Path) -> Result<Agent> {
         let project_name = source_c_file
             .file_stem()
             .and_then(|s| s.to_str())
@@ -286,6 +304,16 @@ impl TranslationProcessor {
         let _ = agent.initialize_file_manager().await;
         let _ = agent.initialize_prompt_builder().await;
 
+        Ok(agent)
+    }
+
+    async fn try_agent_optimize(
+        &self,
+        agent: &mut Agent,
+        source_c_file: &Path,
+        compile_errors: Option<&str>,
+    ) -> Result<OptimizedResult> {
+        // 优先使用统一的 Agent 流程进行 AI 翻译
         let result = agent.translate_code(source_c_file, compile_errors).await?;
 
         Ok(OptimizedResult {
@@ -324,6 +352,18 @@ impl TranslationProcessor {
 
         let mut compile_errors: Option<String> = None;
 
+        // Agent（数据库、搜索器、提示词构建器）只创建一次，在所有重试迭代中复用
+        let mut agent = match self
+            .create_agent(&final_dir, processed_c_file.as_path())
+            .await
+        {
+            Ok(agent) => agent,
+            Err(err) => {
+                warn!("Agent 初始化失败: {}", err);
+                return Err(err);
+            }
+        };
+
         for attempt in 1..=self.verifier.max_retries {
             self.notify(&format!(
                 "🔄 【迭代 {}/{}】AI优化与编译验证",
@@ -342,7 +382,7 @@ impl TranslationProcessor {
             // 使用预处理后的 C 文件作为原始上下文，纯 AI 翻译
             let optimized = match self
                 .try_agent_optimize(
-                    &final_dir,
+                    &mut agent,
                     processed_c_file.as_path(),
                     compile_errors.as_deref(),
                 )
@@ -379,17 +419,29 @@ impl TranslationProcessor {
             self.notify(&format!("💾 代码已保存: {}", optimized_rust_path.display()));
 
             self.notify("🔨 正在编译验证...");
-            // 编译验证
-            match self
-                .verifier
-                .verify_with_retry(
+            // 编译验证期间并行准备下一次迭代的提示词
+            let prepare_next = async {
+                if attempt < self.verifier.max_retries {
+                    if let Err(e) = agent
+                        .prepare_translation_prompt(processed_c_file.as_path())
+                        .await
+                    {
+                        debug!("预先构建提示词失败: {}", e);
+                    }
+                }
+            };
+            let (verified, ()) = tokio::join!(
+                self.verifier.verify_attempt(
+                    attempt,
                     &final_dir,
                     file_path,
                     &optimized_rust_path,
                     self.callback.as_ref(),
-                )
-                .await
-            {
+                ),
+                prepare_next
+            );
+            // 编译验证
+            match verified {
                 Ok(_) => {
                     self.notify("🎉 编译验证通过！");
                     self.notify("✓ 备份完成");
@@ -400,6 +452,8 @@ impl TranslationProcessor {
                     return Ok(());
                 }
                 Err(e) => {
+                    // 失败的翻译不应在下次运行时从缓存中重放
+                    agent.invalidate_cached_response().await;
                     if attempt < self.verifier.max_retries {
                         compile_errors = Some(e.to_string());
                         self.notify(&format!("⚠️ 编译失败，将进行第 {} 次重试", attempt + 1));
@@ -439,6 +493,15 @@ impl TranslationProcessor {
 }
 
 
+/// 在项目目录中运行一次 `cargo add`
+fn run_cargo_add(project_dir: &Path, crates: &[&str]) -> std::io::Result<Output> {
+    Command::new("cargo")
+        .arg("add")
+        .args(crates)
+        .current_dir(project_dir)
+        .output()
+}
+
 pub async fn singlefile_processor(file_path: &Path, callback: Option<StageCallback>) -> Result<()> {
     let processor = TranslationProcessor::new(callback).await?;
     processor.process_single_file(file_path).await
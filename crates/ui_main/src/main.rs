@@ -1,6 +1,8 @@
 slint::include_modules!();
 
-use commandline_tool::{init_services, run_analyze, run_preprocess, run_translate};
+use commandline_tool::{
+    init_connections, init_logging, run_analyze, run_preprocess, run_translate,
+};
 use std::path::PathBuf;
 use std::sync::Arc;
 use tokio::runtime::Runtime;
@@ -46,13 +48,13 @@ fn main() {
         }));
     }
 
-    // Initialize services once with debug=false for UI; could be toggled later
-    {
-        let rt2 = rt.clone();
-        rt2.block_on(async move {
-            let _ = init_services(false).await; // ignore errors but services will log
-        });
-    }
+    // Initialize services once with debug=false for UI; could be toggled later.
+    // Logging is installed before any handler can run; the database and AI probes
+    // run in the background so the window shows immediately.
+    init_logging(false);
+    rt.spawn(async move {
+        let _ = init_connections().await; // ignore errors but services will log
+    });
 
     let ui_handle = ui.as_weak();
     let rt_analyze = rt.clone();
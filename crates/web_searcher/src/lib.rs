@@ -22,7 +22,12 @@ pub use searcher::{
 
 use anyhow::Result;
 use log::info;
+use regex::Regex;
 use serde::{Deserialize, Serialize};
+use std::sync::LazyLock;
+
+static ERROR_CODE_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"error\[([E]\d{4})\]").unwrap());
 
 /// 🎯 MAIN INTERFACE: Unified Solution Structure
 /// This is what users get - everything they need to solve their error
@@ -194,14 +199,10 @@ fn analyze_error(error_text: &str) -> ErrorInfo {
 }
 
 fn extract_error_code(error_text: &str) -> Option<String> {
-    use regex::Regex;
-
-    if let Ok(re) = Regex::new(r"error\[([E]\d{4})\]") {
-        if let Some(cap) = re.captures(error_text) {
-            return cap.get(1).map(|m| m.as_str().to_string());
-        }
-    }
-    None
+    ERROR_CODE_RE
+        .captures(error_text)
+        .and_then(|cap| cap.get(1))
+        .map(|m| m.as_str().to_string())
 }
 
 fn categorize_error(error_text: &str, error_code: Option<&str>) -> String {
@@ -363,18 +364,10 @@ fn convert_to_solutions(
     }
 
     // Sort solutions by effectiveness
-    solutions.sort_by(|a, b| {
-        b.effectiveness_score
-            .partial_cmp(&a.effectiveness_score)
-            .unwrap_or(std::cmp::Ordering::Equal)
-    });
+    solutions.sort_by(|a, b| b.effectiveness_score.total_cmp(&a.effectiveness_score));
 
     // Sort learning resources by relevance
-    learning_resources.sort_by(|a, b| {
-        b.relevance_score
-            .partial_cmp(&a.relevance_score)
-            .unwrap_or(std::cmp::Ordering::Equal)
-    });
+    learning_resources.sort_by(|a, b| b.relevance_score.total_cmp(&a.relevance_score));
 
     // Determine overall confidence level
     let avg_confidence = if !processed_results.is_empty() {
@@ -14,11 +14,25 @@ use regex::Regex;
 use reqwest;
 use scraper::{Html, Selector};
 use serde::{Deserialize, Serialize};
+use std::sync::LazyLock;
 use std::time::Duration;
 use tokio::fs;
+use tokio::sync::OnceCell;
 
 use crate::SearchResult;
 
+/// HTTP client shared by every PageFetcher, so pages fetched for later errors
+/// reuse the pooled connections instead of opening new ones
+static SHARED_CLIENT: OnceCell<reqwest::Client> = OnceCell::const_new();
+
+// Patterns for parsing AI responses, compiled once instead of on every response
+static CONFIDENCE_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"(?i)confidence[:\s]*([0-9]*\.?[0-9]+)").unwrap());
+static RELEVANCE_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"(?i)relevance[:\s]*([0-9]*\.?[0-9]+)").unwrap());
+static CODE_BLOCK_RE: LazyLock<Regex> =
+    LazyLock::new(|| Regex::new(r"```(\w+)?\n([\s\S]*?)\n```").unwrap());
+
 /// Configuration for page fetching
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct PageFetchConfig {
@@ -130,10 +144,16 @@ impl PageFetcher {
         let config = PageFetchConfig::default();
         let prompt_template = Self::load_search_result_prompt().await?;
 
-        let client = reqwest::Client::builder()
-            .timeout(Duration::from_secs(config.timeout_seconds))
-            .user_agent(&config.user_agent)
-            .build()?;
+        // Every fetcher uses the default config, so one client serves them all
+        let client = SHARED_CLIENT
+            .get_or_try_init(|| async {
+                reqwest::Client::builder()
+                    .timeout(Duration::from_secs(config.timeout_seconds))
+                    .user_agent(&config.user_agent)
+                    .build()
+            })
+            .await?
+            .clone();
 
         info!(
             "PageFetcher initialized with timeout {}s",
@@ -191,11 +211,7 @@ impl PageFetcher {
         }
 
         // Sort by relevance score (descending)
-        processed_results.sort_by(|a, b| {
-            b.relevance_score
-                .partial_cmp(&a.relevance_score)
-                .unwrap_or(std::cmp::Ordering::Equal)
-        });
+        processed_results.sort_by(|a, b| b.relevance_score.total_cmp(&a.relevance_score));
 
         info!(
             "Processed {} search results in {}ms",
@@ -696,22 +712,18 @@ impl PageFetcher {
         }
 
         // Extract confidence and relevance scores if mentioned in response
-        if let Ok(conf_regex) = Regex::new(r"(?i)confidence[:\s]*([0-9]*\.?[0-9]+)") {
-            if let Some(cap) = conf_regex.captures(ai_response) {
-                if let Some(score_str) = cap.get(1) {
-                    if let Ok(score) = score_str.as_str().parse::<f32>() {
-                        confidence_score = score.min(1.0).max(0.0);
-                    }
+        if let Some(cap) = CONFIDENCE_RE.captures(ai_response) {
+            if let Some(score_str) = cap.get(1) {
+                if let Ok(score) = score_str.as_str().parse::<f32>() {
+                    confidence_score = score.min(1.0).max(0.0);
                 }
             }
         }
 
-        if let Ok(rel_regex) = Regex::new(r"(?i)relevance[:\s]*([0-9]*\.?[0-9]+)") {
-            if let Some(cap) = rel_regex.captures(ai_response) {
-                if let Some(score_str) = cap.get(1) {
-                    if let Ok(score) = score_str.as_str().parse::<f32>() {
-                        relevance_score = score.min(1.0).max(0.0);
-                    }
+        if let Some(cap) = RELEVANCE_RE.captures(ai_response) {
+            if let Some(score_str) = cap.get(1) {
+                if let Ok(score) = score_str.as_str().parse::<f32>() {
+                    relevance_score = score.min(1.0).max(0.0);
                 }
             }
         }
@@ -750,26 +762,24 @@ impl PageFetcher {
             || header_lower.contains("代码")
         {
             // Extract code blocks from content
-            if let Ok(code_regex) = Regex::new(r"```(\w+)?\n([\s\S]*?)\n```") {
-                for cap in code_regex.captures_iter(content) {
-                    let language = cap
-                        .get(1)
-                        .map(|m| m.as_str().to_string())
-                        .unwrap_or_else(|| "rust".to_string());
-                    let code = cap
-                        .get(2)
-                        .map(|m| m.as_str().to_string())
-                        .unwrap_or_default();
-
-                    if !code.trim().is_empty() {
-                        code_examples.push(ProcessedCodeExample {
-                            title: format!("Code Example {}", code_examples.len() + 1),
-                            code: code.trim().to_string(),
-                            explanation: "From AI processing".to_string(),
-                            is_solution: header_lower.contains("solution"),
-                            language,
-                        });
-                    }
+            for cap in CODE_BLOCK_RE.captures_iter(content) {
+                let language = cap
+                    .get(1)
+                    .map(|m| m.as_str().to_string())
+                    .unwrap_or_else(|| "rust".to_string());
+                let code = cap
+                    .get(2)
+                    .map(|m| m.as_str().to_string())
+                    .unwrap_or_default();
+
+                if !code.trim().is_empty() {
+                    code_examples.push(ProcessedCodeExample {
+                        title: format!("Code Example {}", code_examples.len() + 1),
+                        code: code.trim().to_string(),
+                        explanation: "From AI processing".to_string(),
+                        is_solution: header_lower.contains("solution"),
+                        language,
+                    });
                 }
             }
         } else if header_lower.contains("insight")
@@ -13,8 +13,19 @@ use log::{debug, info, warn};
 use serde::{Deserialize, Serialize};
 use serde_json::Value;
 use std::collections::HashMap;
+use std::sync::LazyLock;
 use tokio::fs;
 
+/// HTTP client shared by every WebSearcher, keeping connections to the
+/// search engines alive between searches
+static SHARED_CLIENT: LazyLock<reqwest::Client> = LazyLock::new(reqwest::Client::new);
+
+// Quoted terms in AI keyword responses, compiled once instead of per response
+static DOUBLE_QUOTED_RE: LazyLock<regex::Regex> =
+    LazyLock::new(|| regex::Regex::new(r#""([^"]+)""#).unwrap());
+static BACKTICK_QUOTED_RE: LazyLock<regex::Regex> =
+    LazyLock::new(|| regex::Regex::new(r#"`([^`]+)`"#).unwrap());
+
 /// Search engine configuration
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct SearchEngineConfig {
@@ -71,6 +82,7 @@ pub struct SearchResponse {
 pub struct WebSearcher {
     config: WebSearcherConfig,
     prompt_template: String,
+    client: reqwest::Client,
 }
 
 impl WebSearcher {
@@ -87,6 +99,7 @@ impl WebSearcher {
         Ok(Self {
             config,
             prompt_template,
+            client: SHARED_CLIENT.clone(),
         })
     }
 
@@ -166,24 +179,20 @@ impl WebSearcher {
 
         // Strategy 2: If no structured format found, extract from quoted strings
         if keywords.is_empty() {
-            let quote_patterns = [r#""([^"]+)""#, r#"`([^`]+)`"#];
-
-            for pattern in &quote_patterns {
-                if let Ok(regex) = regex::Regex::new(pattern) {
-                    for cap in regex.captures_iter(response) {
-                        if let Some(keyword) = cap.get(1) {
-                            let keyword_text = keyword.as_str().trim();
-                            if !keyword_text.is_empty() && keyword_text.len() > 3 {
-                                // Categorize based on content
-                                let category = self.categorize_keyword(keyword_text);
-                                let relevance = self.calculate_relevance(keyword_text);
-
-                                keywords.push(SearchKeyword {
-                                    keyword: keyword_text.to_string(),
-                                    relevance,
-                                    category,
-                                });
-                            }
+            for regex in [&*DOUBLE_QUOTED_RE, &*BACKTICK_QUOTED_RE] {
+                for cap in regex.captures_iter(response) {
+                    if let Some(keyword) = cap.get(1) {
+                        let keyword_text = keyword.as_str().trim();
+                        if !keyword_text.is_empty() && keyword_text.len() > 3 {
+                            // Categorize based on content
+                            let category = self.categorize_keyword(keyword_text);
+                            let relevance = self.calculate_relevance(keyword_text);
+
+                            keywords.push(SearchKeyword {
+                                keyword: keyword_text.to_string(),
+                                relevance,
+                                category,
+                            });
                         }
                     }
                 }
@@ -199,11 +208,7 @@ impl WebSearcher {
         keywords.sort_by(|a, b| a.keyword.cmp(&b.keyword));
         keywords.dedup_by(|a, b| a.keyword == b.keyword);
 
-        keywords.sort_by(|a, b| {
-            b.relevance
-                .partial_cmp(&a.relevance)
-                .unwrap_or(std::cmp::Ordering::Equal)
-        });
+        keywords.sort_by(|a, b| b.relevance.total_cmp(&a.relevance));
         keywords.truncate(self.config.max_keywords);
 
         // Final fallback
@@ -382,16 +387,13 @@ impl WebSearcher {
         query: &str,
         engine: &SearchEngineConfig,
     ) -> Result<Vec<SearchResult>> {
-        use reqwest;
-
-        let client = reqwest::Client::new();
         let url = format!(
             "{}?q={}&format=json&no_html=1&skip_disambig=1",
             engine.base_url,
             urlencoding::encode(query)
         );
 
-        match client.get(&url).send().await {
+        match self.client.get(&url).send().await {
             Ok(response) => {
                 if response.status().is_success() {
                     match response.json::<Value>().await {
@@ -493,11 +495,7 @@ impl WebSearcher {
         }
 
         // Sort by relevance and limit results
-        results.sort_by(|a, b| {
-            b.relevance_score
-                .partial_cmp(&a.relevance_score)
-                .unwrap_or(std::cmp::Ordering::Equal)
-        });
+        results.sort_by(|a, b| b.relevance_score.total_cmp(&a.relevance_score));
         results.truncate(max_results);
 
         Ok(results)